@@ -0,0 +1,228 @@
+"""
+Auction Values
+Dollar values for auction drafts. Each player's projected VOR (see draft_grader) is converted to
+dollars: every roster spot in the league costs the minimum bid, and the dollars left over are
+split in proportion to VOR among the players the league will actually roster. That value is
+blended with a market price read off ADP (the same dollar curve assigned in ADP order), since
+auction rooms price players much like snake drafters rank them.
+
+AuctionPricer keeps the draft state as arrays (available players, team budgets, open slots,
+position counts), so re-pricing the remaining pool after a sale is one vectorized pass.
+simulate_auction plays out nominations and bidding to estimate what players actually sell for.
+
+Usage (from the repo root):
+    python -m analytics.auction_values --season 2025 --budget 200 --simulations 200
+Author: Patrick Mejia
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from analytics.draft_engine import DraftBoard
+from analytics.draft_grader import DraftGrader
+from analytics.league_settings import DEFAULT_SETTINGS
+
+MARKET_WEIGHT = 0.35      # Share of a player's value taken from the ADP market curve
+BID_NOISE = 0.15          # Log-normal spread of each team's valuation around the price
+NOMINATION_POOL = 10      # Nominators pick among this many of the best available players
+
+
+def dollar_values(vor, total_dollars, spots, min_bid=1):
+    """
+    Spread total_dollars over the best `spots` players by VOR.
+    Args:
+        vor (ndarray): VOR per player (negative counts as 0).
+        total_dollars (float): Dollars left to spend across the league.
+        spots (int): Roster spots left to fill across the league.
+        min_bid (int): Every filled spot costs at least this.
+    Returns:
+        ndarray: Dollar value per player; players outside the rostered pool are worth 0.
+    """
+    vor = np.clip(np.asarray(vor, dtype=float), 0, None)
+    values = np.zeros(len(vor))
+    spots = min(int(spots), len(vor))
+    if spots <= 0:
+        return values
+    pool = np.argpartition(-vor, spots - 1)[:spots]
+    surplus = max(total_dollars - spots * min_bid, 0.0)
+    pool_vor = vor[pool].sum()
+    share = vor[pool] / pool_vor if pool_vor > 0 else np.full(spots, 1.0 / spots)
+    values[pool] = min_bid + share * surplus
+    return values
+
+
+def market_values(adp, values):
+    """The same dollar amounts handed out in ADP order: the best ADP gets the biggest value."""
+    ranked = np.sort(values)[::-1]
+    market = np.zeros(len(adp))
+    market[np.argsort(adp, kind="stable")] = ranked
+    return market
+
+
+class AuctionPricer:
+    """
+    Live auction state over a DraftBoard and the grader's VOR.
+    Args:
+        board (DraftBoard): Players in the auction.
+        vor (ndarray): VOR aligned with the board.
+        settings (LeagueSettings): Teams, roster size, budget, minimum bid and position caps.
+        market_weight (float): Share of value taken from the ADP market curve.
+    """
+
+    def __init__(self, board, vor, settings=None, market_weight=MARKET_WEIGHT):
+        self.board = board
+        self.settings = settings or DEFAULT_SETTINGS
+        self.vor = np.clip(np.asarray(vor, dtype=float), 0, None)
+        self.market_weight = market_weight
+        self.positions = list(board.position_names)
+        self.caps = np.array([self.settings.max_positions.get(pos, 0) for pos in self.positions])
+        self.reset()
+
+    def reset(self):
+        settings = self.settings
+        self.available = np.ones(len(self.board), dtype=bool)
+        self.budgets = np.full(settings.num_teams, settings.budget, dtype=float)
+        self.open_slots = np.full(settings.num_teams, settings.roster_size, dtype=np.int64)
+        self.counts = np.zeros((settings.num_teams, len(self.positions)), dtype=np.int64)
+        self.sales = []
+
+    def prices(self):
+        """Current dollar value of every available player (0 for sold players)."""
+        settings = self.settings
+        spots = int(self.open_slots.sum())
+        dollars = float(self.budgets.sum())
+        values = np.zeros(len(self.board))
+        if spots == 0 or not self.available.any():
+            return values
+        remaining = np.flatnonzero(self.available)
+        values[remaining] = dollar_values(self.vor[remaining], dollars, spots, settings.min_bid)
+        if self.market_weight:
+            market = market_values(self.board.adp[remaining], values[remaining])
+            values[remaining] = (1 - self.market_weight) * values[remaining] + self.market_weight * market
+        return values
+
+    def max_bids(self):
+        """Most each team can bid now while still affording the minimum for its other open slots."""
+        return np.where(self.open_slots > 0, self.budgets - (self.open_slots - 1) * self.settings.min_bid, 0.0)
+
+    def wants(self, player_index):
+        """Which teams can still roster this player (open slot, and under the position cap unless caps are all met)."""
+        code = self.board.position_codes[player_index]
+        cap_room = np.clip(self.caps[None, :] - self.counts, 0, None).sum(axis=1)
+        under_cap = self.counts[:, code] < self.caps[code]
+        return (self.open_slots > 0) & (under_cap | (cap_room == 0))
+
+    def sell(self, player_index, team, price):
+        """Record a sale (O(1)); prices() reflects it on the next call."""
+        if not self.available[player_index]:
+            raise ValueError(f"{self.board.players[player_index]} has already been sold")
+        if price > self.max_bids()[team]:
+            raise ValueError(f"Team {team + 1} cannot bid ${price}")
+        self.available[player_index] = False
+        self.budgets[team] -= price
+        self.open_slots[team] -= 1
+        self.counts[team, self.board.position_codes[player_index]] += 1
+        self.sales.append((player_index, team, price))
+
+    def value_table(self, limit=None):
+        """Available players with their current dollar values, most valuable first."""
+        prices = self.prices()
+        remaining = np.flatnonzero(self.available)
+        table = pd.DataFrame({
+            "Player": self.board.players[remaining],
+            "POS": self.board.positions[remaining],
+            "ADP": self.board.adp[remaining],
+            "VOR": self.vor[remaining].round(1),
+            "Value": prices[remaining].round(1),
+        }).sort_values("Value", ascending=False, ignore_index=True)
+        return table.head(limit) if limit else table
+
+
+def simulate_auction(pricer, rng, bid_noise=BID_NOISE, nomination_pool=NOMINATION_POOL):
+    """
+    Play one auction to the end. Each nomination is drawn from the best available players; every
+    team that can roster the player values them at the current price times log-normal noise,
+    and the highest bidder pays the second-highest valuation plus $1 (capped at their max bid).
+    Returns:
+        list: (player index, team, price) per sale.
+    """
+    pricer.reset()
+    settings = pricer.settings
+    while pricer.open_slots.sum() > 0 and pricer.available.any():
+        prices = pricer.prices()
+        candidates = np.flatnonzero(pricer.available)
+        top = candidates[np.argsort(-prices[candidates], kind="stable")[:nomination_pool]]
+        player = int(rng.choice(top))
+
+        eligible = pricer.wants(player)
+        if not eligible.any():
+            # Nobody can roster them; take them off the board
+            pricer.available[player] = False
+            continue
+        max_bids = pricer.max_bids()
+        valuations = prices[player] * rng.lognormal(0.0, bid_noise, settings.num_teams)
+        bids = np.where(eligible, np.clip(valuations, settings.min_bid, max_bids), -np.inf)
+        order = np.argsort(-bids, kind="stable")
+        winner = int(order[0])
+        runner_up = bids[order[1]] if len(order) > 1 and np.isfinite(bids[order[1]]) else settings.min_bid - 1
+        price = float(min(max(np.floor(runner_up) + 1, settings.min_bid), max_bids[winner]))
+        pricer.sell(player, winner, price)
+    return list(pricer.sales)
+
+
+def simulate_prices(pricer, n_simulations=200, seed=0, **kwargs):
+    """
+    Average sale price per player over many simulated auctions.
+    Returns:
+        DataFrame: Player, POS, Value (pre-draft), Avg Price, Sold % — most expensive first.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    start_values = pricer.prices()
+    totals = np.zeros(len(pricer.board))
+    sold = np.zeros(len(pricer.board))
+    for _ in range(n_simulations):
+        sales = np.array(simulate_auction(pricer, rng, **kwargs), dtype=float).reshape(-1, 3)
+        players = sales[:, 0].astype(int)
+        np.add.at(totals, players, sales[:, 2])
+        np.add.at(sold, players, 1)
+    pricer.reset()
+    return pd.DataFrame({
+        "Player": pricer.board.players,
+        "POS": pricer.board.positions,
+        "Value": start_values.round(1),
+        "Avg Price": np.divide(totals, sold, out=np.zeros(len(sold)), where=sold > 0).round(1),
+        "Sold %": (sold / n_simulations * 100).round(1),
+    }).sort_values("Avg Price", ascending=False, ignore_index=True)
+
+
+def auction_pricer(adp_data, projections=None, settings=None, market_weight=MARKET_WEIGHT):
+    """Build a pricer from an ADP board and season projections (see draft_grader.load_projected_points)."""
+    board = DraftBoard(adp_data)
+    grader = DraftGrader(board, projections, settings)
+    return AuctionPricer(board, grader.vor, settings, market_weight)
+
+
+if __name__ == "__main__":
+    from analytics.league_settings import LeagueSettings
+    from season_scripts.get_adp_stats import ADPHistory, current_adp_season
+
+    arg_parser = argparse.ArgumentParser(description="Auction dollar values from VOR and ADP.")
+    arg_parser.add_argument("--season", type=int, default=current_adp_season())
+    arg_parser.add_argument("--teams", type=int, default=12)
+    arg_parser.add_argument("--budget", type=int, default=200)
+    arg_parser.add_argument("--bench", type=int, default=6)
+    arg_parser.add_argument("--simulations", type=int, default=0, help="Simulated auctions for expected prices")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    league = LeagueSettings(num_teams=args.teams, budget=args.budget, bench=args.bench)
+    auction = auction_pricer(ADPHistory().board(args.season), settings=league)
+    print(auction.value_table(limit=40))
+
+    if args.simulations:
+        start = time.perf_counter()
+        simulated_prices = simulate_prices(auction, args.simulations, args.seed)
+        print(f"Simulated {args.simulations} auctions in {time.perf_counter() - start:.1f}s")
+        print(simulated_prices.head(40))
@@ -3,15 +3,48 @@
 # Author: Patrick Mejia
 
 from bs4 import BeautifulSoup
+from dataclasses import dataclass, field
 import logging
 import os
 import re
 import requests
+import numpy as np
 import pandas as pd
 
+from analytics.draft_engine import DraftBoard, DraftEngine, snake_order
+from analytics.league_settings import DEFAULT_SETTINGS
+from season_scripts.get_adp_stats import ADPHistory
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+
+@dataclass
+class DraftOption:
+    """One candidate player for a round."""
+    player: str
+    position: str
+    adp: float
+
+
+@dataclass
+class RoundRecommendation:
+    """
+    Mock draft recommendation for one of your picks.
+    Args:
+        round (int): Draft round (1-based).
+        pick (int): Overall pick number (1-based).
+        position (str): Position targeted this round.
+        selection (str): Player taken in the mock draft.
+        options (list): Top available DraftOptions at the targeted position, best first.
+    """
+    round: int
+    pick: int
+    position: str
+    selection: str
+    options: list = field(default_factory=list)
+
+
 class DraftCalculator:
     def __init__(self, base_url):
         self.base_url = base_url
@@ -85,16 +118,17 @@ class DraftCalculator:
         headers, data = self.parse_data(html_content)
         return headers, data
 
-    def parse_all_positions(self, year):
-        """Fetch and save ADP data for all positions into folders by year."""
-        positions = ["QB", "RB", "WR", "TE"]
-        for position in positions:
-            headers, data = self.parse_position(position, year)
-            if headers and data:
-                filename = f"data/adp_data/{year}/{position}.csv"
-                self.save_to_csv(headers, data, filename)
-            else:
-                logging.warning(f"No data found for {position}")
+    def parse_all_positions(self, year, refresh=False):
+        """Load the ADP board for all positions for a year from the shared ADP history.
+        Reads the stored history only; with refresh, missing seasons and a new snapshot of the
+        current season are fetched first (completed seasons are never refetched).
+        Args:
+            year (int): Season to load.
+            refresh (bool): Fetch before reading.
+            Returns:
+            DataFrame: One row per player with Rank, Player, POS, AVG and per-source ADP columns.
+        """
+        return ADPHistory().board(year, refresh=refresh)
 
 
     def remove_team_from_name(self, name):
@@ -146,7 +180,6 @@ class DraftCalculator:
 
         # Remove the header of table
         drafted_players = drafted_players.drop(drafted_players.index[0])
-        drafted_players = drafted_players.drop(columns=['CBS', 'RTSports', 'Sleeper'])
         # logging.info(f"Drafted players: {drafted_players}\n")
 
         # Ensure 'Player' column exists
@@ -190,162 +223,136 @@ class DraftCalculator:
 
         return avg_diff
 
-    def create_mock_draft_options(self, adp_data, draft_pick_number):
-        """Creates a list of mock draft options for the given pick number.
+    def create_mock_draft_options(self, adp_data, draft_pick_number, options_per_round=3, settings=None):
+        """Creates mock draft recommendations for the given pick number.
         Draft order follows a snake format:
-        Example: 1st pick, 22nd pick, 23rd pick, 44th pick, etc.
+        Example: 1st pick, 20th pick, 21st pick, 40th pick, etc.
+        Players ranked ahead of each of your picks are assumed gone; each round then offers the
+        top available players at the round's target position, taking the first of them.
 
         Args:
             adp_data (DataFrame): DataFrame containing ADP data.
             draft_pick_number (int): Draft pick number.
+            options_per_round (int): Options to list per round.
+            settings (LeagueSettings): League size, roster caps, position plan and pick order (defaults to 10-team snake).
 
         Returns:
-            list: List of mock draft options per round for the given pick number.
+            list: RoundRecommendation per round for the given pick number.
         """
-        if draft_pick_number < 0:
+        if draft_pick_number <= 0:
             logging.error("Draft pick number must be greater than 0.")
             return None
 
-        num_teams = 10  # Number of teams in the league
-        num_rounds = 15  # Total rounds in the draft
-        total_picks = num_teams * num_rounds
+        settings = settings or DEFAULT_SETTINGS
 
-        # Determine pick positions in the snake draft format
-        pick_position = draft_pick_number % num_teams or num_teams
+        # Determine pick positions in the league's draft order
+        pick_position = draft_pick_number % settings.num_teams or settings.num_teams
         logging.info(f"Your Draft Pick: {pick_position}\n")
 
-        # Generate the snake draft order
-        draft_order = []
-        for round_num in range(num_rounds):
-            round_picks = list(range(1, num_teams + 1)) if round_num % 2 == 0 else list(range(num_teams, 0, -1))
-            draft_order.extend(round_picks)
-
-        # Identify all pick positions for the given draft slot
-        pick_positions = [draft_order[i] + num_teams * (i // num_teams) for i in range(draft_pick_number - 1, total_picks, num_teams)]
+        # Overall pick numbers (1-based) for the given draft slot
+        pick_positions = settings.picks_for_slot(pick_position).tolist()
         logging.info(f"Pick positions: {pick_positions}\n")
 
-        # Initialize draft selections
-        mock_draft_top_selections = []
-        position_counts = {"RB": 0, "WR": 0, "TE": 0, "QB": 0, "DST": 0, "K": 0}
-        max_positions = {"RB": 4, "WR": 4, "TE": 2, "QB": 2, "DST": 1, "K": 1}
+        position_counts = dict.fromkeys(settings.max_positions, 0)
+        max_positions = settings.max_positions
 
         # Preferred draft order by position
-        position_draft_order = ["RB", "WR", "RB", "WR" ,"TE", "QB", "WR", "RB", "WR", "QB", "K", "DST", "TE", "RB"]
-
-        # Sort players by ADP (ascending order means best available first)
-        adp_data_sorted = adp_data.sort_values(by="AVG", ascending=True)
-
-        selected_players = set()
+        position_draft_order = settings.position_plan
 
-        for round_num, position in enumerate(position_draft_order):
-            top_options = []  # Store top 3 available players per position
-            best_available_player = None  # Best available pick to be added to final selection
+        # Positions are parsed and players sorted by ADP once; each position keeps its own queue
+        board = DraftBoard(adp_data)
+        engine = DraftEngine(board)
+        ranks = (pd.to_numeric(board.frame["Rank"], errors="coerce").fillna(0).to_numpy()
+                 if "Rank" in board.frame.columns else np.arange(1, len(board) + 1))
 
-            # Iterate through sorted players to find top 3 for the given position
-            for _, player in adp_data_sorted.iterrows():
-                player_position = player["POS"]
-                main_position = re.match(r'[A-Z]+', player_position).group()  # Extract main position (e.g., RB1 -> RB)
+        recommendations = []
+        for round_num, (position, pick) in enumerate(zip(position_draft_order, pick_positions)):
+            # Players ranked ahead of this pick are assumed taken by the other teams
+            engine.available[ranks < pick] = False
 
-                if (main_position == position and position_counts[main_position] < max_positions[main_position]
-                    and player["Player"] not in selected_players 
-                    and player["Rank"] >= pick_positions[round_num]):  # Ensures pick is valid for this round
-                    
-                    top_options.append(player["Player"])  # Add player to top picks
-                    selected_players.add(player["Player"])
+            top_options = []
+            if position_counts.get(position, 0) < max_positions.get(position, 0):
+                top_options = engine.top_available_at(position, options_per_round)
 
-                    if len(top_options) == 3:  # Stop once we have 3 options
-                        break
-
-            if not top_options:
-                logging.warning(f"No valid pick found for Round {round_num + 1}. Selecting best available player.")
-                for _, player in adp_data_sorted.iterrows():  # Iterate through sorted ADP data
-                    if player["Player"] not in selected_players:  # Pick first available player
-                        best_available_player = player["Player"]
-                        selected_players.add(best_available_player)
-                        break
+            if top_options:
+                selection = top_options[0]
             else:
-                best_available_player = top_options[0]  # Assign best available player from top options
-
-            if best_available_player:
-                position_counts[position] += 1
-                # mock_draft_top_selections.append((best_available_player, position))
-
-            # logging.info(f"Round {round_num + 1}: Best - {best_available_player}, "
-            #             f"Next: {top_options[1] if len(top_options) > 1 else 'N/A'}, "
-            #             f"Third: {top_options[2] if len(top_options) > 2 else 'N/A'}\n")
-
-            # Best available player is added to the final selection
-            # logging.info(f"Round {round_num + 1} Selection: {best_available_player}\n")
-            mock_draft_top_selections.append((best_available_player, position))
-
-            # Log the mock draft selections by name only
-            player_names = []
-            
-            for player in mock_draft_top_selections:
-                player_names.append(player[0])
-                # logging.info(player)
+                logging.warning(f"No valid pick found for Round {round_num + 1}. Selecting best available player.")
+                selection = engine.best_available()
+            if selection < 0:
+                break
+
+            engine.take(selection)
+            selected_position = board.positions[selection]
+            position_counts[selected_position] = position_counts.get(selected_position, 0) + 1
+            recommendations.append(RoundRecommendation(
+                round=round_num + 1,
+                pick=pick,
+                position=position,
+                selection=board.players[selection],
+                options=[DraftOption(board.players[i], board.positions[i], float(board.adp[i])) for i in top_options],
+            ))
 
         logging.info(f"------------------- Player Selection Complete ---------------------------------\n")
 
-        return player_names
+        return recommendations
 
-    def simulate_snake_draft(self, adp_data, num_teams=10, num_rounds=15):
+    def simulate_snake_draft(self, adp_data, num_teams=10, num_rounds=15, settings=None, grader=None, field_vor=None):
         """Simulates a snake draft based on ADP data and assigns players to teams.
         Args:
             adp_data (DataFrame): DataFrame containing ADP data.
             num_teams (int): Number of teams in the league.
             num_rounds (int): Number of rounds in the draft.
+            settings (LeagueSettings): Overrides num_teams and num_rounds and sets the pick order.
+            grader (DraftGrader): Adds starting-lineup VOR and a percentile to each team's grade.
+            field_vor (ndarray): Lineup VOR of a simulated field for the percentiles (e.g. from
+                simulate_draft_rosters); the teams in this draft otherwise.
         Returns:
             dict: Dictionary of teams with their drafted players and grades.
         """
-        total_picks = num_teams * num_rounds
-        draft_order = []
+        if settings is not None:
+            num_teams, num_rounds = settings.num_teams, settings.num_rounds
+        order = settings.pick_order() if settings is not None else snake_order(num_teams, num_rounds)
 
-        # Generate the snake draft order
-        for round_num in range(num_rounds):
-            round_picks = list(range(1, num_teams + 1)) if round_num % 2 == 0 else list(range(num_teams, 0, -1))
-            draft_order.extend(round_picks)
+        # Players are sorted by ADP once; each pick advances a cursor over an availability bitmap
+        board = DraftBoard(adp_data)
+        engine = DraftEngine(board)
+        engine.run(num_teams, num_rounds, order)
 
-        # Initialize draft selections
         teams = {f"Team {i+1}": [] for i in range(num_teams)}
-        selected_players = set()
-
-        for i in range(total_picks):
-            pick_position = draft_order[i]
-            team_name = f"Team {pick_position}"
+        for i, (team_index, player_index) in enumerate(zip(order, engine.picks)):
+            team_name = f"Team {team_index + 1}"
             round_number = (i // num_teams) + 1
-            # logging.info(f"Pick {i + 1} (Round {round_number}): {team_name}\n")
+            player = board.players[player_index]
+            teams[team_name].append((round_number, player))
+            logging.info(f"{team_name} drafted {player} in Round {round_number}, Pick {i + 1}\n")
 
-            # Sort players by ADP (ascending order means best available first)
-            adp_data_sorted = adp_data.sort_values(by="AVG", ascending=True)
+        # Grade each team's draft based on ADP, and by starting-lineup VOR when a grader is given
+        if grader is not None:
+            rosters = np.full((num_teams, num_rounds), -1, dtype=np.int32)
+            rosters[order[:len(engine.picks)], np.arange(len(engine.picks)) // num_teams] = engine.picks
+            vor, percentiles = grader.grade(rosters, field_vor)
 
-            # Iterate through sorted players to find the best available pick
-            for _, player in adp_data_sorted.iterrows():
-                if player["Player"] not in selected_players:
-                    teams[team_name].append((round_number, player["Player"]))
-                    selected_players.add(player["Player"])
-                    logging.info(f"{team_name} drafted {player['Player']} in Round {round_number}, Pick {i + 1}\n")
-                    break
-
-        # Grade each team's draft based on ADP
         team_grades = {}
-        for team, players in teams.items():
+        for team_index, (team, players) in enumerate(teams.items()):
             player_names = [player[1] for player in players]
             drafted_players_adp = adp_data[adp_data["Player"].isin(player_names)]
             grade = self.grade_draft_based_on_adp(drafted_players_adp, player_names)
             team_grades[team] = {"grade": round(float(grade), 1)}
-
-            # Sort the teams by grade
-            team_grades = dict(sorted(team_grades.items(), key=lambda item: item[1]["grade"], reverse=True))
+            if grader is not None:
+                team_grades[team]["vor"] = round(float(vor[team_index]), 1)
+                team_grades[team]["percentile"] = round(float(percentiles[team_index]), 1)
 
             # Display players one by one with a line between each
             logging.info(f"Team: {team}")
             for player in players:
                 logging.info(f"Round {player[0]}: {player[1]}")
 
-            logging.info(f"Grade: {team_grades[team]['grade']}\n") # Display the grade
+            logging.info(f"Grade: {team_grades[team]}\n") # Display the grade
 
-        return team_grades
+        # Sort the teams by grade once every team is graded
+        sort_key = "vor" if grader is not None else "grade"
+        return dict(sorted(team_grades.items(), key=lambda item: item[1][sort_key], reverse=True))
 
     def run(self, position, output_file):
         """Runs the full process for a single position.
@@ -374,8 +381,9 @@ if __name__ == "__main__":
     years = list(range(2020, 2026))
     for year in years:
         logging.info(f"Parsing ADP data for year: {year}")
-        parser.parse_all_positions(year)
-        print(f"ADP data for year {year} parsed successfully.\n")
+        adp_board = parser.parse_all_positions(year, refresh=True)
+        print(f"ADP board for {year}: {len(adp_board)} players")
+        print(adp_board.head(10), "\n")
 
     # adp_data = pd.read_csv("data/adp_data/adp_rankings_RB.csv")
     # print(adp_data.head(30))
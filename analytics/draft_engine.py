@@ -0,0 +1,173 @@
+"""
+Snake Draft Engine
+Players are sorted by ADP once into integer arrays. A draft is then an availability bitmap plus
+an advancing cursor: the best available player is the first set bit at or after the cursor, and
+the cursor only ever moves forward, so each pick is amortized O(1) instead of a re-sort and an
+iterrows() scan. Per-position cursors give the best available RB/WR/... the same way.
+Author: Patrick Mejia
+"""
+
+from functools import lru_cache
+import re
+import numpy as np
+import pandas as pd
+
+
+@lru_cache(maxsize=64)
+def pick_order(num_teams, num_rounds, reversal_round=None):
+    """
+    Team index (0-based) on the clock for every overall pick (read-only).
+    Rounds alternate direction as in a snake draft. With reversal_round=3 (third-round reversal),
+    round 3 repeats round 2's direction and the alternation continues from there.
+    """
+    rounds = np.arange(num_rounds)
+    reverse = rounds % 2 == 1
+    if reversal_round:
+        later = rounds >= reversal_round - 1
+        reverse[later] = ~reverse[later]
+    forward = np.arange(num_teams, dtype=np.int16)
+    order = np.where(reverse[:, None], forward[::-1], forward).ravel()
+    order.setflags(write=False)
+    return order
+
+
+def snake_order(num_teams, num_rounds):
+    """Team index (0-based) on the clock for every overall pick of a snake draft (read-only)."""
+    return pick_order(num_teams, num_rounds)
+
+
+def main_position(pos):
+    """"WR12" -> "WR", "DST3" -> "DST"."""
+    match = re.match(r"[A-Z]+", str(pos))
+    return match.group() if match else ""
+
+
+class DraftBoard:
+    """
+    Immutable ADP board: players sorted by ADP with parallel name, position and ADP arrays.
+    Built once and shared by every simulated or live draft.
+    """
+
+    def __init__(self, adp_data, adp_column="AVG"):
+        df = adp_data.copy()
+        df[adp_column] = pd.to_numeric(df[adp_column], errors="coerce")
+        df = df.dropna(subset=[adp_column]).sort_values(adp_column, kind="stable", ignore_index=True)
+
+        self.frame = df
+        self.players = df["Player"].to_numpy()
+        self.adp = df[adp_column].to_numpy(dtype=float)
+        self.positions = df["POS"].map(main_position).to_numpy() if "POS" in df.columns else np.full(len(df), "")
+        self.position_names = sorted(set(self.positions))
+        position_codes = {position: code for code, position in enumerate(self.position_names)}
+        self.position_codes = np.array([position_codes[pos] for pos in self.positions], dtype=np.int16)
+        # Board indexes of each position's players, already in ADP order
+        self.by_position = {
+            position: np.flatnonzero(self.positions == position) for position in self.position_names
+        }
+        self.index = {player: i for i, player in enumerate(self.players)}
+
+    def __len__(self):
+        return len(self.players)
+
+
+class DraftEngine:
+    """One draft in progress over a DraftBoard."""
+
+    def __init__(self, board):
+        self.board = board
+        self.reset()
+
+    def reset(self):
+        self.available = np.ones(len(self.board), dtype=bool)
+        self.cursor = 0
+        self.position_cursors = dict.fromkeys(self.board.by_position, 0)
+        self.picks = []
+
+    def take(self, player_index):
+        """Mark a player as drafted (O(1))."""
+        if not self.available[player_index]:
+            raise ValueError(f"{self.board.players[player_index]} has already been drafted")
+        self.available[player_index] = False
+        self.picks.append(player_index)
+        return player_index
+
+    def best_available(self):
+        """Board index of the best available player by ADP, or -1 when the board is empty."""
+        available = self.available
+        cursor = self.cursor
+        while cursor < len(available) and not available[cursor]:
+            cursor += 1
+        self.cursor = cursor
+        return cursor if cursor < len(available) else -1
+
+    def top_available(self, k):
+        """Up to k best available players overall (O(k) after the cursor catches up)."""
+        first = self.best_available()
+        if first < 0:
+            return []
+        result = []
+        for index in range(first, len(self.available)):
+            if self.available[index]:
+                result.append(index)
+                if len(result) == k:
+                    break
+        return result
+
+    def undo(self):
+        """Put the most recent pick back on the board; returns its board index, or -1 if nothing was drafted."""
+        if not self.picks:
+            return -1
+        player_index = self.picks.pop()
+        self.available[player_index] = True
+        # Cursors only move forward, so pull them back if the player sits behind them
+        self.cursor = min(self.cursor, player_index)
+        position = self.board.positions[player_index]
+        indexes = self.board.by_position[position]
+        self.position_cursors[position] = min(
+            self.position_cursors[position], int(np.searchsorted(indexes, player_index))
+        )
+        return player_index
+
+    def best_available_at(self, position):
+        """Best available player at one position, or -1."""
+        indexes = self.board.by_position.get(position)
+        if indexes is None:
+            return -1
+        cursor = self.position_cursors[position]
+        while cursor < len(indexes) and not self.available[indexes[cursor]]:
+            cursor += 1
+        self.position_cursors[position] = cursor
+        return int(indexes[cursor]) if cursor < len(indexes) else -1
+
+    def top_available_at(self, position, k):
+        """Up to k best available players at a position (O(k) after the cursor catches up)."""
+        first = self.best_available_at(position)
+        if first < 0:
+            return []
+        indexes = self.board.by_position[position]
+        result = []
+        for index in indexes[self.position_cursors[position]:]:
+            if self.available[index]:
+                result.append(int(index))
+                if len(result) == k:
+                    break
+        return result
+
+    def run(self, num_teams=10, num_rounds=15, order=None):
+        """
+        Draft strictly by ADP.
+        Args:
+            order (ndarray): Pick order from pick_order() or LeagueSettings.pick_order(); snake by default.
+        Returns:
+            ndarray: (num_rounds, num_teams) board indexes, -1 where the board ran out.
+        """
+        order = snake_order(num_teams, num_rounds) if order is None else order
+        rosters = np.full((num_rounds, num_teams), -1, dtype=np.int32)
+        for pick, team in enumerate(order):
+            player = self.best_available()
+            if player < 0:
+                break
+            self.take(player)
+            rosters[pick // num_teams, team] = player
+        return rosters
+
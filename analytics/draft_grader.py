@@ -0,0 +1,207 @@
+"""
+Draft Grader
+Grades rosters by value over replacement (VOR) instead of average ADP. Each position's
+replacement level is the projected points of the best player left once every team has filled
+its starting slots (flex and superflex slots go to the best remaining eligible players), and a
+roster's score is the summed VOR of its best legal starting lineup. Lineups for any number of
+rosters are built in one vectorized pass over a (rosters x roster slots) array, so a batch of
+simulated drafts is graded at once and each roster gets a percentile against that field.
+
+Usage (from the repo root):
+    python -m analytics.draft_grader --season 2025 --drafts 5000
+Author: Patrick Mejia
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from analytics.league_settings import DEFAULT_SETTINGS
+from analytics.projection_simulator import PROJECTIONS_FILE
+from pipelines.matchups import player_key
+
+OFFICIAL_STATS = {
+    "QB": "data/official_stats/official_qb_stats.csv",
+    "RB": "data/official_stats/official_rb_stats.csv",
+    "WR": "data/official_stats/official_wr_stats.csv",
+    "TE": "data/official_stats/official_te_stats.csv",
+    "K": "data/official_stats/official_k_stats.csv",
+}
+SEASON_GAMES = 17
+FLEX_POSITIONS = ("RB", "WR", "TE")
+SUPERFLEX_POSITIONS = ("QB", "RB", "WR", "TE")
+
+
+def load_projected_points(projections_file=PROJECTIONS_FILE, games=SEASON_GAMES):
+    """
+    Season point projections: Player, POS, Points, REC.
+    Last season's official FPTS, replaced by the simulated weekly mean x games where the
+    projection simulator has been run.
+    """
+    frames = []
+    for position, path in OFFICIAL_STATS.items():
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path)
+        frames.append(pd.DataFrame({
+            "Player": df["Player"],
+            "POS": position,
+            "Points": pd.to_numeric(df["FPTS"], errors="coerce"),
+            "REC": pd.to_numeric(df["REC"], errors="coerce") if "REC" in df.columns else 0.0,
+        }))
+    projections = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Player", "POS", "Points", "REC"])
+
+    if projections_file and os.path.exists(projections_file):
+        simulated = pd.read_csv(projections_file)
+        season_points = dict(zip(player_key(simulated["Player"]), simulated["Mean"] * games))
+        keys = player_key(projections["Player"])
+        projections["Points"] = keys.map(season_points).fillna(projections["Points"]).to_numpy()
+
+    projections["REC"] = projections["REC"].fillna(0.0)
+    return projections.dropna(subset=["Points"]).reset_index(drop=True)
+
+
+def _top_k(values, k):
+    """Per row, the k largest values (descending) and the remaining values."""
+    ordered = -np.sort(-values, axis=1)
+    return ordered[:, :k], ordered[:, k:]
+
+
+class DraftGrader:
+    """
+    VOR grading for rosters drafted from one DraftBoard.
+    Args:
+        board (DraftBoard): Board the roster indexes refer to.
+        projections (DataFrame): Player, POS, Points and optionally REC (see load_projected_points).
+        settings (LeagueSettings): Lineup, team count and TE premium.
+    """
+
+    def __init__(self, board, projections=None, settings=None):
+        self.board = board
+        self.settings = settings or DEFAULT_SETTINGS
+        projections = load_projected_points() if projections is None else projections
+
+        keys = player_key(projections["Player"]).to_numpy()
+        points = dict(zip(keys, pd.to_numeric(projections["Points"], errors="coerce").fillna(0.0)))
+        receptions = dict(zip(keys, projections["REC"] if "REC" in projections.columns else np.zeros(len(keys))))
+        board_keys = player_key(board.players)
+        self.points = board_keys.map(points).fillna(0.0).to_numpy(dtype=float, copy=True)
+        self.points += self.settings.te_premium_points(board.positions, board_keys.map(receptions).fillna(0.0))
+
+        self.replacement = self.replacement_levels()
+        replacement = np.array([self.replacement.get(pos, 0.0) for pos in board.positions])
+        self.vor = self.points - replacement
+
+    def replacement_levels(self):
+        """Position -> projected points of the first player not needed as a starter league-wide."""
+        settings = self.settings
+        starters = settings.starters
+        by_position = {
+            position: np.sort(self.points[self.board.positions == position])[::-1]
+            for position in SUPERFLEX_POSITIONS + ("K", "DST")
+        }
+        used = {position: settings.num_teams * starters.get(position, 0) for position in by_position}
+
+        # Flex and superflex slots go to the best players left after the dedicated starters
+        for slot, eligible in (("FLEX", FLEX_POSITIONS), ("SUPERFLEX", SUPERFLEX_POSITIONS)):
+            for _ in range(settings.num_teams * starters[slot]):
+                candidates = [
+                    (by_position[pos][used[pos]], pos) for pos in eligible if used[pos] < len(by_position[pos])
+                ]
+                if not candidates:
+                    break
+                used[max(candidates)[1]] += 1
+
+        return {
+            position: float(values[used[position]]) if used[position] < len(values) else 0.0
+            for position, values in by_position.items()
+        }
+
+    def lineup_vor(self, rosters):
+        """
+        Starting-lineup VOR for a batch of rosters.
+        Args:
+            rosters (ndarray): Board indexes with rosters along the last axis (-1 for empty slots),
+                e.g. (drafts, teams, rounds) from simulate_draft_rosters.
+        Returns:
+            ndarray: VOR with the leading shape of rosters. Empty or below-replacement starting
+            slots count as a replacement-level player (0).
+        """
+        rosters = np.asarray(rosters)
+        flat = rosters.reshape(-1, rosters.shape[-1])
+        filled = flat >= 0
+        vor = np.where(filled, self.vor[np.where(filled, flat, 0)], -np.inf)
+        positions = np.where(filled, self.board.positions[np.where(filled, flat, 0)], "")
+
+        starters = self.settings.starters
+        total = np.zeros(len(flat))
+        leftovers = {}
+        for position in SUPERFLEX_POSITIONS + ("K", "DST"):
+            values = np.where(positions == position, vor, -np.inf)
+            chosen, leftovers[position] = _top_k(values, starters.get(position, 0))
+            total += np.clip(chosen, 0, None).sum(axis=1)
+
+        flex_chosen, flex_left = _top_k(np.hstack([leftovers[pos] for pos in FLEX_POSITIONS]), starters["FLEX"])
+        total += np.clip(flex_chosen, 0, None).sum(axis=1)
+        superflex_pool = np.hstack([flex_left, leftovers["QB"]])
+        superflex_chosen, _ = _top_k(superflex_pool, starters["SUPERFLEX"])
+        total += np.clip(superflex_chosen, 0, None).sum(axis=1)
+        return total.reshape(rosters.shape[:-1])
+
+    def grade(self, rosters, field_vor=None):
+        """
+        VOR and percentile grade for a batch of rosters.
+        Args:
+            rosters (ndarray): Rosters along the last axis (see lineup_vor).
+            field_vor (ndarray): Lineup VOR of the comparison field; the batch itself if omitted.
+        Returns:
+            tuple: (VOR, percentile 0-100 of each roster within the field), both shaped like rosters[..., 0].
+        """
+        scores = self.lineup_vor(rosters)
+        field_vor = np.sort(np.ravel(scores if field_vor is None else field_vor))
+        # Share of the field scoring strictly lower, counting ties as half
+        below = np.searchsorted(field_vor, scores, side="left")
+        at_or_below = np.searchsorted(field_vor, scores, side="right")
+        percentile = (below + at_or_below) / 2 / len(field_vor) * 100
+        return scores, percentile
+
+    def roster_table(self, roster):
+        """Player, POS, Points, VOR for one roster."""
+        roster = np.asarray(roster)
+        roster = roster[roster >= 0]
+        return pd.DataFrame({
+            "Player": self.board.players[roster],
+            "POS": self.board.positions[roster],
+            "Points": self.points[roster].round(1),
+            "VOR": self.vor[roster].round(1),
+        })
+
+
+def letter_grade(percentile):
+    """Map a percentile (0-100) to a letter grade."""
+    cutoffs = [(90, "A"), (75, "B"), (50, "C"), (25, "D")]
+    return next((letter for cutoff, letter in cutoffs if percentile >= cutoff), "F")
+
+
+if __name__ == "__main__":
+    from analytics.draft_simulator import simulate_draft_rosters
+    from season_scripts.get_adp_stats import ADPHistory, current_adp_season
+
+    arg_parser = argparse.ArgumentParser(description="Grade simulated drafts by starting-lineup VOR.")
+    arg_parser.add_argument("--season", type=int, default=current_adp_season())
+    arg_parser.add_argument("--drafts", type=int, default=5_000)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--workers", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    draft_board, simulated = simulate_draft_rosters(
+        ADPHistory().board(args.season), args.drafts, seed=args.seed, workers=args.workers, settings=DEFAULT_SETTINGS
+    )
+    grader = DraftGrader(draft_board)
+    vor, percentiles = grader.grade(simulated)
+    print(f"Graded {vor.size} rosters in {time.perf_counter() - start:.1f}s")
+    print("Replacement levels:", {pos: round(level, 1) for pos, level in grader.replacement.items()})
+    print("Mean percentile by draft slot:", percentiles.mean(axis=0).round(1).tolist())
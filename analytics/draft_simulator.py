@@ -0,0 +1,237 @@
+"""
+Monte Carlo Draft Simulator
+Instead of every team taking strict consensus ADP, each simulated team ranks the board by its
+own noisy view of ADP: consensus AVG plus a normal draw scaled by how much the ADP sources
+(ESPN, Sleeper, CBS, NFL, RTSports, Fantrax, ...) disagree on that player. Thousands of drafts
+are run across a process pool with reproducible seeds, and every player's pick number is counted
+in a taken_at histogram, from which the chance a player is still on the board at any draft slot
+and round follows directly.
+
+Usage (from the repo root):
+    python -m analytics.draft_simulator --season 2025 --drafts 100000 --slot 4
+Author: Patrick Mejia
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from analytics.draft_engine import DraftBoard, snake_order
+from analytics.league_settings import LeagueSettings
+
+# Non-source columns on the ADP board
+BOARD_ID_COLUMNS = {"Rank", "player_id", "Player", "Team", "POS", "AVG", "Main_POS", "Player Team (Bye)"}
+MIN_SPREAD = 1.5          # ADP picks; floor for players the sources agree on exactly
+SPREAD_FRACTION = 0.08    # ...and a floor that grows with ADP, since late-round ADP is noisier
+DRAFTS_PER_CHUNK = 2_000
+
+
+def source_columns(adp_data):
+    """Per-source ADP columns on a board (everything that is not an id column)."""
+    return [col for col in adp_data.columns if col not in BOARD_ID_COLUMNS]
+
+
+def adp_spread(board, sources):
+    """
+    Per-player ADP standard deviation across sources, aligned with the board's ADP order.
+    Players listed by a single source fall back to the floors.
+    """
+    spread = np.zeros(len(board))
+    if sources:
+        values = board.frame[sources].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        listed = np.sum(~np.isnan(values), axis=1) > 1
+        spread[listed] = np.nanstd(values[listed], axis=1)
+    return np.maximum.reduce([spread, np.full(len(board), MIN_SPREAD), board.adp * SPREAD_FRACTION])
+
+
+def _noisy_draft(adp, spread, order, num_teams, rng):
+    """One draft where every team picks by its own noisy ADP; board index per overall pick (-1 once the board is empty)."""
+    n_players = len(adp)
+    # Each team's own ranking of the board for this draft
+    preferences = np.argsort(adp + spread * rng.standard_normal((num_teams, n_players)), axis=1)
+    available = np.ones(n_players, dtype=bool)
+    cursors = [0] * num_teams
+    picks = np.full(len(order), -1, dtype=np.int32)
+
+    for pick, team in enumerate(order):
+        ranking = preferences[team]
+        cursor = cursors[team]
+        while cursor < n_players and not available[ranking[cursor]]:
+            cursor += 1
+        cursors[team] = cursor
+        if cursor == n_players:
+            break
+        player = ranking[cursor]
+        available[player] = False
+        picks[pick] = player
+    return picks
+
+
+def _simulate_chunk(adp, spread, order, n_drafts, seed_sequence):
+    """taken_at histogram (players x (total picks + 1)) for n_drafts noisy drafts; the last bin is undrafted."""
+    rng = np.random.default_rng(seed_sequence)
+    num_teams = int(order.max()) + 1
+    n_players = len(adp)
+    total_picks = len(order)
+    histogram = np.zeros((n_players, total_picks + 1), dtype=np.int64)
+    taken_at = np.empty(n_players, dtype=np.int64)
+    pick_numbers = np.arange(total_picks)
+
+    for _ in range(n_drafts):
+        picks = _noisy_draft(adp, spread, order, num_teams, rng)
+        drafted = picks >= 0
+        taken_at.fill(total_picks)
+        taken_at[picks[drafted]] = pick_numbers[drafted]
+        histogram[np.arange(n_players), taken_at] += 1
+    return histogram
+
+
+def _roster_chunk(adp, spread, order, n_drafts, seed_sequence):
+    """(n_drafts, teams, rounds) board indexes for n_drafts noisy drafts."""
+    rng = np.random.default_rng(seed_sequence)
+    num_teams = int(order.max()) + 1
+    num_rounds = len(order) // num_teams
+    rounds = np.arange(len(order)) // num_teams
+    rosters = np.full((n_drafts, num_teams, num_rounds), -1, dtype=np.int32)
+    for draft in range(n_drafts):
+        rosters[draft, order, rounds] = _noisy_draft(adp, spread, order, num_teams, rng)
+    return rosters
+
+
+class DraftAvailability:
+    """
+    Result of simulate_draft_availability: taken_at counts per player and overall pick.
+    """
+
+    def __init__(self, board, histogram, n_drafts, order):
+        self.board = board
+        self.histogram = histogram
+        self.n_drafts = n_drafts
+        self.order = order
+        self.num_teams = int(order.max()) + 1
+        self.num_rounds = len(order) // self.num_teams
+        # survival[i, p] = share of drafts where player i was still available at overall pick p (0-based)
+        taken_before = np.cumsum(histogram, axis=1) - histogram
+        self.survival = 1 - taken_before / n_drafts
+
+    def pick_number(self, slot, round_number):
+        """Overall pick (1-based) for a draft slot (1-based) in a round (1-based)."""
+        start = (round_number - 1) * self.num_teams
+        return start + int(np.flatnonzero(self.order[start:start + self.num_teams] == slot - 1)[0]) + 1
+
+    def availability(self, slot, round_number):
+        """Probability each player is still available when `slot` picks in `round_number`."""
+        pick = self.pick_number(slot, round_number)
+        return pd.Series(self.survival[:, pick - 1], index=self.board.players, name=f"R{round_number} P{pick}")
+
+    def slot_table(self, slot, min_probability=0.05, max_probability=0.99):
+        """
+        Long table for one draft slot: Round, Pick, Player, POS, AVG, Available, for players whose
+        availability at that pick is uncertain (between min_probability and max_probability).
+        """
+        frames = []
+        for round_number in range(1, self.num_rounds + 1):
+            pick = self.pick_number(slot, round_number)
+            probability = self.survival[:, pick - 1]
+            mask = (probability >= min_probability) & (probability <= max_probability)
+            frames.append(pd.DataFrame({
+                "Round": round_number,
+                "Pick": pick,
+                "Player": self.board.players[mask],
+                "POS": self.board.positions[mask],
+                "AVG": self.board.adp[mask],
+                "Available": probability[mask].round(3),
+            }))
+        return pd.concat(frames, ignore_index=True).sort_values(["Round", "Available"], ascending=[True, False], ignore_index=True)
+
+    def expected_pick(self):
+        """Mean overall pick per player across simulations (undrafted counted as total picks + 1)."""
+        picks = np.arange(1, self.histogram.shape[1] + 1)
+        return pd.Series(self.histogram @ picks / self.n_drafts, index=self.board.players, name="Expected Pick")
+
+
+def _run_chunks(chunk_func, adp_data, n_drafts, num_teams, num_rounds, seed, workers, settings):
+    """Split n_drafts into fixed-size chunks seeded from one SeedSequence and run them on a process pool."""
+    order = settings.pick_order() if settings is not None else snake_order(num_teams, num_rounds)
+    board = DraftBoard(adp_data)
+    spread = adp_spread(board, source_columns(board.frame))
+
+    chunk_sizes = [DRAFTS_PER_CHUNK] * (n_drafts // DRAFTS_PER_CHUNK)
+    if n_drafts % DRAFTS_PER_CHUNK:
+        chunk_sizes.append(n_drafts % DRAFTS_PER_CHUNK)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [(board.adp, spread, order, size, child) for size, child in zip(chunk_sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(args) == 1:
+        results = [chunk_func(*chunk_args) for chunk_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(chunk_func, *zip(*args)))
+    return board, order, results
+
+
+def simulate_draft_availability(adp_data, n_drafts=100_000, num_teams=10, num_rounds=15, seed=0, workers=None,
+                                settings=None):
+    """
+    Run noisy drafts and collect per-pick availability.
+    Args:
+        adp_data (DataFrame): ADP board with Player, POS, AVG and per-source ADP columns.
+        n_drafts (int): Number of simulated drafts.
+        num_teams (int): Teams in the league.
+        num_rounds (int): Rounds in the draft.
+        seed (int): Base seed. Drafts are split into fixed-size chunks seeded from one SeedSequence,
+            so results are identical for any number of workers.
+        workers (int): Worker processes (defaults to the CPU count; 1 runs inline).
+        settings (LeagueSettings): Overrides num_teams and num_rounds and sets the pick order.
+    Returns:
+        DraftAvailability
+    """
+    board, order, histograms = _run_chunks(
+        _simulate_chunk, adp_data, n_drafts, num_teams, num_rounds, seed, workers, settings
+    )
+    return DraftAvailability(board, sum(histograms), n_drafts, order)
+
+
+def simulate_draft_rosters(adp_data, n_drafts=10_000, num_teams=10, num_rounds=15, seed=0, workers=None,
+                           settings=None):
+    """
+    Run noisy drafts and keep every roster, e.g. as the field for draft_grader.
+    Same arguments as simulate_draft_availability.
+    Returns:
+        tuple: (DraftBoard, ndarray of shape (n_drafts, teams, rounds) with board indexes, -1 if unfilled).
+    """
+    board, _, rosters = _run_chunks(
+        _roster_chunk, adp_data, n_drafts, num_teams, num_rounds, seed, workers, settings
+    )
+    return board, np.concatenate(rosters)
+
+
+if __name__ == "__main__":
+    from season_scripts.get_adp_stats import ADPHistory, current_adp_season
+
+    arg_parser = argparse.ArgumentParser(description="Simulate snake drafts from ADP spread.")
+    arg_parser.add_argument("--season", type=int, default=current_adp_season())
+    arg_parser.add_argument("--drafts", type=int, default=100_000)
+    arg_parser.add_argument("--teams", type=int, default=10)
+    arg_parser.add_argument("--bench", type=int, default=6, help="Bench slots (rounds = starters + bench)")
+    arg_parser.add_argument("--slot", type=int, default=1, help="Your draft slot (1-based)")
+    arg_parser.add_argument("--draft-order", choices=["snake", "third_round_reversal"], default="snake")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--workers", type=int, default=None)
+    args = arg_parser.parse_args()
+    league = LeagueSettings(num_teams=args.teams, bench=args.bench, draft_order=args.draft_order)
+
+    start = time.perf_counter()
+    result = simulate_draft_availability(
+        ADPHistory().board(args.season), args.drafts, seed=args.seed, workers=args.workers, settings=league
+    )
+    print(f"Simulated {args.drafts} drafts in {time.perf_counter() - start:.1f}s")
+    output_file = f"data/adp_data/availability_{args.season}_slot{args.slot}.csv"
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    table = result.slot_table(args.slot)
+    table.to_csv(output_file, index=False)
+    print(table.groupby("Round").head(5))
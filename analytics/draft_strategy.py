@@ -0,0 +1,210 @@
+"""
+Draft Strategy Search
+Searches round-by-round position plans (RB, WR, RB, ...) for one draft slot instead of using a
+fixed position_draft_order. A plan is scored by the expected starting-lineup VOR it produces:
+the value of taking a position at a pick is the expected VOR of the best player at that position
+still on the board, using the simulated availability probabilities from draft_simulator.
+
+Expected values are precomputed once for every overall pick, position and "how many of this
+position you already hold" as one table, so searching another slot is only table lookups. The
+search is a beam over rounds; plans holding the same position counts are merged and only the
+few best orderings are kept (a DP over roster composition), which keeps the beam small. Rounds
+left once every position is at its roster cap are planned as "BPA" (best player available).
+
+Usage (from the repo root):
+    python -m analytics.draft_strategy --season 2025 --slot 4 --drafts 20000
+Author: Patrick Mejia
+"""
+
+import argparse
+import time
+import numpy as np
+
+from analytics.draft_grader import FLEX_POSITIONS, SUPERFLEX_POSITIONS
+from analytics.league_settings import DEFAULT_SETTINGS
+
+BEAM_WIDTH = 256
+ORDERINGS_PER_STATE = 8   # Best orderings kept per roster composition, so top plans can differ in order
+BENCH_WEIGHT = 0.1   # Bench VOR counts a little, so depth breaks ties between equal lineups
+POSITIONS = ["QB", "RB", "WR", "TE", "K", "DST"]
+
+
+def expected_value_table(availability, vor, positions, max_per_position):
+    """
+    Expected VOR of the (k+1)-th best available player at each position and overall pick.
+    Players are treated as independently available with the simulated probabilities.
+    Args:
+        availability (ndarray): (players, picks) survival probabilities from DraftAvailability.
+        vor (ndarray): (players,) VOR aligned with the board; negative values count as 0.
+        positions (ndarray): (players,) main positions aligned with the board.
+        max_per_position (dict): Position -> most picks a plan can spend there.
+    Returns:
+        dict: Position -> ndarray of shape (max picks at that position, picks).
+    """
+    table = {}
+    n_picks = availability.shape[1]
+    for position in POSITIONS:
+        depth = max_per_position.get(position, 0)
+        if depth <= 0:
+            continue
+        members = np.flatnonzero(positions == position)
+        members = members[np.argsort(-vor[members], kind="stable")]
+        values = np.zeros((depth, n_picks))
+        # exactly[j] = P(exactly j of the better players are available), per pick
+        exactly = np.zeros((depth + 1, n_picks))
+        exactly[0] = 1.0
+        for player in members:
+            value = max(vor[player], 0.0)
+            if value <= 0:
+                break
+            available = availability[player]
+            values += value * available * exactly[:depth]
+            exactly[1:] = exactly[1:] * (1 - available) + exactly[:-1] * available
+            exactly[0] *= 1 - available
+        table[position] = values
+    return table
+
+
+def lineup_value(values_by_position, settings):
+    """Expected starting-lineup VOR (plus a small bench share) of one plan's expected player values."""
+    starters = settings.starters
+    total = 0.0
+    flex_pool = []
+    superflex_pool = []
+    bench = []
+    for position, values in values_by_position.items():
+        ordered = sorted(values, reverse=True)
+        slots = starters.get(position, 0)
+        total += sum(ordered[:slots])
+        rest = ordered[slots:]
+        if position in FLEX_POSITIONS:
+            flex_pool.extend(rest)
+        elif position in SUPERFLEX_POSITIONS:
+            superflex_pool.extend(rest)
+        else:
+            bench.extend(rest)
+
+    flex_pool.sort(reverse=True)
+    total += sum(flex_pool[:starters["FLEX"]])
+    superflex_pool = sorted(superflex_pool + flex_pool[starters["FLEX"]:], reverse=True)
+    total += sum(superflex_pool[:starters["SUPERFLEX"]])
+    bench.extend(superflex_pool[starters["SUPERFLEX"]:])
+    return total + BENCH_WEIGHT * sum(bench)
+
+
+def _signature(plan, round_values):
+    """Picks that add value, by round; orderings that only shuffle zero-value picks are the same plan."""
+    return tuple((round_number, pos) for round_number, (pos, value) in enumerate(zip(plan, round_values)) if value > 0)
+
+
+class StrategySearch:
+    """
+    Plan search over one simulated availability result and one VOR grader.
+    Args:
+        availability (DraftAvailability): Output of simulate_draft_availability for the league.
+        grader (DraftGrader): VOR per board player (same board and settings).
+        settings (LeagueSettings): Lineup, roster caps and pick order.
+    """
+
+    def __init__(self, availability, grader, settings=None):
+        self.settings = settings or DEFAULT_SETTINGS
+        self.availability = availability
+        self.board = availability.board
+        self.max_positions = {pos: self.settings.max_positions.get(pos, 0) for pos in POSITIONS}
+        # Shared by every slot: expected value per position, depth and overall pick
+        self.table = expected_value_table(
+            availability.survival, grader.vor, self.board.positions, self.max_positions
+        )
+        self._plans = {}
+
+    def search(self, slot, top_n=5, beam_width=BEAM_WIDTH):
+        """
+        Best position plans for a draft slot.
+        Returns:
+            list: Up to top_n dicts with "plan" (position per round), "expected_vor" and
+            "round_values" (expected VOR of each pick), best first.
+        """
+        key = (slot, beam_width)
+        if key not in self._plans:
+            self._plans[key] = self._search(slot, beam_width)
+        return self._plans[key][:top_n]
+
+    def _search(self, slot, beam_width):
+        picks = self.settings.picks_for_slot(slot) - 1
+        positions = [pos for pos in POSITIONS if pos in self.table]
+        # state: (score, counts, plan, values_by_position, round_values)
+        beam = [(0.0, tuple(0 for _ in positions), [], {pos: [] for pos in positions}, [])]
+
+        for pick in picks:
+            candidates = {}
+            for score, counts, plan, values_by_position, round_values in beam:
+                expanded = False
+                for p, position in enumerate(positions):
+                    depth = counts[p]
+                    if depth >= self.max_positions[position]:
+                        continue
+                    expanded = True
+                    value = float(self.table[position][depth, pick])
+                    next_counts = counts[:p] + (depth + 1,) + counts[p + 1:]
+                    next_values = dict(values_by_position)
+                    next_values[position] = values_by_position[position] + [value]
+                    candidates.setdefault(next_counts, []).append(
+                        (lineup_value(next_values, self.settings), next_counts, plan + [position],
+                         next_values, round_values + [value])
+                    )
+                if not expanded:
+                    candidates.setdefault(counts, []).append(
+                        (score, counts, plan + ["BPA"], values_by_position, round_values + [0.0])
+                    )
+
+            # Plans with the same roster composition only keep their best distinct orderings
+            merged = []
+            for states in candidates.values():
+                states.sort(key=lambda state: state[0], reverse=True)
+                kept, seen = 0, set()
+                for state in states:
+                    signature = _signature(state[2], state[4])
+                    if signature in seen:
+                        continue
+                    seen.add(signature)
+                    merged.append(state)
+                    kept += 1
+                    if kept == ORDERINGS_PER_STATE:
+                        break
+            merged.sort(key=lambda state: state[0], reverse=True)
+            beam = merged[:beam_width]
+
+        return [
+            {"plan": plan, "expected_vor": round(score, 1), "round_values": [round(value, 1) for value in round_values]}
+            for score, _, plan, _, round_values in beam
+        ]
+
+    def best_plan(self, slot):
+        """Position per round of the best plan, usable as LeagueSettings.position_plan."""
+        plans = self.search(slot, top_n=1)
+        return plans[0]["plan"] if plans else list(self.settings.position_plan)
+
+
+if __name__ == "__main__":
+    from analytics.draft_grader import DraftGrader
+    from analytics.draft_simulator import simulate_draft_availability
+    from season_scripts.get_adp_stats import ADPHistory, current_adp_season
+
+    arg_parser = argparse.ArgumentParser(description="Search draft position plans for a draft slot.")
+    arg_parser.add_argument("--season", type=int, default=current_adp_season())
+    arg_parser.add_argument("--slot", type=int, nargs="*", default=[1], help="Draft slot(s), 1-based")
+    arg_parser.add_argument("--drafts", type=int, default=20_000)
+    arg_parser.add_argument("--top", type=int, default=3)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    simulated = simulate_draft_availability(
+        ADPHistory().board(args.season), args.drafts, seed=args.seed, settings=DEFAULT_SETTINGS
+    )
+    search = StrategySearch(simulated, DraftGrader(simulated.board))
+    for draft_slot in args.slot:
+        start = time.perf_counter()
+        results = search.search(draft_slot, top_n=args.top)
+        print(f"Slot {draft_slot} ({time.perf_counter() - start:.2f}s)")
+        for result in results:
+            print(f"  {result['expected_vor']:>7}  {' '.join(result['plan'])}")
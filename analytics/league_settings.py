@@ -0,0 +1,137 @@
+"""
+League Settings
+One object describing a league for the draft tools: team count, starting lineup (including flex
+and superflex), TE premium, bench and keeper slots, and the draft order style. Roster limits,
+the mock-draft position plan and the pick order are derived from it, so the draft functions
+no longer hard-code a 10-team, 15-round snake league.
+Author: Patrick Mejia
+"""
+
+from dataclasses import dataclass, field
+import numpy as np
+
+from analytics.draft_engine import pick_order
+
+MIN_TEAMS = 8
+MAX_TEAMS = 16
+DRAFT_ORDERS = {"snake": None, "third_round_reversal": 3}
+
+# Mock draft position plan for the default lineup; other lineups adjust it in position_plan()
+BASE_POSITION_PLAN = ["RB", "WR", "RB", "WR", "TE", "QB", "WR", "RB", "WR", "QB", "K", "DST", "TE", "RB"]
+BENCH_FILL = ["RB", "WR"]
+
+
+@dataclass
+class LeagueSettings:
+    """
+    Args:
+        num_teams (int): Teams in the league (8-16).
+        qb, rb, wr, te, k, dst (int): Starting slots per position.
+        flex (int): RB/WR/TE flex slots.
+        superflex (int): QB/RB/WR/TE flex slots.
+        bench (int): Bench slots.
+        keepers (int): Roster spots filled by keepers before the draft (they use up draft rounds).
+        te_premium (float): Extra points per TE reception.
+        draft_order (str): "snake" or "third_round_reversal".
+        budget (int): Auction budget per team.
+        min_bid (int): Minimum auction bid (every roster spot costs at least this).
+        max_positions (dict): Optional per-position roster caps for mock drafts; derived if omitted.
+        position_plan (list): Optional mock draft position per round; derived if omitted.
+    """
+    num_teams: int = 10
+    qb: int = 1
+    rb: int = 2
+    wr: int = 2
+    te: int = 1
+    flex: int = 1
+    superflex: int = 0
+    k: int = 1
+    dst: int = 1
+    bench: int = 6
+    keepers: int = 0
+    te_premium: float = 0.0
+    draft_order: str = "snake"
+    budget: int = 200
+    min_bid: int = 1
+    max_positions: dict = field(default=None)
+    position_plan: list = field(default=None)
+
+    def __post_init__(self):
+        if not MIN_TEAMS <= self.num_teams <= MAX_TEAMS:
+            raise ValueError(f"num_teams must be between {MIN_TEAMS} and {MAX_TEAMS}, got {self.num_teams}")
+        if self.draft_order not in DRAFT_ORDERS:
+            raise ValueError(f"Unknown draft order '{self.draft_order}', expected one of {list(DRAFT_ORDERS)}")
+        if self.budget < self.min_bid * self.roster_size:
+            raise ValueError(f"budget {self.budget} cannot fill {self.roster_size} roster spots at ${self.min_bid}")
+        if not 0 <= self.keepers < self.roster_size:
+            raise ValueError(f"keepers must be between 0 and {self.roster_size - 1}, got {self.keepers}")
+        if self.max_positions is None:
+            self.max_positions = self.default_max_positions()
+        if self.position_plan is None:
+            self.position_plan = self.default_position_plan()
+        elif len(self.position_plan) > self.num_rounds:
+            raise ValueError(f"position_plan has {len(self.position_plan)} rounds but the draft has {self.num_rounds}")
+
+    @property
+    def starters(self):
+        """Starting slots per position, flex slots included under FLEX and SUPERFLEX."""
+        return {
+            "QB": self.qb, "RB": self.rb, "WR": self.wr, "TE": self.te,
+            "FLEX": self.flex, "SUPERFLEX": self.superflex, "K": self.k, "DST": self.dst,
+        }
+
+    @property
+    def roster_size(self):
+        return sum(self.starters.values()) + self.bench
+
+    @property
+    def num_rounds(self):
+        """Rounds actually drafted (keepers fill the rest of the roster)."""
+        return self.roster_size - self.keepers
+
+    @property
+    def total_picks(self):
+        return self.num_teams * self.num_rounds
+
+    def default_max_positions(self):
+        """Roster caps used by the mock draft: starters plus one backup at the skill positions."""
+        return {
+            "QB": self.qb + self.superflex + 1,
+            "RB": self.rb + self.flex + 1,
+            "WR": self.wr + self.flex + 1,
+            "TE": self.te + 1,
+            "K": self.k,
+            "DST": self.dst,
+        }
+
+    def default_position_plan(self):
+        """Mock draft target position per round, sized to num_rounds."""
+        plan = list(BASE_POSITION_PLAN)
+        if self.superflex:
+            plan.insert(2, "QB")
+        if self.te_premium > 0:
+            # A premium TE is worth an earlier pick
+            plan.remove("TE")
+            plan.insert(2, "TE")
+        while len(plan) < self.num_rounds:
+            plan.append(BENCH_FILL[len(plan) % len(BENCH_FILL)])
+        return plan[:self.num_rounds]
+
+    def pick_order(self):
+        """Cached, read-only team index (0-based) for every overall pick."""
+        return pick_order(self.num_teams, self.num_rounds, DRAFT_ORDERS[self.draft_order])
+
+    def picks_for_slot(self, slot):
+        """Overall pick numbers (1-based) for a draft slot (1-based)."""
+        return np.flatnonzero(self.pick_order() == slot - 1) + 1
+
+    def pick_number(self, slot, round_number):
+        """Overall pick number (1-based) for a draft slot and round (both 1-based)."""
+        return int(self.picks_for_slot(slot)[round_number - 1])
+
+    def te_premium_points(self, positions, receptions):
+        """Extra points from the TE premium for arrays of positions and receptions."""
+        return np.where(np.asarray(positions) == "TE", np.asarray(receptions, dtype=float) * self.te_premium, 0.0)
+
+
+DEFAULT_SETTINGS = LeagueSettings()
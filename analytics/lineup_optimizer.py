@@ -0,0 +1,246 @@
+"""
+Weekly Lineup Optimizer
+Start/sit decisions for many rosters at once. Weekly projections (projection_simulator's Mean)
+are laid out once as a shared player x week matrix with bye weeks from nfl_metadata/schedule.csv
+zeroed, and every roster is a row of player indexes into it.
+
+For LeagueSettings lineups the slot eligibility is nested (position slot inside FLEX inside
+SUPERFLEX), so filling position slots with their best players, then FLEX, then SUPERFLEX from
+what is left is optimal. That greedy fill runs as array operations over all rosters together.
+Custom slot lists (passed as `slots`, e.g. an RB/WR slot next to a WR/TE slot, where eligibility
+overlaps) are solved per roster as an assignment problem with scipy when it is installed, and
+fall back to filling the most restrictive slots first otherwise; `solver()` reports which.
+
+Usage (from the repo root):
+    python -m analytics.lineup_optimizer --rosters rosters.csv --week 5 --output lineups.csv
+    python -m analytics.lineup_optimizer --rosters rosters.csv --week 5 --slots QB RB RB WR WR RB/WR TE/WR QB/RB/WR/TE K DST
+    (rosters.csv has one row per rostered player: roster_id, Player)
+Author: Patrick Mejia
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+from analytics.league_settings import DEFAULT_SETTINGS
+from analytics.projection_simulator import PROJECTIONS_FILE
+from pipelines.matchups import load_schedule, player_key, player_teams
+from pipelines.strength_of_schedule import TEAM_IDS, WEEKS, opponent_index
+
+FLEX_ELIGIBLE = ("RB", "WR", "TE")
+SUPERFLEX_ELIGIBLE = ("QB", "RB", "WR", "TE")
+LINEUP_POSITIONS = ("QB", "RB", "WR", "TE", "K", "DST")
+
+
+class ProjectionMatrix:
+    """
+    Shared weekly projections: points[player, week - 1], zero on the player's bye week.
+    Args:
+        players (array): Player names.
+        positions (array): Position per player.
+        points (ndarray): (players, WEEKS) projected points.
+    """
+
+    def __init__(self, players, positions, points):
+        self.players = np.asarray(players, dtype=object)
+        self.positions = np.asarray(positions, dtype=object)
+        self.points = np.asarray(points, dtype=np.float32)
+        self.index = {key: i for i, key in enumerate(player_key(self.players))}
+
+    @classmethod
+    def build(cls, projections=None, schedule=None, teams=None):
+        """
+        Args:
+            projections (DataFrame): Player, Position, Mean (defaults to PROJECTIONS_FILE).
+            schedule (DataFrame): Output of matchups.load_schedule(); used for bye weeks.
+            teams (DataFrame): player_key -> team_id from matchups.player_teams().
+        """
+        if projections is None:
+            projections = pd.read_csv(PROJECTIONS_FILE)
+        if schedule is None:
+            schedule = load_schedule()
+        if teams is None:
+            teams = player_teams(schedule=schedule)
+
+        team_of = dict(zip(teams["player_key"], teams["team_id"]))
+        team_index = {team_id: i for i, team_id in enumerate(TEAM_IDS)}
+        rows = player_key(projections["Player"]).map(team_of).map(team_index).fillna(-1).astype(int).to_numpy()
+
+        points = np.repeat(projections["Mean"].to_numpy(dtype=np.float32)[:, None], WEEKS, axis=1)
+        byes = opponent_index(schedule) < 0
+        known = rows >= 0
+        points[known] = np.where(byes[rows[known]], 0.0, points[known])
+        return cls(projections["Player"], projections["Position"], points)
+
+    def roster_indexes(self, rosters):
+        """
+        Player names per roster -> (rosters, max roster size) index array, -1 for empty or unknown.
+        Returns:
+            tuple: (index array, list of names that were not found in the projections).
+        """
+        sizes = np.array([len(roster) for roster in rosters], dtype=np.int64)
+        indexes = np.full((len(rosters), sizes.max(initial=0)), -1, dtype=np.int32)
+        names = [name for roster in rosters for name in roster]
+        if not names:
+            return indexes, []
+        found = player_key(names).map(self.index).fillna(-1).astype(int).to_numpy()
+        rows = np.repeat(np.arange(len(rosters)), sizes)
+        columns = np.arange(len(names)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        indexes[rows, columns] = found
+        return indexes, [name for name, i in zip(names, found) if i < 0]
+
+
+def lineup_slots(settings=DEFAULT_SETTINGS):
+    """Slot labels in fill order: position slots, then FLEX, then SUPERFLEX."""
+    starters = settings.starters
+    slots = [pos for pos in LINEUP_POSITIONS for _ in range(starters.get(pos, 0))]
+    return slots + ["FLEX"] * starters["FLEX"] + ["SUPERFLEX"] * starters["SUPERFLEX"]
+
+
+def _fill(points, eligible, used, k):
+    """Best k eligible, unused columns per row; -1 where a roster has fewer than k."""
+    if k == 0:
+        return np.empty((len(points), 0), dtype=np.int64)
+    scores = np.where(eligible & ~used, points, -np.inf)
+    columns = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    found = np.isfinite(np.take_along_axis(scores, columns, axis=1))
+    rows = np.nonzero(found)[0]
+    used[rows, columns[found]] = True
+    return np.where(found, columns, -1)
+
+
+def parse_slots(slots):
+    """Custom slots from labels like "RB/WR/TE" (or already-split position lists) -> tuples of positions."""
+    return [tuple(slot.upper().split("/")) if isinstance(slot, str) else tuple(pos.upper() for pos in slot) for slot in slots]
+
+
+def solver(slots=None):
+    """Which solver optimize_lineups uses: nested greedy for LeagueSettings slots, else assignment or greedy."""
+    if slots is None:
+        return "nested"
+    return "assignment" if linear_sum_assignment is not None else "greedy"
+
+
+def optimize_lineups(matrix, rosters, week, settings=DEFAULT_SETTINGS, slots=None):
+    """
+    Optimal starting lineups for a batch of rosters.
+    Args:
+        matrix (ProjectionMatrix): Shared projections.
+        rosters (ndarray): (rosters, roster size) player indexes from roster_indexes (-1 for empty).
+        week (int): NFL week (1-based).
+        settings (LeagueSettings): Lineup slots when `slots` is not given.
+        slots (list): Optional custom slots (see parse_slots); solved per roster with assign_lineup.
+    Returns:
+        tuple: (starters as (rosters, slots) player indexes with -1 for unfilled slots,
+        slot labels, projected points per roster).
+    """
+    rosters = np.asarray(rosters)
+    if slots is not None:
+        return _custom_lineups(matrix, rosters, week, parse_slots(slots))
+    filled = rosters >= 0
+    safe = np.where(filled, rosters, 0)
+    points = np.where(filled, matrix.points[safe, week - 1], -np.inf)
+    positions = np.where(filled, matrix.positions[safe], "")
+    used = np.zeros(rosters.shape, dtype=bool)
+    starters = settings.starters
+
+    columns = [_fill(points, positions == pos, used, starters.get(pos, 0)) for pos in LINEUP_POSITIONS]
+    columns.append(_fill(points, np.isin(positions, FLEX_ELIGIBLE), used, starters["FLEX"]))
+    columns.append(_fill(points, np.isin(positions, SUPERFLEX_ELIGIBLE), used, starters["SUPERFLEX"]))
+    columns = np.hstack(columns)
+
+    chosen = np.where(columns >= 0, np.take_along_axis(rosters, np.maximum(columns, 0), axis=1), -1)
+    totals = np.where(chosen >= 0, matrix.points[np.maximum(chosen, 0), week - 1], 0.0).sum(axis=1)
+    return chosen, lineup_slots(settings), totals
+
+
+def _custom_lineups(matrix, rosters, week, slots):
+    """optimize_lineups for custom slots: one assignment problem per roster."""
+    chosen = np.full((len(rosters), len(slots)), -1, dtype=np.int64)
+    for row, roster in enumerate(rosters):
+        players = roster[roster >= 0]
+        assignment = assign_lineup(matrix.points[players, week - 1], matrix.positions[players], slots)
+        chosen[row] = [players[column] if column >= 0 else -1 for column in assignment]
+    totals = np.where(chosen >= 0, matrix.points[np.maximum(chosen, 0), week - 1], 0.0).sum(axis=1)
+    return chosen, ["/".join(slot) for slot in slots], totals
+
+
+def assign_lineup(points, positions, slots):
+    """
+    One roster against custom slots (each slot a tuple of eligible positions).
+    Solved exactly with scipy's assignment solver when available, otherwise slots are filled
+    greedily from the most restrictive.
+    Returns:
+        list: Roster column per slot (-1 when no eligible player is left).
+    """
+    points = np.asarray(points, dtype=float)
+    positions = np.asarray(positions, dtype=object)
+    eligible = np.array([[pos in slot for pos in positions] for slot in slots], dtype=bool).reshape(len(slots), len(positions))
+
+    if linear_sum_assignment is not None and len(positions):
+        # Ineligible pairs cost more than leaving the slot empty, so they are never chosen
+        penalty = np.abs(points).sum() + 1.0
+        cost = np.where(eligible, -points[None, :], penalty)
+        slot_rows, player_cols = linear_sum_assignment(cost)
+        assignment = [-1] * len(slots)
+        for slot, column in zip(slot_rows, player_cols):
+            if eligible[slot, column]:
+                assignment[slot] = int(column)
+        return assignment
+
+    assignment = [-1] * len(slots)
+    taken = np.zeros(len(positions), dtype=bool)
+    for slot in np.argsort(eligible.sum(axis=1), kind="stable"):
+        scores = np.where(eligible[slot] & ~taken, points, -np.inf)
+        if len(scores) and np.isfinite(scores.max()):
+            column = int(np.argmax(scores))
+            assignment[slot] = column
+            taken[column] = True
+    return assignment
+
+
+def lineup_table(matrix, roster_ids, starters, slots, week):
+    """Long table: roster_id, Slot, Player, Position, Points."""
+    rows = np.repeat(np.asarray(roster_ids, dtype=object), len(slots))
+    flat = starters.ravel()
+    safe = np.maximum(flat, 0)
+    return pd.DataFrame({
+        "roster_id": rows,
+        "Slot": np.tile(slots, len(roster_ids)),
+        "Player": np.where(flat >= 0, matrix.players[safe], None),
+        "Position": np.where(flat >= 0, matrix.positions[safe], None),
+        "Points": np.where(flat >= 0, matrix.points[safe, week - 1].astype(float), 0.0).round(2),
+    })
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Optimize weekly lineups for a batch of rosters.")
+    arg_parser.add_argument("--rosters", required=True, help="CSV with roster_id and Player columns")
+    arg_parser.add_argument("--week", type=int, required=True)
+    arg_parser.add_argument("--output", default="data/lineups/lineups.csv")
+    arg_parser.add_argument("--slots", nargs="+", help="Custom slots, e.g. QB RB/WR WR/TE (default: the standard lineup)")
+    args = arg_parser.parse_args()
+
+    roster_frame = pd.read_csv(args.rosters)
+    grouped = roster_frame.groupby("roster_id", sort=False)["Player"].agg(list)
+    projection_matrix = ProjectionMatrix.build()
+    roster_array, unknown = projection_matrix.roster_indexes(grouped.tolist())
+    if unknown:
+        print(f"{len(unknown)} players without projections (benched): {unknown[:10]}")
+
+    start = time.perf_counter()
+    lineup, slot_labels, projected = optimize_lineups(projection_matrix, roster_array, args.week, slots=args.slots)
+    print(f"Optimized {len(grouped)} rosters ({solver(args.slots)} solver) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    if solver(args.slots) == "greedy":
+        print("scipy is not installed: custom slots were filled greedily and may not be optimal")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    lineup_table(projection_matrix, grouped.index, lineup, slot_labels, args.week).to_csv(args.output, index=False)
+    print(pd.Series(projected, index=grouped.index, name="Projected").sort_values(ascending=False).head(10))
@@ -0,0 +1,213 @@
+"""
+Monte Carlo Weekly Projections
+Fits per-player stat distributions from the weekly game logs (volume, efficiency and touchdown
+rates) and simulates N seeded weeks per player in vectorized NumPy draws, reporting mean,
+median, floor, ceiling and boom/bust probabilities under the PPR weights from fantasy_points.
+
+Player rates are shrunk toward the position average by PRIOR_GAMES pseudo-games, so players
+with one or two logged games are not projected off a single outlier.
+
+Usage (from the repo root):
+    python -m analytics.projection_simulator --samples 10000 --seed 7
+Author: Patrick Mejia
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+import time
+import zlib
+import numpy as np
+import pandas as pd
+
+from pipelines.fantasy_points import POINT_SYSTEMS
+from pipelines.weekly_store import STAT_COLUMNS, load_weekly_store
+
+PROJECTIONS_FILE = "data/projections/weekly_projections.csv"
+N_SAMPLES = 10_000
+PRIOR_GAMES = 3
+FLOOR_PCT, CEILING_PCT = 10, 90
+
+# Position -> (boom threshold, bust threshold) in PPR points
+BOOM_BUST = {"QB": (25, 12), "RB": (20, 8), "WR": (20, 8), "TE": (15, 5), "K": (12, 5)}
+
+# Rate parameter -> (numerator stat, denominator stat)
+RATES = {
+    "cmp_rate": ("CMP", "PASS_ATT"),
+    "pass_td_rate": ("PASS_TD", "PASS_ATT"),
+    "int_rate": ("INT", "PASS_ATT"),
+    "pass_ypc": ("PASS_YDS", "CMP"),
+    "rush_ypa": ("RUSH_YDS", "RUSH_ATT"),
+    "rush_td_rate": ("RUSH_TD", "RUSH_ATT"),
+    "rec_ypr": ("REC_YDS", "REC"),
+    "rec_td_rate": ("REC_TD", "REC"),
+    "fg_rate": ("FGM", "FGA"),
+    "xp_rate": ("XPM", "XPA"),
+}
+# Per-game volumes drawn as Poisson counts
+VOLUMES = {"pass_att": "PASS_ATT", "rush_att": "RUSH_ATT", "rec": "REC", "fl": "FL", "fga": "FGA", "xpa": "XPA"}
+# Yardage rate -> (yards stat, attempts stat) whose per-play spread is estimated from game-to-game variation
+YARDAGE = {"pass_ypc": ("PASS_YDS", "CMP"), "rush_ypa": ("RUSH_YDS", "RUSH_ATT"), "rec_ypr": ("REC_YDS", "REC")}
+
+
+def fit_player_params(store, prior_games=PRIOR_GAMES):
+    """
+    Per-player distribution parameters from the weekly store, in one grouped pass.
+    Args:
+        store (DataFrame): Output of load_weekly_store().
+        prior_games (float): Pseudo-games of position-average production mixed into each player's rates.
+    Returns:
+        df (DataFrame): One row per player with Position, Games, volume means, shrunk rates and
+        per-play yardage spreads.
+    """
+    totals = store.groupby(["Player", "Position"])[STAT_COLUMNS].sum()
+    games = store.groupby(["Player", "Position"]).size().rename("Games")
+    position_totals = store.groupby("Position")[STAT_COLUMNS].sum()
+    position_games = store.groupby("Position").size()
+    position = totals.index.get_level_values("Position")
+
+    params = pd.DataFrame({"Games": games})
+    for name, stat in VOLUMES.items():
+        prior = (position_totals[stat] / position_games).reindex(position).to_numpy()
+        params[name] = (totals[stat].to_numpy() + prior * prior_games) / (games.to_numpy() + prior_games)
+
+    for name, (numerator, denominator) in RATES.items():
+        prior_rate = (position_totals[numerator] / position_totals[denominator].replace(0, np.nan)).fillna(0)
+        prior_volume = (position_totals[denominator] / position_games).reindex(position).to_numpy() * prior_games
+        params[name] = (
+            (totals[numerator].to_numpy() + prior_rate.reindex(position).to_numpy() * prior_volume)
+            / np.maximum(totals[denominator].to_numpy() + prior_volume, 1e-9)
+        )
+
+    # Per-play yardage sd: game-to-game sd of yards-per-play scaled by sqrt(plays per game)
+    for name, (yards, plays) in YARDAGE.items():
+        per_game = store[yards] / store[plays].where(store[plays] > 0)
+        spread = per_game.groupby([store["Player"], store["Position"]]).std().reindex(params.index)
+        plays_per_game = (totals[plays] / games).to_numpy()
+        params[f"{name}_sd"] = (spread.fillna(0).to_numpy() * np.sqrt(plays_per_game))
+
+    # Probabilities feed binomial draws; per-play yardage rates are left unbounded above
+    probabilities = [name for name in RATES if name not in YARDAGE]
+    params[probabilities] = params[probabilities].clip(0, 1)
+    return params.reset_index()
+
+
+def _yards(rng, plays, per_play, per_play_sd):
+    """Total yards on `plays` plays: mean plays * per_play, spread growing with sqrt(plays)."""
+    return plays * per_play + rng.standard_normal(plays.shape) * per_play_sd * np.sqrt(plays)
+
+
+def simulate_player(params, n_samples, rng):
+    """
+    Simulate n_samples weeks for one player.
+    Args:
+        params (dict): One row of fit_player_params().
+        n_samples (int): Number of simulated weeks.
+        rng (Generator): NumPy random generator.
+    Returns:
+        dict: Stat column -> array of n_samples simulated values.
+    """
+    size = n_samples
+    sims = {stat: np.zeros(size) for stat in STAT_COLUMNS}
+
+    pass_att = rng.poisson(params["pass_att"], size)
+    sims["PASS_ATT"] = pass_att
+    sims["CMP"] = rng.binomial(pass_att, params["cmp_rate"])
+    sims["PASS_YDS"] = _yards(rng, sims["CMP"], params["pass_ypc"], params["pass_ypc_sd"])
+    sims["PASS_TD"] = rng.binomial(pass_att, params["pass_td_rate"])
+    sims["INT"] = rng.binomial(pass_att, params["int_rate"])
+
+    rush_att = rng.poisson(params["rush_att"], size)
+    sims["RUSH_ATT"] = rush_att
+    sims["RUSH_YDS"] = _yards(rng, rush_att, params["rush_ypa"], params["rush_ypa_sd"])
+    sims["RUSH_TD"] = rng.binomial(rush_att, params["rush_td_rate"])
+
+    rec = rng.poisson(params["rec"], size)
+    sims["REC"] = rec
+    sims["REC_YDS"] = _yards(rng, rec, params["rec_ypr"], params["rec_ypr_sd"])
+    sims["REC_TD"] = rng.binomial(rec, params["rec_td_rate"])
+    sims["FL"] = rng.poisson(params["fl"], size)
+
+    sims["FGA"] = rng.poisson(params["fga"], size)
+    sims["FGM"] = rng.binomial(sims["FGA"], params["fg_rate"])
+    sims["FG_MISS"] = sims["FGA"] - sims["FGM"]
+    sims["XPA"] = rng.poisson(params["xpa"], size)
+    sims["XPM"] = rng.binomial(sims["XPA"], params["xp_rate"])
+    sims["XP_MISS"] = sims["XPA"] - sims["XPM"]
+    return sims
+
+
+def _player_rng(seed, player):
+    # Seeded per player name, so a player's draws don't change when the slate does
+    return np.random.default_rng(np.random.SeedSequence([seed, zlib.crc32(player.encode("utf-8"))]))
+
+
+def _simulate_chunk(rows, n_samples, seed, point_systems):
+    summaries = []
+    for params in rows:
+        sims = simulate_player(params, n_samples, _player_rng(seed, params["Player"]))
+        weights = point_systems.get(params["Position"], {})
+        points = sum(sims[stat] * weight for stat, weight in weights.items())
+        floor, median, ceiling = np.percentile(points, [FLOOR_PCT, 50, CEILING_PCT])
+        boom, bust = BOOM_BUST.get(params["Position"], (20, 8))
+        summaries.append({
+            "Player": params["Player"],
+            "Position": params["Position"],
+            "Games": params["Games"],
+            "Mean": points.mean(),
+            "Median": median,
+            "Floor": floor,
+            "Ceiling": ceiling,
+            "Std": points.std(),
+            "Boom %": (points >= boom).mean() * 100,
+            "Bust %": (points < bust).mean() * 100,
+        })
+    return summaries
+
+
+def simulate_slate(store=None, n_samples=N_SAMPLES, seed=0, workers=None, point_systems=POINT_SYSTEMS):
+    """
+    Project every player in the weekly store.
+    Args:
+        store (DataFrame): Output of load_weekly_store(); loaded if omitted.
+        n_samples (int): Simulated weeks per player.
+        seed (int): Base seed; results are reproducible per (seed, player).
+        workers (int): Worker processes (defaults to the CPU count; 1 runs inline).
+        point_systems (dict): Position -> {stat: points} scoring weights.
+    Returns:
+        df (DataFrame): Player, Position, Games, Mean, Median, Floor, Ceiling, Std, Boom %, Bust %.
+    """
+    if store is None:
+        store = load_weekly_store()
+    rows = fit_player_params(store).to_dict(orient="records")
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(rows) < 2 * workers:
+        summaries = _simulate_chunk(rows, n_samples, seed, point_systems)
+    else:
+        chunks = [rows[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_simulate_chunk, chunks, [n_samples] * workers, [seed] * workers, [point_systems] * workers)
+            summaries = [summary for chunk in results for summary in chunk]
+
+    df = pd.DataFrame(summaries)
+    numeric = ["Mean", "Median", "Floor", "Ceiling", "Std", "Boom %", "Bust %"]
+    df[numeric] = df[numeric].round(2)
+    return df.sort_values(["Position", "Mean"], ascending=[True, False], ignore_index=True)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Simulate weekly fantasy projections from the game logs.")
+    arg_parser.add_argument("--samples", type=int, default=N_SAMPLES, help="Simulated weeks per player")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Base random seed")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    projections = simulate_slate(n_samples=args.samples, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(PROJECTIONS_FILE), exist_ok=True)
+    projections.to_csv(PROJECTIONS_FILE, index=False)
+    print(projections.sort_values("Mean", ascending=False).head(20))
+    print(f"Projected {len(projections)} players x {args.samples} samples in {elapsed:.2f}s -> {PROJECTIONS_FILE}")
@@ -1,9 +1,19 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException
 from services.qb_service import get_qb_top_rankings
 from services.rb_service import get_rb_top_rankings
 from services.wr_service import get_wr_top_rankings
 from services.te_service import get_te_top_rankings
 from services.k_service import get_k_top_rankings
+from services.points_service import get_points, list_scoring_systems
+from services.matchup_service import get_matchups
+from services.schedule_service import get_strength_of_schedule
+from services.lineup_service import optimize_rosters
+from services.adp_service import get_adp_risers, get_adp_trajectory
+from services.draft_session_service import (
+    create_session, delete_session, get_recommendations, get_session, record_pick, undo_pick,
+)
 
 router = APIRouter()
 
@@ -22,3 +32,78 @@ def stats_by_position(position: str):
         return get_k_top_rankings()
     else:
         raise HTTPException(status_code=404, detail="Position not found")
+
+
+@router.get("/points/systems")
+def scoring_systems():
+    return list_scoring_systems()
+
+
+@router.get("/points/{scoring_system}")
+def points_by_system(scoring_system: str, week: Optional[int] = None, position: Optional[str] = None):
+    return get_points(scoring_system, week, position)
+
+
+@router.post("/points")
+def points_for_league_rules(rules: dict = Body(...), week: Optional[int] = None, position: Optional[str] = None):
+    return get_points(rules, week, position)
+
+
+@router.get("/matchups")
+def matchups(week: Optional[int] = None, position: Optional[str] = None, team: Optional[str] = None, limit: int = 50):
+    return get_matchups(week, position, team, limit)
+
+
+@router.get("/schedule/strength/{position}")
+def strength_of_schedule(position: str, start_week: int = 1, end_week: int = 18, playoffs: bool = False):
+    return get_strength_of_schedule(position, start_week, end_week, playoffs)
+
+
+@router.post("/draft/sessions")
+def start_draft_session(season: int = Body(...), slot: int = Body(...), settings: Optional[dict] = Body(None)):
+    return create_session(season, slot, settings)
+
+
+@router.get("/draft/sessions/{session_id}")
+def draft_session(session_id: str, limit: int = 10):
+    return get_session(session_id, limit)
+
+
+@router.post("/draft/sessions/{session_id}/picks")
+def draft_pick(session_id: str, player: str = Body(..., embed=True)):
+    return record_pick(session_id, player)
+
+
+@router.delete("/draft/sessions/{session_id}/picks/last")
+def undo_draft_pick(session_id: str):
+    return undo_pick(session_id)
+
+
+@router.get("/draft/sessions/{session_id}/recommendations")
+def draft_recommendations(session_id: str, limit: int = 10, position: Optional[str] = None):
+    return get_recommendations(session_id, limit, position)
+
+
+@router.delete("/draft/sessions/{session_id}")
+def end_draft_session(session_id: str):
+    return delete_session(session_id)
+
+
+@router.get("/adp/risers")
+def adp_risers(season: Optional[int] = None, window: str = "week", position: Optional[str] = None, limit: int = 20):
+    return get_adp_risers(season, window, position, limit)
+
+
+@router.get("/adp/fallers")
+def adp_fallers(season: Optional[int] = None, window: str = "week", position: Optional[str] = None, limit: int = 20):
+    return get_adp_risers(season, window, position, limit, fallers=True)
+
+
+@router.get("/adp/players/{player}/trajectory")
+def adp_trajectory(player: str, start_season: Optional[int] = None, end_season: Optional[int] = None):
+    return get_adp_trajectory(player, start_season, end_season)
+
+
+@router.post("/lineups/optimize")
+def optimize_lineups(week: int = Body(...), rosters: dict = Body(...), settings: Optional[dict] = Body(None), slots: Optional[list] = Body(None)):
+    return optimize_rosters(week, rosters, settings, slots)
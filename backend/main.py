@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+
+# Make the pipelines/ and analytics/ modules importable from the services
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
 from api.routes import router as api_router
 
 app = FastAPI()
@@ -0,0 +1,72 @@
+import polars as pl
+
+from season_scripts.get_adp_stats import player_id_from_name
+from utils.file_loader import DATA_DIR
+
+ADP_TRENDS = DATA_DIR / "adp_data" / "adp_trends.parquet"
+DELTAS = {"prev": "delta_prev", "week": "delta_week", "season": "delta_season", "year": "delta_year"}
+
+_cache = {"mtime": None, "latest": None, "by_player": None}
+
+
+def _indexes():
+    """
+    Trends table written by season_scripts.get_adp_stats, indexed once per file change:
+    the latest snapshot of each season (for risers/fallers) and each player's full trajectory.
+    """
+    mtime = ADP_TRENDS.stat().st_mtime
+    if _cache["mtime"] != mtime:
+        trends = pl.read_parquet(ADP_TRENDS).with_columns(pl.col("pos").str.extract(r"^([A-Z]+)", 1).alias("position"))
+        latest = trends.filter(pl.col("snapshot_date") == pl.col("snapshot_date").max().over("season"))
+        _cache["latest"] = {season: frame for (season,), frame in latest.partition_by("season", as_dict=True).items()}
+        _cache["by_player"] = {
+            player_id: frame.sort(["season", "snapshot_date"])
+            for (player_id,), frame in trends.partition_by("player_id", as_dict=True).items()
+        }
+        _cache["mtime"] = mtime
+    return _cache
+
+
+def get_adp_risers(season=None, window="week", position=None, limit=20, fallers=False):
+    """Biggest ADP movers in a season's latest snapshot; positive change means drafted earlier."""
+    try:
+        if window not in DELTAS:
+            raise ValueError(f"window must be one of {list(DELTAS)}")
+        latest = _indexes()["latest"]
+        season = season or max(latest)
+        df = latest[season]
+        if position is not None:
+            df = df.filter(pl.col("position") == position.upper())
+        column = DELTAS[window]
+        return (
+            df.drop_nulls(column)
+            .sort(column, descending=not fallers)
+            .head(limit)
+            .select("player_id", "player", "team", "pos", "snapshot_date", "adp", pl.col(column).alias("change"))
+            .with_columns(pl.col("snapshot_date").cast(pl.Utf8))
+            .to_dicts()
+        )
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def get_adp_trajectory(player, start_season=None, end_season=None):
+    """Consensus ADP snapshots for one player (player_id or name) across seasons."""
+    try:
+        by_player = _indexes()["by_player"]
+        frame = by_player.get(player)
+        if frame is None:
+            frame = by_player.get(player_id_from_name(player))
+        if frame is None:
+            raise LookupError(f"No ADP history for {player}")
+        if start_season is not None:
+            frame = frame.filter(pl.col("season") >= start_season)
+        if end_season is not None:
+            frame = frame.filter(pl.col("season") <= end_season)
+        return (
+            frame.select("season", "snapshot_date", "team", "pos", "adp", "pos_rank", *DELTAS.values())
+            .with_columns(pl.col("snapshot_date").cast(pl.Utf8))
+            .to_dicts()
+        )
+    except Exception as e:
+        return {"error": str(e)}
@@ -0,0 +1,257 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from analytics.draft_engine import DraftBoard, DraftEngine
+from analytics.league_settings import LeagueSettings
+from season_scripts.get_adp_stats import ADPHistory
+from utils.file_loader import DATA_DIR
+
+ADP_HISTORY = DATA_DIR / "adp_data" / "adp_history.parquet"
+SESSION_TTL_SECONDS = 6 * 60 * 60
+MAX_SESSIONS = 1000
+RECENT_PICKS = 5
+
+# Boards are immutable and shared by every session drafting from the same season
+_boards = {}
+# session_id -> DraftSession, least recently used first
+_sessions = OrderedDict()
+# Routes run in FastAPI's threadpool: this guards _boards and _sessions, and each session has
+# its own lock around its picks and reads
+_lock = threading.Lock()
+
+
+def _board(season):
+    """ADP board for a season from the stored history, rebuilt only when the history file changes."""
+    mtime = ADP_HISTORY.stat().st_mtime
+    with _lock:
+        cached = _boards.get(season)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    # Built outside the lock so picks in other sessions never wait on a parquet read; if two
+    # requests rebuild at once, both boards are equivalent and the last one stored wins
+    history = ADPHistory(path=str(ADP_HISTORY))
+    adp = history.board(season, history=history.read())
+    if adp.empty:
+        raise ValueError(f"No ADP data stored for {season}")
+    board = DraftBoard(adp)
+    with _lock:
+        _boards[season] = (mtime, board)
+    return board
+
+
+class DraftSession:
+    """
+    One live draft. Every index is updated in O(1) per pick, so reads never rescan the board:
+    the engine's cursors give best available overall and per position, per-team position counts
+    give roster needs, and per-position counts of starter-tier players left give scarcity.
+    """
+
+    def __init__(self, board, settings, slot):
+        self.board = board
+        self.settings = settings
+        self.slot = slot
+        self.engine = DraftEngine(board)
+        self.order = settings.pick_order()
+        self.my_picks = np.flatnonzero(self.order == slot - 1)
+        self.positions = list(board.position_names)
+        self.team_counts = np.zeros((settings.num_teams, len(self.positions)), dtype=np.int16)
+        self.rosters = [[] for _ in range(settings.num_teams)]
+
+        # Starter tier: the players at each position the league's starting lineups will use
+        starters = settings.starters
+        flex_share = settings.flex / 3 + settings.superflex / 4
+        self.tier_size = {
+            pos: int(round(settings.num_teams * (starters.get(pos, 0) + (flex_share if pos in ("QB", "RB", "WR", "TE") else 0))))
+            for pos in self.positions
+        }
+        self.positional_rank = np.empty(len(board), dtype=np.int32)
+        for indexes in board.by_position.values():
+            self.positional_rank[indexes] = np.arange(len(indexes))
+        self.tier_remaining = {pos: min(self.tier_size[pos], len(board.by_position[pos])) for pos in self.positions}
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def current_pick(self):
+        return len(self.engine.picks)
+
+    @property
+    def complete(self):
+        return self.current_pick >= len(self.order)
+
+    def on_the_clock(self):
+        return int(self.order[self.current_pick]) if not self.complete else None
+
+    def _apply(self, player_index, team, step):
+        position = self.board.positions[player_index]
+        self.team_counts[team, self.board.position_codes[player_index]] += step
+        if self.positional_rank[player_index] < self.tier_size[position]:
+            self.tier_remaining[position] -= step
+
+    def record_pick(self, player):
+        """Record the next pick in the draft order (O(1))."""
+        if self.complete:
+            raise ValueError("The draft is complete")
+        player_index = self.board.index.get(player)
+        if player_index is None:
+            raise ValueError(f"{player} is not on the board")
+        team = self.on_the_clock()
+        self.engine.take(player_index)
+        self.rosters[team].append(player_index)
+        self._apply(player_index, team, 1)
+        return {"pick": self.current_pick, "team": team + 1, "player": player}
+
+    def undo_pick(self):
+        """Take back the most recent pick (O(1))."""
+        player_index = self.engine.undo()
+        if player_index < 0:
+            raise ValueError("No picks to undo")
+        team = int(self.order[self.current_pick])
+        self.rosters[team].pop()
+        self._apply(player_index, team, -1)
+        return {"pick": self.current_pick + 1, "team": team + 1, "player": self.board.players[player_index]}
+
+    def _player(self, index):
+        return {"player": self.board.players[index], "position": self.board.positions[index], "adp": float(self.board.adp[index])}
+
+    def needs(self, team=None):
+        """Open starting slots per position for a team (your slot by default)."""
+        team = self.slot - 1 if team is None else team
+        starters = self.settings.starters
+        return {
+            pos: max(int(starters.get(pos, 0)) - int(self.team_counts[team, p]), 0)
+            for p, pos in enumerate(self.positions)
+            if starters.get(pos, 0)
+        }
+
+    def picks_until_turn(self):
+        """Picks before your slot is next on the clock (0 if you are on the clock)."""
+        upcoming = np.searchsorted(self.my_picks, self.current_pick)
+        return int(self.my_picks[upcoming]) - self.current_pick if upcoming < len(self.my_picks) else None
+
+    def scarcity_alerts(self):
+        """Positions you still need whose starter tier may be gone before your next pick."""
+        wait = self.picks_until_turn()
+        if wait is None:
+            return []
+        alerts = []
+        for pos, open_slots in self.needs().items():
+            remaining = self.tier_remaining.get(pos, 0)
+            if open_slots and remaining <= wait:
+                alerts.append({
+                    "position": pos,
+                    "starters_left": remaining,
+                    "picks_until_turn": wait,
+                    "message": f"{remaining} starting-caliber {pos} left with {wait} picks before your turn",
+                })
+        return alerts
+
+    def recommendations(self, limit=10, position=None):
+        if position:
+            indexes = self.engine.top_available_at(position.upper(), limit)
+        else:
+            indexes = self.engine.top_available(limit)
+        return [self._player(i) for i in indexes]
+
+    def state(self, limit=10):
+        on_clock = self.on_the_clock()
+        return {
+            "pick": self.current_pick + 1 if not self.complete else None,
+            "round": self.current_pick // self.settings.num_teams + 1 if not self.complete else None,
+            "on_the_clock": on_clock + 1 if on_clock is not None else None,
+            "your_slot": self.slot,
+            "picks_until_turn": self.picks_until_turn(),
+            "recent_picks": [self.board.players[i] for i in self.engine.picks[-RECENT_PICKS:]],
+            "your_roster": [self._player(i) for i in self.rosters[self.slot - 1]],
+            "needs": self.needs(),
+            "best_available": self.recommendations(limit),
+            "scarcity_alerts": self.scarcity_alerts(),
+        }
+
+
+def _evict(now):
+    """Drop sessions idle past the TTL (oldest first) and the least recently used beyond MAX_SESSIONS. Call with _lock held."""
+    while _sessions:
+        session_id, session = next(iter(_sessions.items()))
+        if now - session.touched < SESSION_TTL_SECONDS and len(_sessions) <= MAX_SESSIONS:
+            break
+        _sessions.pop(session_id)
+
+
+def _session(session_id):
+    now = time.monotonic()
+    with _lock:
+        _evict(now)
+        session = _sessions.get(session_id)
+        if session is None:
+            raise LookupError(f"Draft session {session_id} not found or expired")
+        session.touched = now
+        _sessions.move_to_end(session_id)
+    return session
+
+
+def create_session(season, slot, settings=None):
+    """Start a draft session; settings are LeagueSettings fields (num_teams, superflex, bench, ...)."""
+    try:
+        league = LeagueSettings(**(settings or {}))
+        if not 1 <= slot <= league.num_teams:
+            raise ValueError(f"slot must be between 1 and {league.num_teams}")
+        session = DraftSession(_board(season), league, slot)
+        session_id = uuid.uuid4().hex
+        with _lock:
+            _sessions[session_id] = session
+            _evict(session.touched)
+        with session.lock:
+            return {"session_id": session_id, **session.state()}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def record_pick(session_id, player):
+    try:
+        session = _session(session_id)
+        with session.lock:
+            return {**session.record_pick(player), **session.state()}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def undo_pick(session_id):
+    try:
+        session = _session(session_id)
+        with session.lock:
+            return {**session.undo_pick(), **session.state()}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def get_session(session_id, limit=10):
+    try:
+        session = _session(session_id)
+        with session.lock:
+            return session.state(limit)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def get_recommendations(session_id, limit=10, position=None):
+    try:
+        session = _session(session_id)
+        with session.lock:
+            return {
+                "best_available": session.recommendations(limit, position),
+                "needs": session.needs(),
+                "scarcity_alerts": session.scarcity_alerts(),
+            }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def delete_session(session_id):
+    with _lock:
+        return {"deleted": _sessions.pop(session_id, None) is not None}
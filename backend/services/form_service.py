@@ -0,0 +1,14 @@
+import polars as pl
+
+from utils.file_loader import DATA_DIR
+
+FORM_FILE = DATA_DIR / "rolling_metrics" / "form.csv"
+FORM_COLUMNS = ["Last 3 Avg", "Last 5 Avg", "EWMA", "Trend"]
+
+
+def with_form(df: pl.DataFrame) -> pl.DataFrame:
+    """Attach the latest rolling form columns (pipelines.rolling_metrics) to a ranking table by Player."""
+    if not FORM_FILE.exists():
+        return df
+    form = pl.read_csv(FORM_FILE).select(["Player"] + FORM_COLUMNS).unique(subset="Player", keep="first")
+    return df.join(form, on="Player", how="left")
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from analytics.league_settings import LeagueSettings
+from analytics.lineup_optimizer import ProjectionMatrix, lineup_table, optimize_lineups, solver
+from pipelines.matchups import load_schedule, player_teams
+from utils.file_loader import DATA_DIR
+
+PROJECTIONS = DATA_DIR / "projections" / "weekly_projections.csv"
+SCHEDULE = DATA_DIR / "nfl_metadata" / "schedule.csv"
+ROSTER = DATA_DIR / "nfl_metadata" / "nfl_roster.csv"
+
+_cache = {"mtime": None, "matrix": None}
+
+
+def _projection_matrix():
+    """Shared projection matrix, rebuilt only when the projections file changes."""
+    mtime = PROJECTIONS.stat().st_mtime
+    if _cache["mtime"] != mtime:
+        schedule = load_schedule(str(SCHEDULE))
+        teams = player_teams(data_dir=str(DATA_DIR), roster_path=str(ROSTER), schedule=schedule)
+        _cache["matrix"] = ProjectionMatrix.build(pd.read_csv(PROJECTIONS), schedule, teams)
+        _cache["mtime"] = mtime
+    return _cache["matrix"]
+
+
+def optimize_rosters(week, rosters, settings=None, slots=None):
+    """
+    Optimal starting lineups for many rosters in one call.
+    rosters maps a roster id to its player names; settings are LeagueSettings fields;
+    slots optionally replaces the lineup with custom slots like ["QB", "RB/WR", "WR/TE"].
+    """
+    try:
+        league = LeagueSettings(**(settings or {}))
+        matrix = _projection_matrix()
+        roster_ids = list(rosters)
+        indexes, missing = matrix.roster_indexes([rosters[roster_id] for roster_id in roster_ids])
+        starters, labels, totals = optimize_lineups(matrix, indexes, week, league, slots)
+        table = lineup_table(matrix, roster_ids, starters, labels, week)
+        lineups = {roster_id: {"projected": round(float(total), 2), "starters": []} for roster_id, total in zip(roster_ids, totals)}
+        for row in table.to_dict(orient="records"):
+            lineups[row.pop("roster_id")]["starters"].append(row)
+        return {"week": week, "solver": solver(slots), "lineups": lineups, "unknown_players": missing}
+    except Exception as e:
+        return {"error": str(e)}
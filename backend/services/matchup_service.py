@@ -0,0 +1,31 @@
+import polars as pl
+
+from utils.file_loader import DATA_DIR
+
+MATCHUP_MATRIX = DATA_DIR / "matchups" / "matchup_matrix.csv"
+
+_cache = {"mtime": None, "df": None}
+
+
+def _matchup_matrix():
+    """Matrix written by pipelines.matchups, re-read only when the file changes."""
+    mtime = MATCHUP_MATRIX.stat().st_mtime
+    if _cache["mtime"] != mtime:
+        _cache["df"] = pl.read_csv(MATCHUP_MATRIX)
+        _cache["mtime"] = mtime
+    return _cache["df"]
+
+
+def get_matchups(week=None, position=None, team=None, limit=50):
+    """Player vs opposing defense matchups, best first."""
+    try:
+        df = _matchup_matrix()
+        if week is not None:
+            df = df.filter(pl.col("Week") == week)
+        if position is not None:
+            df = df.filter(pl.col("Position") == position.upper())
+        if team is not None:
+            df = df.filter(pl.col("team_id") == team.upper())
+        return df.sort("Matchup Score", descending=True).head(limit).to_dicts()
+    except Exception as e:
+        return {"error": str(e)}
@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+from pipelines.scoring_rules import available_scoring_systems, load_scoring_system, score_player_weeks
+from pipelines.weekly_store import load_weekly_store
+from utils.file_loader import DATA_DIR
+
+
+@lru_cache(maxsize=1)
+def _weekly_store():
+    return load_weekly_store(str(DATA_DIR))
+
+
+def list_scoring_systems():
+    return available_scoring_systems()
+
+
+def get_points(scoring_system, week=None, position=None):
+    """Weekly fantasy points under a named scoring system or a league's own rules dict."""
+    try:
+        if isinstance(scoring_system, str):
+            scoring_system = load_scoring_system(scoring_system)
+        # The points column gets a fixed name so a system named "Player", "Week", ... cannot replace another column
+        scoring_system = {**scoring_system, "name": "Points"}
+        df = score_player_weeks([scoring_system], _weekly_store(), use_disk_cache=False)
+        if week is not None:
+            df = df[df["Week"] == week]
+        if position is not None:
+            df = df[df["Position"] == position.upper()]
+        return df.sort_values(["Week", "Points"], ascending=[True, False]).to_dict(orient="records")
+    except Exception as e:
+        return {"error": str(e)}
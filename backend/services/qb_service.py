@@ -1,9 +1,10 @@
 from utils.file_loader import load_csv_data
+from services.form_service import with_form
 
 def get_qb_top_rankings():
     try:
         df = load_csv_data("official_qb_stats.csv")
-        df = df.sort("Score", descending=True)
+        df = with_form(df.sort("Score", descending=True))
         return df.to_dicts()
     except Exception as e:
         return {"error": str(e)}
@@ -0,0 +1,29 @@
+from pipelines.strength_of_schedule import PLAYOFF_WEEKS, WEEKS, StrengthOfSchedule
+from utils.file_loader import DATA_DIR
+
+SOS_FILE = DATA_DIR / "strength_of_schedule" / "sos.npz"
+
+_cache = {"mtime": None, "sos": None}
+
+
+def _strength_of_schedule():
+    """Array written by pipelines.strength_of_schedule, re-read only when the file changes."""
+    mtime = SOS_FILE.stat().st_mtime
+    if _cache["mtime"] != mtime:
+        _cache["sos"] = StrengthOfSchedule.load(SOS_FILE)
+        _cache["mtime"] = mtime
+    return _cache["sos"]
+
+
+def get_strength_of_schedule(position, start_week=1, end_week=WEEKS, playoffs=False):
+    """Team -> average opposing defense rating (higher is tougher), easiest first."""
+    try:
+        sos = _strength_of_schedule()
+        weeks = PLAYOFF_WEEKS if playoffs else range(start_week, end_week + 1)
+        by_team = sos.by_team(position.upper(), weeks)
+        return [
+            {"team_id": team_id, "difficulty": difficulty}
+            for team_id, difficulty in sorted(by_team.items(), key=lambda item: item[1])
+        ]
+    except Exception as e:
+        return {"error": str(e)}
@@ -1,7 +1,9 @@
 from pathlib import Path
 import polars as pl
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data"
+
 def load_csv_data(filename: str) -> pl.DataFrame:
-    project_root = Path(__file__).resolve().parents[2]
-    csv_path = project_root / "frontend" / "nflstats-frontend" / "public" / "data" / "official_stats" / filename
+    csv_path = PROJECT_ROOT / "frontend" / "nflstats-frontend" / "public" / "data" / "official_stats" / filename
     return pl.read_csv(csv_path)
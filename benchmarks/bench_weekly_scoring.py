@@ -0,0 +1,79 @@
+"""
+Benchmark: pandas vs Polars weekly scoring
+Replays the recorded season tables in data/official_stats as raw scraped tables for every
+position and week, then times the per-table pandas path (score_table) against the single
+lazy Polars plan (rank_weekly_tables) and checks both pick the same top-N players.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_weekly_scoring
+"""
+
+import time
+import pandas as pd
+
+from pipelines.get_weekly_stats import rank_weekly_tables, score_table
+
+RECORDED_INPUTS = {
+    "qb": "data/official_stats/official_qb_stats.csv",
+    "rb": "data/official_stats/official_rb_stats.csv",
+    "wr": "data/official_stats/official_wr_stats.csv",
+    "te": "data/official_stats/official_te_stats.csv",
+    "k": "data/official_stats/official_k_stats.csv",
+}
+
+# Recorded tables were saved after renaming; restore the duplicated headers FantasyPros serves
+RAW_HEADER_NAMES = {
+    "qb": {"R_ATT": "ATT", "R_YDS": "YDS", "R_TD": "TD"},
+    "rb": {"REC_YDS": "YDS", "REC_TD": "TD"},
+}
+DERIVED_COLUMNS = ["Score", "Weighted Score"]
+WEEKS = range(1, 19)
+
+
+def load_recorded_tables():
+    """(position, week) -> (headers, rows) with every value as a string, like a fresh scrape."""
+    tables = {}
+    for position, path in RECORDED_INPUTS.items():
+        df = pd.read_csv(path, dtype=str).drop(columns=DERIVED_COLUMNS, errors="ignore")
+        headers = [RAW_HEADER_NAMES.get(position, {}).get(col, col) for col in df.columns]
+        rows = df.fillna("").values.tolist()
+        for week in WEEKS:
+            tables[(position, week)] = (headers, rows)
+    return tables
+
+
+def _best_of(func, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(repeats=5):
+    tables = load_recorded_tables()
+
+    pandas_time, pandas_results = _best_of(
+        lambda: {key: score_table(key[0], headers, rows) for key, (headers, rows) in tables.items()}, repeats
+    )
+    polars_time, polars_result = _best_of(lambda: rank_weekly_tables(tables), repeats)
+
+    mismatches = 0
+    for (position, week), df in pandas_results.items():
+        polars_players = polars_result.filter(
+            (polars_result["position"] == position) & (polars_result["week"] == week)
+        )["Player"].to_list()
+        if set(polars_players) != set(df["Player"]):
+            mismatches += 1
+
+    print(f"Tables: {len(tables)} ({len(RECORDED_INPUTS)} positions x {len(WEEKS)} weeks)")
+    print(f"pandas per-table path: {pandas_time * 1000:8.1f} ms")
+    print(f"Polars single plan:    {polars_time * 1000:8.1f} ms")
+    print(f"Speedup:               {pandas_time / polars_time:8.1f}x")
+    print(f"Top-N mismatches:      {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Fantasy Points Engine
+Scores every player-week in the weekly store in one vectorized pass using
+position-specific stat weights. For several league formats at once see scoring_rules.
+Author: Patrick Mejia
+"""
+
+import numpy as np
+import pandas as pd
+
+from pipelines.scoring_rules import load_scoring_system, position_weights
+from pipelines.weekly_store import STAT_COLUMNS, load_weekly_store
+
+# ESPN-style PPR scoring, keyed by unified stat column (declared in scoring_systems/ppr.json)
+POINT_SYSTEMS = position_weights(load_scoring_system("ppr"))
+
+# FantasyPros table columns -> unified stat columns, per position
+LEGACY_COLUMNS = {
+    "QB": {"YDS": "PASS_YDS", "TD": "PASS_TD", "INT": "INT", "R_YDS": "RUSH_YDS", "R_TD": "RUSH_TD", "FL": "FL"},
+    "RB": {"YDS": "RUSH_YDS", "TD": "RUSH_TD", "REC": "REC", "REC_YDS": "REC_YDS", "REC_TD": "REC_TD", "FL": "FL"},
+    "WR": {"YDS": "REC_YDS", "TD": "REC_TD", "REC": "REC", "FL": "FL"},
+    "TE": {"YDS": "REC_YDS", "TD": "REC_TD", "REC": "REC", "FL": "FL"},
+    "K": {"FGM": "FGM", "Field Goals Missed": "FG_MISS", "XPM": "XPM"},
+}
+
+POSITIONS = list(POINT_SYSTEMS)
+
+
+def weight_matrix(point_systems=POINT_SYSTEMS):
+    """Position x stat weight matrix aligned with POSITIONS and STAT_COLUMNS."""
+    weights = np.zeros((len(POSITIONS), len(STAT_COLUMNS)))
+    for i, position in enumerate(POSITIONS):
+        for stat, weight in point_systems.get(position, {}).items():
+            weights[i, STAT_COLUMNS.index(stat)] = weight
+    return weights
+
+
+def score_weekly_points(store=None, point_systems=POINT_SYSTEMS):
+    """
+    Score every player across every week and position in one pass.
+    Args:
+        store (DataFrame): Output of load_weekly_store(); loaded if omitted.
+        point_systems (dict): Position -> {stat column: points per unit}.
+    Returns:
+        df (DataFrame): Tidy table of Player, Position, Week, Points.
+    """
+    if store is None:
+        store = load_weekly_store()
+
+    stats = store[STAT_COLUMNS].to_numpy(dtype=float)
+    position_index = pd.Categorical(store["Position"], categories=POSITIONS).codes
+    weights = np.vstack([weight_matrix(point_systems), np.zeros(len(STAT_COLUMNS))])  # -1 -> unscored row
+
+    points = np.einsum("ij,ij->i", stats, weights[position_index])
+
+    return pd.DataFrame({
+        "Player": store["Player"].to_numpy(),
+        "Position": store["Position"].to_numpy(),
+        "Week": store["Week"].to_numpy(),
+        "Points": points.round(2),
+    })
+
+
+def score_legacy_table(df, position, point_systems=POINT_SYSTEMS):
+    """Points for a FantasyPros-style table (YDS, TD, REC, ...) for one position."""
+    weights = point_systems.get(position, {})
+    points = pd.Series(0.0, index=df.index)
+    for column, stat in LEGACY_COLUMNS.get(position, {}).items():
+        if column in df.columns and stat in weights:
+            points += pd.to_numeric(df[column], errors="coerce").fillna(0) * weights[stat]
+    return points
+
+
+if __name__ == "__main__":
+    import time
+
+    weekly_store = load_weekly_store()
+    start = time.perf_counter()
+    season_points = score_weekly_points(weekly_store)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(season_points.sort_values("Points", ascending=False).head(20))
+    print(f"Scored {len(season_points)} player-weeks in {elapsed_ms:.1f} ms")
@@ -6,6 +6,8 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 
+from pipelines.normalization import normalize
+
 def get_defensive_stats_versus_receiving():
     """
     Function to scrape defensive stats versus receiving stats from the NFL website.
@@ -53,11 +55,7 @@ def find_best_defenses_versus_receiving(df):
         + (df["20+"] * 0.1)
     )
 
-    df["Weighted Score"] = 100 - (
-        (df["Score"] - df["Score"].min())
-        / (df["Score"].max() - df["Score"].min())
-        * 100
-    )
+    df["Weighted Score"] = normalize(df, "Score", invert=True)
 
     # Remove null records or columns
     df.dropna(axis=0, how="any", inplace=True)
@@ -128,11 +126,7 @@ def find_best_defenses_versus_rushing(df):
         + (df["Rush FUM"] * 0.1)
     )
 
-    df["Weighted Score"] = 100 - (
-        (df["Score"] - df["Score"].min())
-        / (df["Score"].max() - df["Score"].min())
-        * 100
-    )
+    df["Weighted Score"] = normalize(df, "Score", invert=True)
 
     # Remove null records or columns
     df.dropna(axis=0, how="any", inplace=True)
@@ -193,9 +187,7 @@ def find_top_defense_interceptions(df):
     # Calculate a composite score based on weighted stats
     df["Score"] = (df["INT"] * 0.8) + (df["INT TD"]) + (df["INT Yds"] * 0.2)
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Remove null records or columns
     df.dropna(axis=0, how="any", inplace=True)
@@ -256,9 +248,7 @@ def find_top_defense_fumbles(df):
     # Calculate a composite score based on weighted stats
     df["Score"] = (df["FF"] * 0.5) + (df["FR"] * 0.5) + (df["FR TD"] * 0.3)
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Remove null records or columns
     df.dropna(axis=0, how="any", inplace=True)
@@ -319,9 +309,7 @@ def find_top_defense_tackles(df):
     # Calculate a composite score based on weighted stats
     df["Score"] = (df["Sck"] * 0.5) + (df["Solo"] * 0.3) + (df["Comb"] * 0.5)
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Remove null records or columns
     df.dropna(axis=0, how="any", inplace=True)
@@ -395,9 +383,7 @@ def find_best_special_teams(df):
         + (df["40+"] * 0.1)
     )
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Sort special teams by the composite score in descending order
     best_special_teams = df.sort_values(by="Weighted Score", ascending=False).head(32)
@@ -460,9 +446,7 @@ def find_best_punt_receivers(df):
         + (df["20+"] * 0.2)
     )
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Sort punters by the composite score in descending order
     best_punters = df.sort_values(by="Weighted Score", ascending=False).head(32)
@@ -476,38 +460,39 @@ def find_best_punt_receivers(df):
     return best_punters
 
 
+def _clean_team_column(df):
+    """Strip newlines and keep the first word of the team name so tables can be joined on Team."""
+    df = df.replace("\n", "", regex=True)
+    df["Team"] = df["Team"].str.split().str[0]
+    return df
+
+
+def _team_scores(df, column):
+    """Team -> Weighted Score (already normalized by the find_* functions), renamed to `column`."""
+    df = _clean_team_column(df.copy())
+    return pd.DataFrame({"Team": df["Team"], column: df["Weighted Score"]}).drop_duplicates("Team")
+
+
 def get_best_special_teams(df1, df2):
     """
     Function to find the best special teams based on a combination of return and punting stats.
+    The two tables are joined on Team, so each team's return and punting scores are paired.
     Args:
         df1 (DataFrame): A pandas DataFrame containing the special teams return stats.
         df2 (DataFrame): A pandas DataFrame containing the special teams punting stats.
         Returns:
         best_special_teams (DataFrame): A pandas DataFrame containing the top special teams ranked by a composite score.
     """
-    # Normalize the scores for each category
-    df1["Weighted Score"] = (
-        (df1["Weighted Score"] - df1["Weighted Score"].min())
-        / (df1["Weighted Score"].max() - df1["Weighted Score"].min())
-    ) * 100
-    df2["Weighted Score"] = (
-        (df2["Weighted Score"] - df2["Weighted Score"].min())
-        / (df2["Weighted Score"].max() - df2["Weighted Score"].min())
-    ) * 100
+    df1 = _clean_team_column(df1.copy()).drop_duplicates("Team")
+    df1 = df1.merge(_team_scores(df2, "Punting Score"), on="Team", how="inner")
 
     # Combine the scores for return and punting
-    df1["Combined Score"] = df1["Weighted Score"] + df2["Weighted Score"]
+    df1["Combined Score"] = df1["Weighted Score"] + df1["Punting Score"]
 
     # Remove null records or columns
     df1.dropna(axis=0, how="any", inplace=True)
     df1.dropna(axis=1, how="all", inplace=True)
 
-    # Remove newline characters from the dataframe
-    df1.replace("\n", "", regex=True, inplace=True)
-
-    # Remove everything after the first word for the team name
-    df1["Team"] = df1["Team"].str.split().str[0]
-
     # Sort special teams by the combined score in descending order
     best_special_teams = df1.sort_values(
         by="Combined Score", ascending=False, ignore_index=True
@@ -525,6 +510,7 @@ def get_best_special_teams(df1, df2):
 def get_best_overall_defenses(df1, df2, df3):
     """
     Function to find the best defenses overall based on a combination of rushing and receiving stats.
+    The three tables are joined on Team, so each team's category scores are paired.
     Args:
         df1 (DataFrame): A pandas DataFrame containing the defensive stats versus rushing.
         df2 (DataFrame): A pandas DataFrame containing the defensive stats versus receiving.
@@ -532,35 +518,22 @@ def get_best_overall_defenses(df1, df2, df3):
         Returns:
         best_defenses (DataFrame): A pandas DataFrame containing the top defenses ranked by a composite score.
     """
-    # Normalize the scores for each category
-    df1["Weighted Score"] = (
-        (df1["Weighted Score"] - df1["Weighted Score"].min())
-        / (df1["Weighted Score"].max() - df1["Weighted Score"].min())
-    ) * 100
-    df2["Weighted Score"] = (
-        (df2["Weighted Score"] - df2["Weighted Score"].min())
-        / (df2["Weighted Score"].max() - df2["Weighted Score"].min())
-    ) * 100
-    df3["Weighted Score"] = (
-        (df3["Weighted Score"] - df3["Weighted Score"].min())
-        / (df3["Weighted Score"].max() - df3["Weighted Score"].min())
-    ) * 100
-
-    # Combine the scores for rushing and receiving
+    df1 = (
+        _clean_team_column(df1.copy())
+        .drop_duplicates("Team")
+        .merge(_team_scores(df2, "Receiving Score"), on="Team", how="inner")
+        .merge(_team_scores(df3, "Interception Score"), on="Team", how="inner")
+    )
+
+    # Combine the scores for rushing, receiving and interceptions
     df1["Combined Score"] = (
-        df1["Weighted Score"] + df2["Weighted Score"] + df3["Weighted Score"]
+        df1["Weighted Score"] + df1["Receiving Score"] + df1["Interception Score"]
     )
 
     # Remove null records or columns
     df1.dropna(axis=0, how="any", inplace=True)
     df1.dropna(axis=1, how="all", inplace=True)
 
-    # Remove newline characters from the dataframe
-    df1.replace("\n", "", regex=True, inplace=True)
-
-    # Remove everything after the first word for the team name
-    df1["Team"] = df1["Team"].str.split().str[0]
-
     # Sort defenses by the combined score in descending order
     best_defenses = df1.sort_values(
         by="Combined Score", ascending=False, ignore_index=True
@@ -4,12 +4,131 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import logging
+import os
+import queue
+import threading
 import warnings
 import pandas as pd
 
 # Suppress all warnings (like ResourceWarnings or Selenium deprecation warnings)
 warnings.filterwarnings("ignore")
 
+STADIUM_CSV = "data/nfl_metadata/stadium.csv"
+SCHEDULE_CSV = "data/nfl_metadata/schedule.csv"
+
+# Renamed stadiums: every name a venue has gone by -> its current name, so stadium.csv,
+# schedule.csv and game pages all compare equal
+STADIUM_ALIASES = {
+    "FirstEnergy Stadium": "Huntington Bank Field",
+    "Cleveland Browns Stadium": "Huntington Bank Field",
+    "TIAA Bank Field": "EverBank Stadium",
+    "FedExField": "Northwest Stadium",
+    "FedEx Field": "Northwest Stadium",
+    "Arrowhead Stadium": "GEHA Field at Arrowhead Stadium",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _build_chrome_options():
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1920,1080")
+    return options
+
+
+class DriverPool:
+    """
+    Fixed-size pool of headless Chrome drivers shared by the scraping threads.
+    Drivers are started once and reused for every page instead of one browser per week.
+    """
+
+    def __init__(self, size=4):
+        self.size = size
+        self._drivers = queue.Queue()
+        self._all = []
+
+    def __enter__(self):
+        for _ in range(self.size):
+            driver = webdriver.Chrome(options=_build_chrome_options())
+            self._all.append(driver)
+            self._drivers.put(driver)
+        return self
+
+    def __exit__(self, *exc):
+        for driver in self._all:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._all.clear()
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver for the duration of a with-block."""
+        driver = self._drivers.get()
+        try:
+            yield driver
+        finally:
+            self._drivers.put(driver)
+
+
+def canonical_venue(name):
+    return STADIUM_ALIASES.get(name, name) if name else name
+
+
+class VenueCache:
+    """
+    Thread-safe venue lookup keyed by home team, seeded from nfl_metadata/stadium.csv (names
+    normalized through STADIUM_ALIASES). When nfl_metadata/schedule.csv holds the season being
+    scraped, its per-game Location gives the actual venue of every game, including neutral and
+    international sites. Game pages only need to be visited for home teams with no known venue.
+    """
+
+    def __init__(self, season=None, stadium_csv=STADIUM_CSV, schedule_csv=SCHEDULE_CSV):
+        self._lock = threading.Lock()
+        self._venues = {}
+        self._games = {}
+        if os.path.exists(stadium_csv):
+            stadiums = pd.read_csv(stadium_csv)
+            for team_name, stadium in zip(stadiums["team_name"], stadiums["stadium_name"]):
+                self._add_home(team_name, canonical_venue(stadium))
+        if season is not None and os.path.exists(schedule_csv):
+            schedule = pd.read_csv(schedule_csv)
+            dates = pd.to_datetime(schedule["Date"], format="%d/%m/%Y %H:%M", errors="coerce")
+            # A season's schedule starts in September of that year
+            if dates.notna().any() and dates.min().year == season:
+                locations = schedule["Location"].map(canonical_venue)
+                for week, home_team, venue in zip(schedule["Round Number"], schedule["Home Team"], locations):
+                    self._games[(int(week), home_team)] = venue
+                for home_team, venue in locations.groupby(schedule["Home Team"]).agg(lambda v: v.mode()[0]).items():
+                    if home_team not in self._venues:
+                        self._add_home(home_team, venue)
+
+    def _add_home(self, team_name, stadium):
+        # Index by full name ("Buffalo Bills") and nickname ("Bills")
+        self._venues[team_name] = stadium
+        self._venues[team_name.split()[-1]] = stadium
+
+    def get(self, home_team):
+        """Home stadium of a team, or None if unknown."""
+        with self._lock:
+            return self._venues.get(home_team)
+
+    def game(self, week, home_team):
+        """Venue of one game from the season's schedule.csv, or None if the schedule does not cover it."""
+        return self._games.get((week, home_team))
+
+    def set(self, home_team, venue):
+        with self._lock:
+            self._venues.setdefault(home_team, venue)
+
+
 def scrape_game_location(driver, game_url):
     driver.get(game_url)
     try:
@@ -25,94 +144,135 @@ def scrape_game_location(driver, game_url):
     soup = BeautifulSoup(html, "html.parser")
     venue_div = soup.select_one("div[class*='r-color-zyhucb']")
     if venue_div:
-        return venue_div.text.strip()
+        return canonical_venue(venue_div.text.strip())
     else:
         return None
 
-def scrape_nfl_matchups(url: str):
-    options = Options()
-    options.headless = True
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1920,1080")
 
-    driver = webdriver.Chrome(options=options)
-    driver.get(url)
+def _parse_matchup(matchup_link):
+    game_div = matchup_link.find("div", class_="nfl-c-matchup-strip__game")
+    if not game_div:
+        return None
+
+    teams = []
+    team_divs = game_div.find_all("div", class_="nfl-c-matchup-strip__team")
+    record_divs = game_div.find_all("div", class_="css-12hprx4-U7")  # <-- Added for team records
+
+    for i, team_div in enumerate(team_divs):
+        abbr_elem = team_div.find("span", class_="nfl-c-matchup-strip__team-abbreviation")
+        name_elem = team_div.find("span", class_="nfl-c-matchup-strip__team-fullname")
+
+        abbr = abbr_elem.text.strip() if abbr_elem else None
+        name = name_elem.text.strip() if name_elem else None
+        record = record_divs[i].text.strip() if i < len(record_divs) else None  # <-- Record assigned
+
+        teams.append({
+            "abbreviation": abbr,
+            "fullname": name,
+            "record": record
+        })
+
+    game_info_div = matchup_link.find("div", class_="nfl-c-matchup-strip__game-info")
+    time_info = None
+    if game_info_div:
+        date_time_span = game_info_div.find("span", class_="nfl-c-matchup-strip__date-time")
+        timezone_span = game_info_div.find("span", class_="nfl-c-matchup-strip__date-timezone")
+        if date_time_span and timezone_span:
+            time_info = f"{date_time_span.text.strip()} {timezone_span.text.strip()}"
+
+    return {
+        "teams": teams,
+        "time": time_info,
+        "game_url": f"https://www.nfl.com{matchup_link['href']}",
+    }
+
+
+def scrape_nfl_matchups(url, week, pool, venues, game_executor):
+    """
+    Scrape one week of matchups using a pooled driver.
+    Venues come from the cache: the game's schedule.csv Location when it covers the season (a venue
+    other than the home stadium marks a neutral site), otherwise the home team's stadium. Only games
+    whose home team has no known venue are sent to `game_executor` to load their game page.
+    """
+    with pool.acquire() as driver:
+        driver.get(url)
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "nfl-c-matchup-strip__left-area"))
+            )
+            html = driver.page_source
+        except Exception as e:
+            print("Timed out waiting for matchup containers to load:", e)
+            return []
 
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "nfl-c-matchup-strip__left-area"))
-        )
-        html = driver.page_source
-    except Exception as e:
-        print("Timed out waiting for matchup containers to load:", e)
-        driver.quit()
-        return []
-    
     soup = BeautifulSoup(html, "html.parser")
     matchup_links = soup.find_all("a", class_="nfl-c-matchup-strip__left-area")
 
     if not matchup_links:
         print("No matchup containers found.")
-        driver.quit()
         return []
 
-    matchups = []
+    def visit_game_page(game_url):
+        with pool.acquire() as game_driver:
+            return scrape_game_location(game_driver, game_url)
 
+    matchups = []
+    pending = []
     for matchup_link in matchup_links:
-        game_div = matchup_link.find("div", class_="nfl-c-matchup-strip__game")
-        if not game_div:
+        matchup = _parse_matchup(matchup_link)
+        if matchup is None:
             continue
 
-        teams = []
-        team_divs = game_div.find_all("div", class_="nfl-c-matchup-strip__team")
-        record_divs = game_div.find_all("div", class_="css-12hprx4-U7")  # <-- Added for team records
-
-        for i, team_div in enumerate(team_divs):
-            abbr_elem = team_div.find("span", class_="nfl-c-matchup-strip__team-abbreviation")
-            name_elem = team_div.find("span", class_="nfl-c-matchup-strip__team-fullname")
-
-            abbr = abbr_elem.text.strip() if abbr_elem else None
-            name = name_elem.text.strip() if name_elem else None
-            record = record_divs[i].text.strip() if i < len(record_divs) else None  # <-- Record assigned
-
-            teams.append({
-                "abbreviation": abbr,
-                "fullname": name,
-                "record": record
-            })
-
-        game_info_div = matchup_link.find("div", class_="nfl-c-matchup-strip__game-info")
-        time_info = None
-        if game_info_div:
-            date_time_span = game_info_div.find("span", class_="nfl-c-matchup-strip__date-time")
-            timezone_span = game_info_div.find("span", class_="nfl-c-matchup-strip__date-timezone")
-            if date_time_span and timezone_span:
-                time_info = f"{date_time_span.text.strip()} {timezone_span.text.strip()}"
-
-        game_href = matchup_link["href"]
-        game_url = f"https://www.nfl.com{game_href}"
-
-        location = scrape_game_location(driver, game_url)
-
-        matchups.append({
-            "teams": teams,
-            "time": time_info,
-            "location": location,
-        })
+        # NFL.com lists the away team first and the home team second
+        home_team = matchup["teams"][-1]["fullname"] if matchup["teams"] else None
+        home_stadium = venues.get(home_team)
+        location = venues.game(week, home_team) or home_stadium
+        matchup["location"] = location
+        matchup["neutral_site"] = location is not None and home_stadium is not None and location != home_stadium
+        if location is None:
+            pending.append((matchup, home_team, game_executor.submit(visit_game_page, matchup["game_url"])))
+        matchups.append(matchup)
+
+    for matchup, home_team, future in pending:
+        matchup["location"] = future.result()
+        if matchup["location"] is None:
+            logger.warning(f"No known venue for {home_team} and none found on {matchup['game_url']}")
+        else:
+            venues.set(home_team, matchup["location"])
 
-    driver.quit()
     return matchups
 
 
+def scrape_season(year, weeks=range(1, 19), pool_size=4):
+    """
+    Scrape every week of a season concurrently over a shared pool of drivers.
+    Returns:
+        dict: Week number -> list of matchups, in week order.
+    """
+    venues = VenueCache(year)
+    with DriverPool(pool_size) as pool, \
+            ThreadPoolExecutor(max_workers=pool_size) as week_executor, \
+            ThreadPoolExecutor(max_workers=pool_size) as game_executor:
+        futures = {
+            week: week_executor.submit(
+                scrape_nfl_matchups,
+                f"https://www.nfl.com/schedules/{year}/REG{week}/",
+                week,
+                pool,
+                venues,
+                game_executor,
+            )
+            for week in weeks
+        }
+        return {week: future.result() for week, future in futures.items()}
+
+
 if __name__ == "__main__":
     year = 2025
     all_games = []
-    for week in range(1, 19):
+    season = scrape_season(year)
+    for week, matchups in season.items():
         print(f"--- Week {week} ---")
-        url = f"https://www.nfl.com/schedules/{year}/REG{week}/"
-        matchups = scrape_nfl_matchups(url)
-
         for idx, m in enumerate(matchups, 1):
             for team in m["teams"]:
                 all_games.append({
@@ -135,4 +295,3 @@ if __name__ == "__main__":
     df = pd.DataFrame(all_games)
     df.to_csv("nfl_schedule_2025.csv", index=False)
     print("Saved all games to nfl_schedule_2025.csv")
-  
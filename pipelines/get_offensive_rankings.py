@@ -10,6 +10,11 @@ import csv
 import logging
 from collections import Counter
 
+from pipelines.fantasy_points import score_legacy_table
+from pipelines.matchups import matchup_table
+from pipelines.normalization import normalize
+from pipelines.ranking_index import top_rows
+
 
 def get_team_td_stats():
     """
@@ -55,9 +60,7 @@ def find_best_team_td(df):
         + (df["2-PT"] * 0.1)
     )
 
-    df["Weighted Score"] = (
-        (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-    ) * 100
+    df["Weighted Score"] = normalize(df, "Score")
 
     # Sort quarterbacks by the composite score in descending order
     best_team_td = df.sort_values(
@@ -165,19 +168,11 @@ def find_best_kickers():
             + (df["FPTS"] * 0.3)
         )
 
-        # Sort kickers by the composite score in descending order
-        # Reset rank based on score
-        df["Rank"] = df["Score"].rank(ascending=False, method="min")
-        df["Rank"] = df["Rank"].astype(int)
-
-        best_kickers = df.sort_values(
-            by="Score", ascending=False, ignore_index=True
-        ).head(32)
+        # Top kickers by composite score, ranked by the ranking index
+        best_kickers = top_rows(df, 32)
 
         df["Score"] = df["Score"].astype(float)
-        df["Weighted Score"] = (
-            (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-        ) * 100
+        df["Weighted Score"] = normalize(df, "Score")
 
         df["Weighted Score"] = df["Weighted Score"].astype(float)
 
@@ -308,17 +303,10 @@ def find_best_qbs():
         )
 
         # Calculate normalized score
-        df["Weighted Score"] = (
-            (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-        ) * 100
-
-        # Sort and select top players
-        df["Rank"] = df["Score"].rank(ascending=False, method="min")
-        df["Rank"] = df["Rank"].astype(int)
+        df["Weighted Score"] = normalize(df, "Score")
 
-        best_qbs = df.sort_values(by="Score", ascending=False, ignore_index=True).head(
-            32
-        )
+        # Select and rank top players
+        best_qbs = top_rows(df, 32)
 
         # Remove team names from player names
         best_qbs = remove_team_from_player_name(best_qbs)
@@ -442,18 +430,10 @@ def find_best_rbs():
         +(df["REC_YDS"] * 0.1)
         +(df["REC_TD"] * 0.1)
 
-        df["Weighted Score"] = (
-            (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-        ) * 100
-
-        # Sort and select top players
-        # Reset rank based on score
-        df["Rank"] = df["Score"].rank(ascending=False, method="min")
-        df["Rank"] = df["Rank"].astype(int)
+        df["Weighted Score"] = normalize(df, "Score")
 
-        best_rbs = df.sort_values(by="Score", ascending=False, ignore_index=True).head(
-            32
-        )
+        # Select and rank top players
+        best_rbs = top_rows(df, 32)
 
         best_rbs = remove_team_from_player_name(best_rbs)
 
@@ -544,17 +524,10 @@ def find_best_tes():
             + (df["FPTS"] * 0.3)
         )
 
-        df["Weighted Score"] = (
-            (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-        ) * 100
+        df["Weighted Score"] = normalize(df, "Score")
 
-        # Sort and select top players
-        # Reset rank based on score
-        df["Rank"] = df["Score"].rank(ascending=False, method="min")
-        df["Rank"] = df["Rank"].astype(int)
-        best_tes = df.sort_values(by="Score", ascending=False, ignore_index=True).head(
-            50
-        )
+        # Select and rank top players
+        best_tes = top_rows(df, 50)
         
         best_tes = remove_team_from_player_name(best_tes)
 
@@ -635,17 +608,10 @@ def find_best_wrs():
         +(df["LG"] * 0.1)
         +(df["20+"] * 0.1)
 
-        df["Weighted Score"] = (
-            (df["Score"] - df["Score"].min()) / (df["Score"].max() - df["Score"].min())
-        ) * 100
+        df["Weighted Score"] = normalize(df, "Score")
 
-        # Sort and select top players
-        # Reset rank based on score
-        df["Rank"] = df["Score"].rank(ascending=False, method="min")
-        df["Rank"] = df["Rank"].astype(int)
-        best_wrs = df.sort_values(by="Score", ascending=False, ignore_index=True).head(
-            50
-        )
+        # Select and rank top players
+        best_wrs = top_rows(df, 50)
         best_wrs = remove_team_from_player_name(best_wrs)
 
         # Save to CSV
@@ -662,34 +628,18 @@ def find_best_wrs():
     return None
 
 
-# TODO: Change function to use schedule vs defense stats
-def find_best_wr_defense_matchups(df1, df2):
+def find_best_wr_defense_matchups(df1, df2, week=None):
     """
-    Function to find the best wide receiver versus defense matchups based on a combination of receiving and defense stats.
+    Function to find the best wide receiver versus defense matchups, pairing each receiver with
+    the defense their team actually plays (schedule.csv) rather than by row position.
     Args:
         df1 (DataFrame): A pandas DataFrame containing the receiving stats.
-        df2 (DataFrame): A pandas DataFrame containing the defensive stats.
+        df2 (DataFrame): A pandas DataFrame containing the defensive stats versus receiving.
+        week (int): Week to rank matchups for; every week if omitted.
         Returns:
         best_matchups (DataFrame): A pandas DataFrame containing the top matchups ranked by a composite score.
     """
-    # Normalize the scores for each category
-    df1["Weighted Score"] = (
-        (df1["Weighted Score"] - df1["Weighted Score"].min())
-        / (df1["Weighted Score"].max() - df1["Weighted Score"].min())
-    ) * 100
-    df2["Weighted Score"] = (
-        (df2["Weighted Score"] - df2["Weighted Score"].min())
-        / (df2["Weighted Score"].max() - df2["Weighted Score"].min())
-    ) * 100
-
-    # Combine the scores for receiving and defense
-    df1["Combined Score"] = df1["Weighted Score"] + df2["Weighted Score"]
-
-    # Sort matchups by the combined score in descending order
-    best_matchups = df1.sort_values(by="Combined Score", ascending=True).head(32)
-
-    # Print the top matchups
-    # print(best_matchups)
+    best_matchups = matchup_table(df1, df2, "WR", week)
 
     # Optionally, save the top matchups to a new CSV file
     best_matchups.to_csv("official_matchup_stats.csv", index=False)
@@ -697,37 +647,21 @@ def find_best_wr_defense_matchups(df1, df2):
     return best_matchups
 
 
-# TODO: Change function to use schedule vs defense stats
-def find_best_rb_defense_matchups(df1, df2):
+def find_best_rb_defense_matchups(df1, df2, week=None):
     """
-    Function to find the best wide receiver versus defense matchups based on a combination of receiving and defense stats.
+    Function to find the best running back versus defense matchups, pairing each running back with
+    the defense their team actually plays (schedule.csv) rather than by row position.
     Args:
-        df1 (DataFrame): A pandas DataFrame containing the receiving stats.
-        df2 (DataFrame): A pandas DataFrame containing the defensive stats.
+        df1 (DataFrame): A pandas DataFrame containing the rushing stats.
+        df2 (DataFrame): A pandas DataFrame containing the defensive stats versus rushing.
+        week (int): Week to rank matchups for; every week if omitted.
         Returns:
         best_matchups (DataFrame): A pandas DataFrame containing the top matchups ranked by a composite score.
     """
-    # Normalize the scores for each category
-    df1["Weighted Score"] = (
-        (df1["Weighted Score"] - df1["Weighted Score"].min())
-        / (df1["Weighted Score"].max() - df1["Weighted Score"].min())
-    ) * 100
-    df2["Weighted Score"] = (
-        (df2["Weighted Score"] - df2["Weighted Score"].min())
-        / (df2["Weighted Score"].max() - df2["Weighted Score"].min())
-    ) * 100
-
-    # Combine the scores for receiving and defense
-    df1["Combined Score"] = df1["Weighted Score"] + df2["Weighted Score"]
-
-    # Sort matchups by the combined score in descending order
-    best_matchups = df1.sort_values(by="Combined Score", ascending=True).head(32)
-
-    # Print the top matchups
-    # print(best_matchups)
+    best_matchups = matchup_table(df1, df2, "RB", week)
 
     # Optionally, save the top matchups to a new CSV file
-    best_matchups.to_csv("official_matchup_stats.csv", index=False)
+    best_matchups.to_csv("official_rb_matchup_stats.csv", index=False)
 
     return best_matchups
 
@@ -744,87 +678,18 @@ def remove_team_from_player_name(df):
     return df
 
 def calc_fantasy_ppr_points(df, week, position):
-    
     """
     Function to calculate fantasy points per reception (PPR) based on the scoring system.
+    Scores the whole table at once using the position's ESPN-style weights from fantasy_points.
+    For every player, week and position in one pass, use fantasy_points.score_weekly_points.
     Args:
         df (DataFrame): A pandas DataFrame containing the player stats.
-        Returns:
-        df (DataFrame): A pandas DataFrame containing the player stats with PPR points.
         week (int): The week number.
         position (str): The position of the player.
+    Returns:
+        df (DataFrame): A pandas DataFrame containing the player stats with PPR points.
     """
-    # ESPN scoring system
-    qb_point_system = {
-        "YDS": 0.05,
-        "TD": 4,
-        "INT": -2,
-        #TODO: Add rushing stats when available
-        # "Rushing Yards": 0.1,
-        # "Rushing Touchdowns": 6,
-    }
-    rb_point_system = { 
-        "YDS": 0.1,
-        "TD": 6,
-        "REC": 1,
-        "REC_YDS": 0.1,
-        "REC": 6,
-        # "ATT": 0.1,
-    }
-    wr_point_system = {
-        "REC": 1,
-        "YDS": 0.1,
-        "TD": 6,
-    }
-    te_point_system = {
-        "REC": 1,
-        "YDS": 0.1,
-        "TD": 6,
-    }
-    k_point_system = {
-        "FGM": 3,
-        "Field Goals Missed": -1,
-        "XPM": 1,
-    }
-
-    # Calculate fantasy points for each player based on the scoring system and week
-    for index, row in df.iterrows():
-        if position == "QB":
-            points = (
-                row["YDS"] * qb_point_system["YDS"]
-                + row["TD"] * qb_point_system["TD"]
-                + row["INT"] * qb_point_system["INT"]
-            )
-        elif position == "RB":
-            points = (
-                row["YDS"] * rb_point_system["YDS"]
-                + row["TD"] * rb_point_system["TD"]
-                + row["REC"] * rb_point_system["REC"]
-                + row["REC_YDS"] * rb_point_system["REC_YDS"]
-            )
-        elif position == "WR":
-            points = (
-                row["YDS"] * wr_point_system["YDS"]
-                + row["TD"] * wr_point_system["TD"]
-                + row["REC"] * wr_point_system["REC"]
-            )
-        elif position == "TE":
-            points = (
-                row["YDS"] * te_point_system["YDS"]
-                + row["TD"] * te_point_system["TD"]
-                + row["REC"] * te_point_system["REC"]
-            )
-        elif position == "K":
-            points = (
-                row.get("FGM", 0) * k_point_system.get("FGM", 0)
-                + row.get("Field Goals Missed", 0) * k_point_system.get("Field Goals Missed", 0)
-                + row.get("XPM", 0) * k_point_system.get("XPM", 0)
-            )
-        else:
-            points = 0
-
-        df.at[index, f"Week {week} Points"] = points
-
+    df[f"Week {week} Points"] = score_legacy_table(df, position)
     return df
 
 
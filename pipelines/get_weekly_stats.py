@@ -1,10 +1,14 @@
+import json
 import os
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import polars as pl
 import re
 import logging
 
+from pipelines.ranking_index import RankingBoard, top_rows
+
 # Helper Functions
 def _handle_duplicate_headers(headers):
     seen = {}
@@ -37,116 +41,242 @@ def _clean_name(name):
     name = re.sub(r"\s*\(.*?\)", "", name)  # Remove parentheses and their content
     return name.strip()
 
+def _weighted_sum(weights):
+    """Pandas score function: sum of column * weight (missing columns count as 0)."""
+    return lambda df: sum(df.get(col, 0) * weight for col, weight in weights.items())
+
+
+def _weighted_expr(weights):
+    """Polars score expression equivalent to _weighted_sum."""
+    return pl.sum_horizontal([pl.col(col) * weight for col, weight in weights.items()])
+
+
 # Position Configurations
+# "weights" drive both the pandas "score_func" and the Polars "score_expr"
 POSITION_CONFIG = {
     "qb": {
         "numeric_cols": ["CMP", "YDS", "TD", "Y/A", "INT", "FPTS/G", "FPTS", "R_YDS", "R_TD", "R_ATT"],
-        "score_func": lambda df: (
-            df["YDS"] * 0.4 + df["R_YDS"] * 0.1 + df["TD"] * 0.3 +
-            df["Y/A"] * 0.2 - df["INT"] * 0.1 + df["FPTS/G"] * 0.4 +
-            df["FPTS"] * 0.3 + df["CMP"] * 0.1 + df["R_TD"] * 0.2
-        ),
+        "weights": {
+            "YDS": 0.4, "R_YDS": 0.1, "TD": 0.3, "Y/A": 0.2, "INT": -0.1,
+            "FPTS/G": 0.4, "FPTS": 0.3, "CMP": 0.1, "R_TD": 0.2,
+        },
         "top_n": 32,
         "handle_duplicates": True,
         "stat_renames": {"YDS": "R_YDS", "TD": "R_TD", "ATT": "R_ATT"}
     },
     "rb": {
         "numeric_cols": ["ATT", "YDS", "TD", "REC_YDS", "REC_TD", "Y/A", "FPTS/G", "FPTS", "FL", "REC"],
-        "score_func": lambda df: (
-            df["YDS"] * 0.45 + df["TD"] * 0.4 + df["Y/A"] * 0.15 +
-            df["FPTS/G"] * 0.3 + df["FPTS"] * 0.2 + df["ATT"] * 0.1 -
-            df["FL"] * 0.1 + df["REC"] * 0.1 + df.get("REC_YDS", 0) * 0.1 +
-            df.get("REC_TD", 0) * 0.1
-        ),
+        "weights": {
+            "YDS": 0.45, "TD": 0.4, "Y/A": 0.15, "FPTS/G": 0.3, "FPTS": 0.2,
+            "ATT": 0.1, "FL": -0.1, "REC": 0.1, "REC_YDS": 0.1, "REC_TD": 0.1,
+        },
         "top_n": 32,
         "handle_duplicates": True,
         "stat_renames": {"YDS": "REC_YDS", "TD": "REC_TD"}
     },
     "wr": {
         "numeric_cols": ["REC", "YDS", "TD", "Y/R", "LG", "20+"],
-        "score_func": lambda df: (
-            df["REC"] * 0.35 + df["YDS"] * 0.25 + df["TD"] * 0.5 +
-            df["Y/R"] * 0.15 + df["LG"] * 0.1 + df["20+"] * 0.1
-        ),
+        "weights": {"REC": 0.35, "YDS": 0.25, "TD": 0.5, "Y/R": 0.15, "LG": 0.1, "20+": 0.1},
         "top_n": 50,
         "handle_duplicates": False
     },
     "te": {
         "numeric_cols": ["REC", "YDS", "TD", "Y/R", "LG", "20+", "FPTS/G", "FPTS"],
-        "score_func": lambda df: (
-            df["REC"] * 0.35 + df["YDS"] * 0.25 + df["TD"] * 0.5 +
-            df["Y/R"] * 0.15 + df["LG"] * 0.1 + df["20+"] * 0.1 +
-            df["FPTS/G"] * 0.4 + df["FPTS"] * 0.3
-        ),
+        "weights": {
+            "REC": 0.35, "YDS": 0.25, "TD": 0.5, "Y/R": 0.15, "LG": 0.1, "20+": 0.1,
+            "FPTS/G": 0.4, "FPTS": 0.3,
+        },
         "top_n": 50,
         "handle_duplicates": False
     },
     "k": {
         "numeric_cols": ["FG", "FGA", "PCT", "1-19", "20-29", "30-39", "40-49", "50+", "FPTS/G", "FPTS"],
-        "score_func": lambda df: (
-            df["FG"] * 0.4 + df["FGA"] * 0.2 + df["PCT"] * 0.2 + df["1-19"] * 0.1 +
-            df["20-29"] * 0.2 + df["30-39"] * 0.1 + df["40-49"] * 0.1 + df["50+"] * 0.1 +
-            df["FPTS/G"] * 0.4 + df["FPTS"] * 0.3
-        ),
+        "weights": {
+            "FG": 0.4, "FGA": 0.2, "PCT": 0.2, "1-19": 0.1, "20-29": 0.2, "30-39": 0.1,
+            "40-49": 0.1, "50+": 0.1, "FPTS/G": 0.4, "FPTS": 0.3,
+        },
         "top_n": 32,
         "handle_duplicates": False
     },
 }
 
-# Main Function
-def find_best_players(position, year=None, week=None):
-    if position not in POSITION_CONFIG:
-        print(f"Position '{position}' not supported.")
-        return None
+# Tuned weights written by pipelines.weight_tuner override the hand-picked ones above
+RANKING_WEIGHTS_FILE = os.path.join(os.path.dirname(__file__), "ranking_weights.json")
+if os.path.exists(RANKING_WEIGHTS_FILE):
+    with open(RANKING_WEIGHTS_FILE) as _file:
+        for _position, _weights in json.load(_file).items():
+            if _position in POSITION_CONFIG:
+                POSITION_CONFIG[_position]["weights"].update(_weights)
 
+for _config in POSITION_CONFIG.values():
+    _config["score_func"] = _weighted_sum(_config["weights"])
+    _config["score_expr"] = _weighted_expr(_config["weights"])
+
+
+def _normalize_headers(position, headers):
+    """
+    Apply the duplicate-header handling and stat renames to a header list up front,
+    keeping only the first of any remaining duplicates.
+    Returns:
+        list: (column index, final name) pairs to keep.
+    """
     c = POSITION_CONFIG[position]
-    folder = "career" if week is None else "weekly"
-    os.makedirs(f"data/official_rankings/{folder}", exist_ok=True)
+    names = _handle_duplicate_headers(headers) if c.get("handle_duplicates") else list(headers)
+    for base_col, new_col in c.get("stat_renames", {}).items():
+        matches = [i for i, name in enumerate(names) if base_col in name]
+        if len(matches) > 1:
+            names[matches[1]] = new_col
+    kept, seen = [], set()
+    for i, name in enumerate(names):
+        if name not in seen:
+            seen.add(name)
+            kept.append((i, name))
+    return kept
 
+
+def fetch_stats_table(position, week=None):
+    """Fetch a FantasyPros stats table. Returns (headers, rows) or (None, None) if empty."""
     base_url = f"https://www.fantasypros.com/nfl/stats/{position}.php?scoring=PPR"
     if week:
         base_url += f"&range=week&week={week}"
     else:
         base_url += f"&range=full"
 
-    try:
-        response = requests.get(base_url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        table = soup.find("table", {"class": "table"})
-        if not table:
-            print(f"No table found for {position} year {year} week {week}.")
-            return None
+    response = requests.get(base_url, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, "html.parser")
+    table = soup.find("table", {"class": "table"})
+    if not table:
+        return None, None
+    headers = [th.text.strip() for th in table.find("thead").find_all("th")]
+    rows = [[td.text.strip() for td in tr.find_all("td")] for tr in table.find("tbody").find_all("tr")]
+    return headers, rows
+
+
+def score_table(position, headers, rows):
+    """Pandas path: clean, convert, score, rank and take the top N of one raw table."""
+    c = POSITION_CONFIG[position]
+    if c.get("handle_duplicates"):
+        headers = _handle_duplicate_headers(headers)
+
+    df = pd.DataFrame(rows, columns=headers)
+
+    # Clean player names
+    if "Player" in df.columns:
+        df["Player"] = df["Player"].apply(_clean_name)
+
+    if "stat_renames" in c:
+        df = _rename_duplicate_stats(df, c["stat_renames"])
+
+    if df.columns.tolist().count("YDS") > 1:
+        df = df.loc[:, ~df.columns.duplicated()]
+    if "YDS" in df.columns:
+        df["YDS"] = df["YDS"].str.replace(",", "", regex=True)
 
-        headers = [th.text.strip() for th in table.find("thead").find_all("th")]
-        if c.get("handle_duplicates"):
-            headers = _handle_duplicate_headers(headers)
+    df = _convert_numeric(df, c["numeric_cols"])
 
-        rows = [[td.text.strip() for td in tr.find_all("td")] for tr in table.find("tbody").find_all("tr")]
+    df["Score"] = c["score_func"](df)
+    return top_rows(df, c["top_n"])
+
+
+def rank_weekly_tables(tables):
+    """
+    Polars path: clean, convert, score, rank and take the top N for every position and week
+    in one lazy plan, executed in parallel by Polars.
+    Args:
+        tables (dict): (position, week) -> (headers, rows) as returned by fetch_stats_table.
+    Returns:
+        DataFrame: Polars frame of the top-N players per position and week with Score and Rank.
+    """
+    frames = []
+    for (position, week), (headers, rows) in tables.items():
         if not rows:
-            print(f"No player data found for {position} year {year} week {week}.")
-            return None
+            continue
+        kept = _normalize_headers(position, headers)
+        rows = [row for row in rows if len(row) == len(headers)]
+        columns = {name: [row[i] for row in rows] for i, name in kept}
+        frames.append(
+            pl.LazyFrame(columns, schema={name: pl.String for _, name in kept})
+            .with_columns(pl.lit(position).alias("position"), pl.lit(week, dtype=pl.Int32).alias("week"))
+        )
+    if not frames:
+        return pl.DataFrame()
+
+    positions = sorted({position for position, _ in tables})
+    numeric_cols = sorted({col for position in positions for col in POSITION_CONFIG[position]["numeric_cols"]})
+    plan = pl.concat(frames, how="diagonal")
+    present = set(plan.collect_schema().names())
+    plan = plan.with_columns([pl.lit(None, dtype=pl.String).alias(col) for col in numeric_cols if col not in present])
+
+    score = pl.lit(0.0)
+    top_n = pl.lit(0)
+    for position in reversed(positions):
+        config = POSITION_CONFIG[position]
+        score = pl.when(pl.col("position") == position).then(config["score_expr"]).otherwise(score)
+        top_n = pl.when(pl.col("position") == position).then(config["top_n"]).otherwise(top_n)
+
+    group = ["position", "week"]
+    return (
+        plan
+        .with_columns(
+            pl.col("Player").str.replace_all(r"\s*\(.*?\)", "").str.strip_chars(),
+            *[pl.col(col).str.replace_all(",", "").cast(pl.Float64, strict=False).fill_null(0).alias(col)
+              for col in numeric_cols],
+        )
+        .with_columns(score.alias("Score"))
+        .with_columns(
+            pl.col("Score").rank("min", descending=True).over(group).cast(pl.Int64).alias("Rank"),
+            pl.col("Score").rank("ordinal", descending=True).over(group).alias("_order"),
+        )
+        .filter(pl.col("_order") <= top_n)
+        .sort(["position", "week", "_order"])
+        .drop("_order")
+        .collect()
+    )
 
-        df = pd.DataFrame(rows, columns=headers)
-        
-        # Clean player names
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].apply(_clean_name)
-            
-        if "stat_renames" in c:
-            df = _rename_duplicate_stats(df, c["stat_renames"])
 
-        if df.columns.tolist().count("YDS") > 1:
-            df = df.loc[:, ~df.columns.duplicated()]
-        if "YDS" in df.columns:
-            df["YDS"] = df["YDS"].str.replace(",", "", regex=True)
+def track_season_movers(weekly_rankings, top_n=24):
+    """
+    Replay the weekly rankings in week order through a RankingBoard of season-to-date Score,
+    updating only the players who scored that week instead of re-ranking the whole season.
+    Args:
+        weekly_rankings (DataFrame): Output of rank_weekly_tables.
+        top_n (int): Only report movers inside the season top N of their position.
+    Returns:
+        df (DataFrame): week, position, player, old_rank, new_rank, change per mover.
+    """
+    board = RankingBoard()
+    totals = {}
+    rows = []
+    for week in sorted(weekly_rankings["week"].unique().to_list()):
+        week_df = weekly_rankings.filter(pl.col("week") == week)
+        for position, player, score in week_df.select(["position", "Player", "Score"]).iter_rows():
+            totals[(position, player)] = totals.get((position, player), 0.0) + score
+            board.update(position, player, totals[(position, player)])
+        rows += [dict(week=week, **move) for move in board.movers(top_n=top_n, limit=None)]
+        board.drain()
+    return pd.DataFrame(rows, columns=["week", "position", "player", "old_rank", "new_rank", "change"])
+
+
+# Main Function
+def find_best_players(position, year=None, week=None):
+    if position not in POSITION_CONFIG:
+        print(f"Position '{position}' not supported.")
+        return None
 
-        df = _convert_numeric(df, c["numeric_cols"])
+    folder = "career" if week is None else "weekly"
+    os.makedirs(f"data/official_rankings/{folder}", exist_ok=True)
 
-        df["Score"] = c["score_func"](df)
-        df["Rank"] = df["Score"].rank(ascending=False, method="min").astype(int)
+    try:
+        headers, rows = fetch_stats_table(position, week)
+        if not headers:
+            print(f"No table found for {position} year {year} week {week}.")
+            return None
+        if not rows:
+            print(f"No player data found for {position} year {year} week {week}.")
+            return None
 
-        df = df.sort_values("Score", ascending=False).head(c["top_n"]).reset_index(drop=True)
+        df = score_table(position, headers, rows)
 
         suffix = f"{position}_{year}_week{week}.csv" if week else f"{position}_{year}.csv"
         filename = f"data/official_rankings/{folder}/official_{suffix}"
@@ -164,7 +294,28 @@ if __name__ == "__main__":
     year = 2025
     for pos in positions:
         find_best_players(pos, year)
+
+    # Fetch every weekly table first, then rank all positions and weeks in one Polars plan
+    weekly_tables = {}
+    for pos in positions:
         for week in range(1, 19):
-            best_players = find_best_players(pos, year, week=week)
-            print(f"Processed {pos.upper()} for year {year} week {week}")
-            print(best_players.head(5) if best_players is not None else "No data found.")
+            try:
+                headers, rows = fetch_stats_table(pos, week)
+            except requests.RequestException as e:
+                print(f"Error fetching {pos} week {week}: {e}")
+                continue
+            if headers and rows:
+                weekly_tables[(pos, week)] = (headers, rows)
+
+    weekly_rankings = rank_weekly_tables(weekly_tables)
+    os.makedirs("data/official_rankings/weekly", exist_ok=True)
+    for (pos, week), group_df in weekly_rankings.group_by(["position", "week"]):
+        filename = f"data/official_rankings/weekly/official_{pos}_{year}_week{week}.csv"
+        group_df.drop(["position", "week"]).write_csv(filename)
+        print(f"Processed {pos.upper()} for year {year} week {week}")
+        print(group_df.head(5))
+
+    if not weekly_rankings.is_empty():
+        movers = track_season_movers(weekly_rankings)
+        movers.to_csv(f"data/official_rankings/weekly/season_movers_{year}.csv", index=False)
+        print(movers.head(10))
@@ -0,0 +1,300 @@
+"""
+Matchup Engine
+Joins every ranked player to the defense they actually face each week: player -> team
+(roster / game logs) -> opponent (nfl_metadata/schedule.csv) -> that defense's per-category
+ratings, all keyed by team_id. The full players x weeks matrix is built with a few merges
+and cached to data/matchups for the API.
+Author: Patrick Mejia
+"""
+
+import os
+import pandas as pd
+
+from pipelines.normalization import normalize
+from pipelines.weekly_store import load_weekly_store
+
+DATA_DIR = "data"
+SCHEDULE_CSV = "data/nfl_metadata/schedule.csv"
+ROSTER_CSV = "data/nfl_metadata/nfl_roster.csv"
+MATCHUP_CACHE = "data/matchups/matchup_matrix.csv"
+
+# team_id, full name, nickname
+TEAMS = pd.DataFrame(
+    [
+        ("ARI", "Arizona Cardinals", "Cardinals"), ("ATL", "Atlanta Falcons", "Falcons"),
+        ("BAL", "Baltimore Ravens", "Ravens"), ("BUF", "Buffalo Bills", "Bills"),
+        ("CAR", "Carolina Panthers", "Panthers"), ("CHI", "Chicago Bears", "Bears"),
+        ("CIN", "Cincinnati Bengals", "Bengals"), ("CLE", "Cleveland Browns", "Browns"),
+        ("DAL", "Dallas Cowboys", "Cowboys"), ("DEN", "Denver Broncos", "Broncos"),
+        ("DET", "Detroit Lions", "Lions"), ("GB", "Green Bay Packers", "Packers"),
+        ("HOU", "Houston Texans", "Texans"), ("IND", "Indianapolis Colts", "Colts"),
+        ("JAX", "Jacksonville Jaguars", "Jaguars"), ("KC", "Kansas City Chiefs", "Chiefs"),
+        ("LV", "Las Vegas Raiders", "Raiders"), ("LAC", "Los Angeles Chargers", "Chargers"),
+        ("LAR", "Los Angeles Rams", "Rams"), ("MIA", "Miami Dolphins", "Dolphins"),
+        ("MIN", "Minnesota Vikings", "Vikings"), ("NE", "New England Patriots", "Patriots"),
+        ("NO", "New Orleans Saints", "Saints"), ("NYG", "New York Giants", "Giants"),
+        ("NYJ", "New York Jets", "Jets"), ("PHI", "Philadelphia Eagles", "Eagles"),
+        ("PIT", "Pittsburgh Steelers", "Steelers"), ("SF", "San Francisco 49ers", "49ers"),
+        ("SEA", "Seattle Seahawks", "Seahawks"), ("TB", "Tampa Bay Buccaneers", "Buccaneers"),
+        ("TEN", "Tennessee Titans", "Titans"), ("WAS", "Washington Commanders", "Commanders"),
+    ],
+    columns=["team_id", "full_name", "nickname"],
+)
+
+# Older names still found in scraped tables
+TEAM_ALIASES = {"Redskins": "WAS", "Football Team": "WAS", "Washington": "WAS", "JAC": "JAX", "LA": "LAR"}
+
+# Defense rating category -> (candidate CSVs written by get_defensive_rankings, score column)
+DEFENSE_CATEGORIES = {
+    "pass_defense": (["official_defense_receiving_stats.csv", "data/official_stats/official_defense_receiving_stats.csv"], "Weighted Score"),
+    "rush_defense": (["official_defense_rushing_stats.csv", "data/official_stats/official_defense_rushing_stats.csv"], "Weighted Score"),
+    "takeaways": (["official_defense_interception_stats.csv", "data/official_stats/official_defense_interception_stats.csv"], "Weighted Score"),
+    "overall_defense": (["official_defense_stats.csv", "data/official_stats/official_defense_stats.csv"], "Combined Score"),
+    "special_teams": (["official_special_teams_stats.csv", "data/official_stats/official_special_teams_stats.csv"], "Combined Score"),
+}
+
+# Which defensive category a position plays against
+POSITION_DEFENSE = {"QB": "pass_defense", "WR": "pass_defense", "TE": "pass_defense", "RB": "rush_defense", "K": "overall_defense"}
+
+PLAYER_RANKINGS = {
+    "QB": "data/official_stats/official_qb_stats.csv",
+    "RB": "data/official_stats/official_rb_stats.csv",
+    "WR": "data/official_stats/official_wr_stats.csv",
+    "TE": "data/official_stats/official_te_stats.csv",
+    "K": "data/official_stats/official_k_stats.csv",
+}
+
+_TEAM_LOOKUP = {
+    **{name: team_id for team_id, name in zip(TEAMS["team_id"], TEAMS["full_name"])},
+    **{name: team_id for team_id, name in zip(TEAMS["team_id"], TEAMS["nickname"])},
+    **{team_id: team_id for team_id in TEAMS["team_id"]},
+    **TEAM_ALIASES,
+}
+
+
+def team_ids(names):
+    """
+    Map team names in any scraped form ("Kansas City Chiefs", "Chiefs", "@Chiefs", "KC",
+    "Vikings\\n  Vikings") to team_id. Unknown names become NaN.
+    """
+    names = pd.Series(names, dtype="object").astype(str).str.strip().str.lstrip("@")
+    exact = names.map(_TEAM_LOOKUP)
+    first_word = names.str.split().str[0].map(_TEAM_LOOKUP)
+    return exact.fillna(first_word)
+
+
+def player_key(names):
+    """
+    Join key for player names across sources: suffixes, periods and apostrophes are dropped
+    ("Patrick Mahomes II" -> "patrick mahomes", "Ja'Marr Chase" -> "jamarr chase").
+    """
+    return (
+        pd.Series(names, dtype="object").astype(str).str.lower()
+        .str.replace(r"[.'\u2019]", "", regex=True)
+        .str.replace(r"\b(jr|sr|ii|iii|iv|v)\b", "", regex=True)
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def load_schedule(path=SCHEDULE_CSV):
+    """
+    One row per team per week: Week, team_id, opponent_id, Home.
+    """
+    schedule = pd.read_csv(path)
+    home = team_ids(schedule["Home Team"])
+    away = team_ids(schedule["Away Team"])
+    week = schedule["Round Number"].astype(int)
+    return pd.concat(
+        [
+            pd.DataFrame({"Week": week, "team_id": home, "opponent_id": away, "Home": True}),
+            pd.DataFrame({"Week": week, "team_id": away, "opponent_id": home, "Home": False}),
+        ],
+        ignore_index=True,
+    ).dropna(subset=["team_id", "opponent_id"])
+
+
+def _score_0_100(values, column):
+    """
+    "Weighted Score" columns are already normalized 0-100 by the ranking scripts and are used as
+    is; other columns (raw Score, Combined Score sums) are rescaled here.
+    """
+    return values if column == "Weighted Score" else normalize(values)
+
+
+def load_defense_ratings(categories=DEFENSE_CATEGORIES):
+    """
+    Per-category defense ratings (0-100, higher is a tougher defense) indexed by team_id.
+    Categories whose CSV is missing fall back to overall_defense.
+    """
+    ratings = pd.DataFrame(index=pd.Index(TEAMS["team_id"], name="team_id"))
+    for category, (paths, score_column) in categories.items():
+        path = next((path for path in paths if os.path.exists(path)), None)
+        if path is None:
+            continue
+        df = pd.read_csv(path)
+        df["team_id"] = team_ids(df["Team"])
+        df = df.dropna(subset=["team_id"]).drop_duplicates("team_id")
+        column = score_column if score_column in df.columns else "Weighted Score"
+        ratings[category] = _score_0_100(df.set_index("team_id")[column], column).reindex(ratings.index)
+
+    if "overall_defense" not in ratings.columns:
+        present = [category for category in categories if category in ratings.columns]
+        ratings["overall_defense"] = ratings[present].mean(axis=1) if present else 50.0
+    for category in categories:
+        if category not in ratings.columns:
+            ratings[category] = ratings["overall_defense"]
+    return ratings.fillna(50.0)
+
+
+def player_teams(data_dir=DATA_DIR, roster_path=ROSTER_CSV, schedule=None):
+    """
+    player_key -> team_id. Teams are inferred from the latest game log week (the team that
+    played the logged opponent that week), falling back to the nfl_metadata roster ("Last, First").
+    """
+    roster = pd.read_csv(roster_path, encoding="utf-8-sig")
+    name_parts = roster["Name"].str.split(",", n=1)
+    roster_teams = pd.DataFrame({
+        "player_key": player_key(name_parts.str[1].str.strip() + " " + name_parts.str[0].str.strip()).to_numpy(),
+        "team_id": team_ids(roster["Team"]).to_numpy(),
+    }).dropna().drop_duplicates("player_key")
+
+    if schedule is None:
+        schedule = load_schedule()
+    store = load_weekly_store(data_dir)
+    if store.empty:
+        return roster_teams
+    latest = store.sort_values("Week").drop_duplicates("Player", keep="last")
+    latest = latest.assign(
+        player_key=player_key(latest["Player"]).to_numpy(),
+        opponent_id=team_ids(latest["Opponent"]).to_numpy(),
+    )
+    inferred = latest.merge(
+        schedule[["Week", "team_id", "opponent_id"]], on=["Week", "opponent_id"], how="inner"
+    )[["player_key", "team_id"]]
+
+    return pd.concat([inferred, roster_teams], ignore_index=True).drop_duplicates("player_key")
+
+
+def load_player_rankings(rankings=PLAYER_RANKINGS):
+    """Player, Position and a 0-100 Player Score per position from the official ranking tables."""
+    frames = []
+    for position, path in rankings.items():
+        if not os.path.exists(path):
+            continue
+        df = pd.read_csv(path)
+        column = "Weighted Score" if "Weighted Score" in df.columns else "Score"
+        df["Player"] = df["Player"].str.replace(r"\(.*?\)", "", regex=True).str.strip()
+        frames.append(pd.DataFrame({"Player": df["Player"], "Position": position, "Player Score": _score_0_100(df[column], column)}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Player", "Position", "Player Score"])
+
+
+def build_matchup_matrix(players=None, teams=None, schedule=None, defense=None):
+    """
+    Every player x every scheduled week joined to the opposing defense, in one set of merges.
+    Args:
+        players (DataFrame): Player, Position, Player Score (load_player_rankings() if omitted).
+        teams (DataFrame): player_key, team_id (player_teams() if omitted).
+        schedule (DataFrame): Week, team_id, opponent_id, Home (load_schedule() if omitted).
+        defense (DataFrame): Category ratings indexed by team_id (load_defense_ratings() if omitted).
+    Returns:
+        df (DataFrame): Player, Position, team_id, Week, opponent_id, Home, Player Score,
+        Defense Rating and Matchup Score (higher is a better matchup for the player).
+    """
+    if schedule is None:
+        schedule = load_schedule()
+    if players is None:
+        players = load_player_rankings()
+    if teams is None:
+        teams = player_teams(schedule=schedule)
+    if defense is None:
+        defense = load_defense_ratings()
+
+    matrix = (
+        players.assign(player_key=player_key(players["Player"]).to_numpy())
+        .merge(teams, on="player_key", how="inner")
+        .merge(schedule, on="team_id", how="inner")
+        .merge(defense, left_on="opponent_id", right_index=True, how="left")
+    )
+    category = matrix["Position"].map(POSITION_DEFENSE)
+    category = category.where(category.isin(defense.columns), "overall_defense")
+    ratings = matrix[list(defense.columns)].to_numpy()
+    column_index = pd.Index(defense.columns).get_indexer(category)
+    matrix["Defense Category"] = category
+    matrix["Defense Rating"] = ratings[range(len(matrix)), column_index]
+    matrix["Matchup Score"] = (matrix["Player Score"] + (100 - matrix["Defense Rating"])) / 2
+
+    columns = ["Player", "Position", "team_id", "Week", "opponent_id", "Home",
+               "Player Score", "Defense Category", "Defense Rating", "Matchup Score"]
+    return matrix[columns].sort_values(["Week", "Matchup Score"], ascending=[True, False], ignore_index=True)
+
+
+def defense_ratings_from_table(df, category):
+    """
+    Ratings frame for one category from a get_defensive_rankings table (Team, Weighted Score),
+    also used as overall_defense so build_matchup_matrix can score any position against it.
+    """
+    df = df.assign(team_id=team_ids(df["Team"]).to_numpy()).dropna(subset=["team_id"]).drop_duplicates("team_id")
+    rating = df.set_index("team_id")["Weighted Score"].reindex(TEAMS["team_id"]).fillna(50.0)
+    return pd.DataFrame({category: rating, "overall_defense": rating}).rename_axis("team_id")
+
+
+def matchup_table(players_df, defense_df, position, week=None, top_n=32):
+    """
+    Rank one position's players against the defenses they face, joined by team and week.
+    Args:
+        players_df (DataFrame): Position ranking table with Player and Weighted Score.
+        defense_df (DataFrame): Defense ranking table with Team and Weighted Score.
+        position (str): "QB", "RB", "WR", "TE" or "K".
+        week (int): Only this week's games; all weeks if omitted.
+        top_n (int): Number of matchups returned.
+    Returns:
+        df (DataFrame): Top matchups by Matchup Score.
+    """
+    position = position.upper()
+    score_column = "Weighted Score" if "Weighted Score" in players_df.columns else "Score"
+    players = pd.DataFrame({
+        "Player": players_df["Player"].str.replace(r"\(.*?\)", "", regex=True).str.strip(),
+        "Position": position,
+        "Player Score": _score_0_100(players_df[score_column], score_column),
+    })
+    defense = defense_ratings_from_table(defense_df, POSITION_DEFENSE.get(position, "overall_defense"))
+    return best_matchups(position, week, top_n, matrix=build_matchup_matrix(players=players, defense=defense))
+
+
+def _input_paths():
+    paths = [SCHEDULE_CSV, ROSTER_CSV] + list(PLAYER_RANKINGS.values())
+    for candidates, _ in DEFENSE_CATEGORIES.values():
+        paths += candidates
+    return [path for path in paths if os.path.exists(path)]
+
+
+def load_matchup_matrix(cache_path=MATCHUP_CACHE, refresh=False):
+    """Cached matchup matrix; rebuilt when any input file is newer than the cache."""
+    if not refresh and os.path.exists(cache_path):
+        cache_time = os.path.getmtime(cache_path)
+        if all(os.path.getmtime(path) <= cache_time for path in _input_paths()):
+            return pd.read_csv(cache_path)
+
+    matrix = build_matchup_matrix()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    matrix.to_csv(cache_path, index=False)
+    return matrix
+
+
+def best_matchups(position, week=None, top_n=32, matrix=None):
+    """Top matchups for a position, optionally for one week."""
+    if matrix is None:
+        matrix = load_matchup_matrix()
+    df = matrix[matrix["Position"] == position.upper()]
+    if week is not None:
+        df = df[df["Week"] == week]
+    return df.sort_values("Matchup Score", ascending=False).head(top_n).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    matchup_matrix = load_matchup_matrix(refresh=True)
+    print(f"Saved {len(matchup_matrix)} player-week matchups to {MATCHUP_CACHE}")
+    for pos in POSITION_DEFENSE:
+        print(f"Best {pos} matchups, week 1:")
+        print(best_matchups(pos, week=1, top_n=5, matrix=matchup_matrix))
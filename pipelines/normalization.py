@@ -0,0 +1,110 @@
+"""
+Score Normalization
+One vectorized implementation of the score scalings used across the ranking pipelines, so
+every "Weighted Score" is computed the same way and a tie across a whole group never divides
+by zero.
+
+Methods:
+    minmax      (x - min) / (max - min) * scale; a zero range maps to scale / 2
+    zscore      (x - mean) / std; a zero std maps to 0
+    percentile  rank(pct=True) * scale, ties sharing their average rank
+    robust      (x - median) / IQR; a zero IQR maps to 0
+
+Grouped normalization (per position, per season, per position and season, ...) runs as one
+groupby-transform pass. Results are cached by the content of the scored column and group keys,
+so recomputing the same table elsewhere in the pipeline is a dictionary hit.
+Author: Patrick Mejia
+"""
+
+from collections import OrderedDict
+import pandas as pd
+
+METHODS = ("minmax", "zscore", "percentile", "robust")
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+
+
+def _cache_key(values, keys, method, scale, invert):
+    frame = pd.concat([values.rename("_value")] + [key.rename(f"_by{i}") for i, key in enumerate(keys)], axis=1)
+    digest = pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes()
+    return (method, scale, invert, len(keys), hash(digest))
+
+
+def _grouped(values, keys):
+    return values.groupby(keys, sort=False, dropna=False) if keys else None
+
+
+def _stat(values, grouped, name, **kwargs):
+    if grouped is None:
+        return pd.Series(getattr(values, name)(**kwargs), index=values.index)
+    return grouped.transform(name, **kwargs)
+
+
+def _normalize(values, keys, method, scale, invert):
+    grouped = _grouped(values, keys)
+
+    if method == "minmax":
+        low = _stat(values, grouped, "min")
+        spread = _stat(values, grouped, "max") - low
+        result = (values - low) / spread.where(spread != 0) * scale
+        return result.where(spread != 0, scale / 2)
+
+    if method == "zscore":
+        center = _stat(values, grouped, "mean")
+        spread = _stat(values, grouped, "std", ddof=0)
+        return ((values - center) / spread.where(spread != 0)).where(spread != 0, 0.0)
+
+    if method == "percentile":
+        # Inverted percentiles rank descending so the best value still gets the full scale
+        ranks = (values if grouped is None else grouped).rank(pct=True, ascending=not invert)
+        return ranks * scale
+
+    if method == "robust":
+        center = _stat(values, grouped, "median")
+        spread = _stat(values, grouped, "quantile", q=0.75) - _stat(values, grouped, "quantile", q=0.25)
+        return ((values - center) / spread.where(spread != 0)).where(spread != 0, 0.0)
+
+    raise ValueError(f"Unknown normalization method '{method}', expected one of {METHODS}")
+
+
+def normalize(data, column=None, method="minmax", by=None, scale=100.0, invert=False, use_cache=True):
+    """
+    Normalize a column, optionally within groups.
+    Args:
+        data (DataFrame or Series): Table holding the column, or the values themselves.
+        column (str): Column to normalize when data is a DataFrame.
+        method (str): "minmax", "zscore", "percentile" or "robust".
+        by (str or list): Column(s) to normalize within, e.g. "Position" or ["Position", "Season"].
+        scale (float): Output range for minmax and percentile (ignored by zscore and robust).
+        invert (bool): Flip the result so lower raw values score higher (e.g. yards allowed).
+        use_cache (bool): Reuse a previous result for identical values and groups.
+    Returns:
+        Series: Normalized values aligned with the input index (NaN inputs stay NaN).
+    """
+    if isinstance(data, pd.DataFrame):
+        values = data[column]
+        by = [by] if isinstance(by, str) else list(by or [])
+        keys = [data[key] for key in by]
+    else:
+        values = data
+        keys = []
+    values = pd.to_numeric(values, errors="coerce").astype(float)
+
+    key = _cache_key(values, keys, method, scale, invert) if use_cache else None
+    if key is not None and key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key].copy()
+
+    result = _normalize(values, keys, method, scale, invert).where(values.notna())
+    if invert and method != "percentile":
+        result = (scale - result) if method == "minmax" else -result
+    result = result.rename(values.name)
+
+    if key is not None:
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+        return result.copy()
+    return result
+
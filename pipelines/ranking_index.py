@@ -0,0 +1,204 @@
+"""
+Incremental Ranking Index
+Keeps players in Score order per position so a stat correction for one player updates
+the rankings without re-sorting and re-ranking the whole table. Every update emits the
+rank changes it caused (a changefeed) so consumers can push "movers" cheaply.
+
+Ranks follow pandas rank(ascending=False, method="min"): ties share the best rank.
+
+The ranking scripts take their top-N tables through top_rows().
+
+Example:
+    board = RankingBoard.from_frame(best_qbs.assign(Position="QB"))
+    board.update("QB", "Josh Allen", 2210.5)
+    for delta in board.drain():
+        print(delta.player, delta.old_rank, "->", delta.new_rank)
+Author: Patrick Mejia
+"""
+
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+RankDelta = namedtuple("RankDelta", ["position", "player", "old_rank", "new_rank", "score"])
+
+
+class RankingIndex:
+    """
+    Score-ordered index for one position, stored as a sorted list of (-score, player).
+    Locating a player or a rank is a binary search (O(log n)). Inserting or removing a key
+    shifts the list (O(n) memmove, cheap at one position's size), and an update only
+    re-ranks the players whose rank actually changes.
+    """
+
+    def __init__(self, position, scores=None):
+        self.position = position
+        self._scores = dict(scores or {})
+        self._keys = sorted((-score, player) for player, score in self._scores.items())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, player):
+        return player in self._scores
+
+    def _rank_of_score(self, score):
+        # 1 + number of players with a strictly higher score
+        return bisect_left(self._keys, (-score,)) + 1
+
+    def rank(self, player):
+        """Current rank of a player, or None if not indexed."""
+        if player not in self._scores:
+            return None
+        return self._rank_of_score(self._scores[player])
+
+    def score(self, player):
+        return self._scores.get(player)
+
+    def top(self, n):
+        """Top-n players as (rank, player, score), reading only the first n entries."""
+        result = []
+        for neg_score, player in self._keys[:n]:
+            result.append((self._rank_of_score(-neg_score), player, -neg_score))
+        return result
+
+    def _shifted(self, low, high, step):
+        """Deltas for players (other than the mover) whose score lies in [low, high)."""
+        start = bisect_left(self._keys, (-high,))
+        # Entries with score == low sit after every key (-low, player), hence the sentinel
+        stop = bisect_left(self._keys, (-low, chr(0x10FFFF)))
+        deltas = []
+        for neg_score, player in self._keys[start:stop]:
+            score = -neg_score
+            if low <= score < high:
+                new_rank = self._rank_of_score(score)
+                deltas.append(RankDelta(self.position, player, new_rank - step, new_rank, score))
+        return deltas
+
+    def update(self, player, score):
+        """
+        Insert or re-score a player.
+        Returns:
+            list: RankDelta for the player and for every player whose rank moved as a result.
+        """
+        old_score = self._scores.get(player)
+        if old_score == score:
+            return []
+
+        old_rank = None
+        if old_score is not None:
+            old_rank = self._rank_of_score(old_score)
+            del self._keys[bisect_left(self._keys, (-old_score, player))]
+        insort(self._keys, (-score, player))
+        self._scores[player] = score
+        new_rank = self._rank_of_score(score)
+
+        deltas = [RankDelta(self.position, player, old_rank, new_rank, score)] if old_rank != new_rank else []
+        if old_score is None:
+            # New entry: everyone scoring strictly below it drops one spot
+            deltas += self._shifted(float("-inf"), score, 1)
+        elif score > old_score:
+            deltas += [d for d in self._shifted(old_score, score, 1) if d.player != player]
+        else:
+            deltas += [d for d in self._shifted(score, old_score, -1) if d.player != player]
+        return deltas
+
+    def remove(self, player):
+        """Drop a player; players scoring below them move up one spot."""
+        if player not in self._scores:
+            return []
+        score = self._scores.pop(player)
+        old_rank = self._rank_of_score(score)
+        del self._keys[bisect_left(self._keys, (-score, player))]
+        return [RankDelta(self.position, player, old_rank, None, score)] + self._shifted(float("-inf"), score, -1)
+
+
+def top_rows(df, n, score_col="Score"):
+    """
+    Top-n rows of one position's ranking table in Score order, read off a RankingIndex, with Rank
+    from the index (ties share the best rank, like rank(method="min")). Rows are keyed by position
+    in the table, so players listed twice keep both rows.
+    """
+    scores = df[score_col].astype(float).to_numpy()
+    index = RankingIndex(None, ((row, score) for row, score in enumerate(scores) if score == score))
+    top = index.top(n)
+    best = df.iloc[[row for _, row, _ in top]].reset_index(drop=True)
+    best["Rank"] = [rank for rank, _, _ in top]
+    return best
+
+
+class RankingBoard:
+    """RankingIndex per position plus a changefeed of every rank change since the last drain()."""
+
+    def __init__(self):
+        self.indexes = {}
+        self._feed = []
+        self._subscribers = []
+
+    @classmethod
+    def from_frame(cls, df, position_col="Position", player_col="Player", score_col="Score"):
+        """Build a board from a ranking table without emitting deltas for the initial load."""
+        board = cls()
+        for position, group in df.groupby(position_col):
+            board.indexes[position] = RankingIndex(position, zip(group[player_col], group[score_col].astype(float)))
+        return board
+
+    def subscribe(self, callback):
+        """Call `callback(deltas)` after every update that changes at least one rank."""
+        self._subscribers.append(callback)
+
+    def _publish(self, deltas):
+        if deltas:
+            self._feed.extend(deltas)
+            for callback in self._subscribers:
+                callback(deltas)
+        return deltas
+
+    def update(self, position, player, score):
+        index = self.indexes.setdefault(position, RankingIndex(position))
+        return self._publish(index.update(player, float(score)))
+
+    def remove(self, position, player):
+        if position not in self.indexes:
+            return []
+        return self._publish(self.indexes[position].remove(player))
+
+    def apply(self, df, position_col="Position", player_col="Player", score_col="Score"):
+        """Apply a batch of corrected scores (e.g. one week's stat corrections)."""
+        deltas = []
+        for position, player, score in zip(df[position_col], df[player_col], df[score_col]):
+            deltas += self.update(position, player, score)
+        return deltas
+
+    def top(self, position, n):
+        index = self.indexes.get(position)
+        return index.top(n) if index else []
+
+    def drain(self):
+        """Return and clear the changefeed."""
+        feed, self._feed = self._feed, []
+        return feed
+
+    def movers(self, top_n=None, limit=10):
+        """
+        Net rank change per player since the last drain(), biggest moves first.
+        Args:
+            top_n (int): Only report players currently inside the top N of their position.
+            limit (int): Maximum number of movers returned.
+        """
+        first_seen = {}
+        latest = {}
+        for delta in self._feed:
+            key = (delta.position, delta.player)
+            first_seen.setdefault(key, delta.old_rank)
+            latest[key] = delta.new_rank
+
+        moves = []
+        for key, old_rank in first_seen.items():
+            new_rank = latest[key]
+            if old_rank == new_rank or new_rank is None or old_rank is None:
+                continue
+            if top_n is not None and new_rank > top_n:
+                continue
+            moves.append({"position": key[0], "player": key[1], "old_rank": old_rank,
+                          "new_rank": new_rank, "change": old_rank - new_rank})
+        return sorted(moves, key=lambda move: abs(move["change"]), reverse=True)[:limit]
@@ -0,0 +1,177 @@
+"""
+Rolling Form Metrics
+Recent form for every player from the weekly store: last-N game averages, an exponentially
+weighted average of fantasy points, and the trend slope (points per week) over the longest window.
+
+The first run computes every window in one grouped rolling pass. Later runs keep a small
+per-player state (the last N games and the running EWMA) under data/rolling_metrics and only
+fold in the weeks that arrived since, instead of recomputing the season.
+Author: Patrick Mejia
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from pipelines.fantasy_points import score_weekly_points
+from pipelines.weekly_store import load_weekly_store
+
+ROLLING_DIR = "data/rolling_metrics"
+STATE_FILE = os.path.join(ROLLING_DIR, "state.json")
+FORM_FILE = os.path.join(ROLLING_DIR, "form.csv")
+
+WINDOWS = (3, 5)
+EWMA_ALPHA = 0.4
+FORM_COLUMNS = [f"Last {window} Avg" for window in WINDOWS] + ["EWMA", "Trend"]
+
+
+def _slope(weeks, points):
+    """Least-squares slope of points over weeks (NaN with fewer than two games)."""
+    if len(weeks) < 2:
+        return np.nan
+    x = np.asarray(weeks, dtype=float)
+    y = np.asarray(points, dtype=float)
+    x_centered = x - x.mean()
+    denominator = (x_centered ** 2).sum()
+    return float((x_centered * (y - y.mean())).sum() / denominator) if denominator else np.nan
+
+
+def compute_form(points, windows=WINDOWS, alpha=EWMA_ALPHA):
+    """
+    Rolling form for every player-week in one vectorized grouped pass.
+    Args:
+        points (DataFrame): Player, Position, Week, Points (see fantasy_points.score_weekly_points).
+        windows (tuple): Game windows for the rolling averages; the largest is used for Trend.
+        alpha (float): EWMA smoothing factor (weight of the newest game).
+    Returns:
+        df (DataFrame): Player, Position, Week, Points and the FORM_COLUMNS for each week.
+    """
+    df = points.sort_values(["Player", "Week"], ignore_index=True)
+    grouped = df.groupby("Player", sort=False)["Points"]
+    for window in windows:
+        df[f"Last {window} Avg"] = grouped.rolling(window, min_periods=1).mean().to_numpy()
+    df["EWMA"] = grouped.transform(lambda series: series.ewm(alpha=alpha, adjust=False).mean())
+
+    # Rolling OLS slope from rolling sums of x, y, xy and x^2
+    window = max(windows)
+    x = df["Week"].astype(float)
+    sums = (
+        pd.DataFrame({"x": x, "y": df["Points"], "xy": x * df["Points"], "xx": x * x, "n": 1.0})
+        .groupby(df["Player"], sort=False)
+        .rolling(window, min_periods=1)
+        .sum()
+        .reset_index(drop=True)
+    )
+    denominator = sums["n"] * sums["xx"] - sums["x"] ** 2
+    slope = (sums["n"] * sums["xy"] - sums["x"] * sums["y"]) / denominator.where(denominator != 0)
+    df["Trend"] = slope.where(sums["n"] >= 2).to_numpy()
+    return df
+
+
+def _state_from_history(form, windows, alpha):
+    keep = max(windows)
+    players = {}
+    for player, group in form.groupby("Player", sort=False):
+        tail = group.tail(keep)
+        players[player] = {
+            "position": group["Position"].iloc[-1],
+            "weeks": tail["Week"].astype(int).tolist(),
+            "points": tail["Points"].astype(float).tolist(),
+            "ewma": float(group["EWMA"].iloc[-1]),
+        }
+    return {
+        "windows": list(windows),
+        "alpha": alpha,
+        "last_week": int(form["Week"].max()) if len(form) else 0,
+        "players": players,
+    }
+
+
+def update_state(state, new_points):
+    """
+    Fold newly arrived player-weeks into the stored state, touching only those players.
+    Args:
+        state (dict): State from a previous run.
+        new_points (DataFrame): Player, Position, Week, Points for weeks after state["last_week"].
+    Returns:
+        dict: The updated state.
+    """
+    keep = max(state["windows"])
+    alpha = state["alpha"]
+    for player, position, week, points in new_points.sort_values("Week")[["Player", "Position", "Week", "Points"]].itertuples(index=False):
+        entry = state["players"].get(player)
+        if entry is None:
+            entry = state["players"][player] = {"position": position, "weeks": [], "points": [], "ewma": float(points)}
+        else:
+            entry["ewma"] = alpha * float(points) + (1 - alpha) * entry["ewma"]
+        entry["weeks"] = (entry["weeks"] + [int(week)])[-keep:]
+        entry["points"] = (entry["points"] + [float(points)])[-keep:]
+        state["last_week"] = max(state["last_week"], int(week))
+    return state
+
+
+def form_table(state):
+    """Latest form per player from the stored state."""
+    rows = []
+    for player, entry in state["players"].items():
+        row = {"Player": player, "Position": entry["position"], "Week": entry["weeks"][-1]}
+        for window in state["windows"]:
+            row[f"Last {window} Avg"] = round(float(np.mean(entry["points"][-window:])), 2)
+        row["EWMA"] = round(entry["ewma"], 2)
+        trend = _slope(entry["weeks"], entry["points"])
+        row["Trend"] = round(trend, 3) if not np.isnan(trend) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).sort_values(["Position", "EWMA"], ascending=[True, False], ignore_index=True)
+
+
+def _load_state(windows, alpha):
+    if not os.path.exists(STATE_FILE):
+        return None
+    with open(STATE_FILE) as file:
+        state = json.load(file)
+    # Changed settings invalidate the stored windows
+    if state.get("windows") != list(windows) or state.get("alpha") != alpha:
+        return None
+    return state
+
+
+def _save_state(state):
+    os.makedirs(ROLLING_DIR, exist_ok=True)
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def run_rolling_metrics(data_dir="data", windows=WINDOWS, alpha=EWMA_ALPHA, full_refresh=False):
+    """
+    Update the stored form state with any new weeks and write the latest form table.
+    Args:
+        data_dir (str): Root data folder for the weekly store.
+        windows (tuple): Game windows for the rolling averages.
+        alpha (float): EWMA smoothing factor.
+        full_refresh (bool): Recompute the whole season instead of updating incrementally.
+    Returns:
+        df (DataFrame): Latest form per player (also saved to data/rolling_metrics/form.csv).
+    """
+    points = score_weekly_points(load_weekly_store(data_dir))
+    state = None if full_refresh else _load_state(windows, alpha)
+
+    if state is None:
+        state = _state_from_history(compute_form(points, windows, alpha), windows, alpha)
+    else:
+        new_points = points[points["Week"] > state["last_week"]]
+        if not new_points.empty:
+            state = update_state(state, new_points)
+
+    _save_state(state)
+    form = form_table(state)
+    form.to_csv(FORM_FILE, index=False)
+    return form
+
+
+if __name__ == "__main__":
+    latest_form = run_rolling_metrics()
+    print(latest_form.sort_values("EWMA", ascending=False).head(20))
+    print(f"Form saved for {len(latest_form)} players to {FORM_FILE}")
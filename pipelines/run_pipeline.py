@@ -0,0 +1,292 @@
+"""
+NFL Stats Pipeline Runner
+Runs the scraping and ranking scripts as a local dependency graph on a single machine.
+Independent stages run in parallel, stages whose inputs are unchanged are skipped,
+and a failed run can be resumed from the last good stage.
+
+Usage (from the repo root):
+    python -m pipelines.run_pipeline                 # run everything that is stale
+    python -m pipelines.run_pipeline --resume        # retry only what failed last time
+    python -m pipelines.run_pipeline --force weekly_stats
+"""
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+RUNS_DIR = "data/pipeline_runs"
+STATE_FILE = os.path.join(RUNS_DIR, "state.json")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+    Args:
+        name (str): Stage name used in the graph and reports.
+        module (str): Module run with `python -m`.
+        deps (list): Names of stages that must succeed first.
+        inputs (list): Local files the stage reads; a change to any of them re-runs it.
+        outputs (list): Files the stage writes; a missing output re-runs it.
+        max_age_hours (float): For stages that scrape the web, re-run once results are older than this.
+    """
+    name: str
+    module: str
+    deps: list = field(default_factory=list)
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    max_age_hours: float = None
+
+
+STAGES = [
+    Stage(
+        name="roster",
+        module="season_scripts.get_roster_per_team",
+        outputs=["rosters/fullNFLSkillRoster.csv"],
+        max_age_hours=24 * 7,
+    ),
+    Stage(
+        name="weekly_stats",
+        module="pipelines.get_weekly_stats",
+        deps=["roster"],
+        outputs=["data/official_rankings/career/official_qb_2025.csv"],
+        max_age_hours=24,
+    ),
+    Stage(
+        name="offensive_rankings",
+        module="pipelines.get_offensive_rankings",
+        deps=["weekly_stats"],
+        outputs=[
+            "data/official_rankings/official_qb_stats.csv",
+            "data/official_rankings/official_rb_stats.csv",
+            "data/official_rankings/official_wr_stats.csv",
+            "data/official_rankings/official_te_stats.csv",
+            "data/official_rankings/official_kicker_stats.csv",
+        ],
+        max_age_hours=24,
+    ),
+    Stage(
+        name="defensive_rankings",
+        module="pipelines.get_defensive_rankings",
+        deps=["weekly_stats"],
+        outputs=[
+            "official_defense_receiving_stats.csv",
+            "official_defense_rushing_stats.csv",
+            "official_defense_interception_stats.csv",
+            "official_defense_stats.csv",
+        ],
+        max_age_hours=24,
+    ),
+    Stage(
+        name="matchups",
+        module="pipelines.get_nfl_schedule",
+        deps=["offensive_rankings", "defensive_rankings"],
+        inputs=["data/nfl_metadata/stadium.csv"],
+        outputs=["nfl_schedule_2025.csv"],
+        max_age_hours=24 * 7,
+    ),
+    Stage(
+        name="strength_of_schedule",
+        module="pipelines.strength_of_schedule",
+        deps=["defensive_rankings"],
+        inputs=["data/nfl_metadata/schedule.csv"],
+        outputs=["data/strength_of_schedule/sos.npz"],
+    ),
+    Stage(
+        name="rolling_metrics",
+        module="pipelines.rolling_metrics",
+        deps=["weekly_stats"],
+        outputs=["data/rolling_metrics/form.csv"],
+        max_age_hours=24,
+    ),
+    Stage(
+        name="matchup_matrix",
+        module="pipelines.matchups",
+        deps=["offensive_rankings", "defensive_rankings"],
+        inputs=["data/nfl_metadata/schedule.csv", "data/nfl_metadata/nfl_roster.csv"],
+        outputs=["data/matchups/matchup_matrix.csv"],
+    ),
+]
+
+
+def _file_digest(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _module_path(module):
+    return os.path.join(*module.split(".")) + ".py"
+
+
+def stage_fingerprint(stage, upstream, by_name):
+    """
+    Hash of the stage's code, its input files, and each upstream stage's fingerprint and output
+    files. Hashing the outputs means a re-scraped dependency (e.g. after max_age_hours) re-runs
+    everything downstream of it even when its own code and inputs are unchanged.
+    """
+    digest = hashlib.sha256(stage.module.encode())
+    for path in [_module_path(stage.module)] + sorted(stage.inputs):
+        digest.update(f"{path}:{_file_digest(path)}".encode())
+    for dep in sorted(stage.deps):
+        digest.update(f"{dep}:{upstream.get(dep)}".encode())
+        for path in sorted(by_name[dep].outputs):
+            digest.update(f"{path}:{_file_digest(path)}".encode())
+    return digest.hexdigest()
+
+
+def _load_state():
+    if not os.path.exists(STATE_FILE):
+        return {"stages": {}, "last_run": None}
+    with open(STATE_FILE) as file:
+        return json.load(file)
+
+
+def _save_state(state):
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def _is_fresh(stage, fingerprint, record, resume, run_id):
+    if not record or record.get("status") != "success" or record.get("fingerprint") != fingerprint:
+        return False
+    if any(not os.path.exists(path) for path in stage.outputs):
+        return False
+    if resume and record.get("run_id") == run_id:
+        return True
+    if stage.max_age_hours is None:
+        return True
+    return time.time() - record["finished_at"] < stage.max_age_hours * 3600
+
+
+def _run_stage(stage):
+    for path in stage.outputs:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-m", stage.module], capture_output=True, text=True)
+    return result, time.perf_counter() - start
+
+
+def run_pipeline(stages=STAGES, max_workers=None, resume=False, force=()):
+    """
+    Run the stage graph, launching every stage whose dependencies have succeeded.
+    Args:
+        stages (list): Stage definitions.
+        max_workers (int): Concurrent stages (defaults to the CPU count).
+        resume (bool): Continue the previous run, skipping its successful stages.
+        force (iterable): Stage names to run even if they are fresh.
+    Returns:
+        list: Per-stage report rows (stage, status, seconds).
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+    state = _load_state()
+    run_id = state["last_run"] if resume and state["last_run"] else datetime.now().strftime("%Y%m%dT%H%M%S")
+    state["last_run"] = run_id
+
+    fingerprints = {}
+    statuses = {}
+    report = []
+    running = {}
+
+    def ready(stage):
+        return all(statuses.get(dep) in ("success", "skipped") for dep in stage.deps)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        while len(statuses) < len(stages):
+            for stage in stages:
+                if stage.name in statuses or stage.name in running.values():
+                    continue
+                if any(statuses.get(dep) in ("failed", "blocked") for dep in stage.deps):
+                    statuses[stage.name] = "blocked"
+                    report.append({"stage": stage.name, "status": "blocked", "seconds": 0.0})
+                    continue
+                if not ready(stage):
+                    continue
+
+                fingerprints[stage.name] = stage_fingerprint(stage, fingerprints, by_name)
+                record = state["stages"].get(stage.name)
+                if stage.name not in force and _is_fresh(stage, fingerprints[stage.name], record, resume, run_id):
+                    statuses[stage.name] = "skipped"
+                    report.append({"stage": stage.name, "status": "skipped", "seconds": 0.0})
+                    logger.info(f"[{stage.name}] up to date, skipping")
+                    continue
+
+                logger.info(f"[{stage.name}] starting")
+                running[executor.submit(_run_stage, stage)] = stage.name
+
+            if not running:
+                if len(statuses) < len(stages):
+                    raise ValueError("Stage graph has a cycle; no stage can be started.")
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result, seconds = future.result()
+                status = "success" if result.returncode == 0 else "failed"
+                statuses[name] = status
+                report.append({"stage": name, "status": status, "seconds": round(seconds, 2)})
+                if status == "success":
+                    state["stages"][name] = {
+                        "status": status,
+                        "fingerprint": fingerprints[name],
+                        "run_id": run_id,
+                        "finished_at": time.time(),
+                    }
+                    logger.info(f"[{name}] finished in {seconds:.1f}s")
+                else:
+                    state["stages"][name] = {"status": status, "run_id": run_id, "finished_at": time.time()}
+                    logger.error(f"[{name}] failed after {seconds:.1f}s:\n{result.stderr[-2000:]}")
+                _save_state(state)
+
+    _write_report(run_id, report)
+    return report
+
+
+def _write_report(run_id, report):
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    path = os.path.join(RUNS_DIR, f"{run_id}_timing.csv")
+    with open(path, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["stage", "status", "seconds"])
+        writer.writeheader()
+        writer.writerows(report)
+    logger.info(f"Timing report saved to {path}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Run the NFL stats pipeline locally.")
+    arg_parser.add_argument("--resume", action="store_true", help="Continue the previous run from its last good stage")
+    arg_parser.add_argument("--force", nargs="*", default=[], help="Stage names to re-run regardless of freshness")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Max stages to run at once")
+    args = arg_parser.parse_args()
+
+    results = run_pipeline(max_workers=args.workers, resume=args.resume, force=set(args.force))
+    for row in results:
+        print(f"{row['stage']:<22}{row['status']:<10}{row['seconds']:>8.2f}s")
+    sys.exit(1 if any(row["status"] in ("failed", "blocked") for row in results) else 0)
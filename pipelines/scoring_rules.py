@@ -0,0 +1,239 @@
+"""
+Scoring Rules Compiler
+League scoring systems are declared as data (JSON, or YAML when PyYAML is installed) under
+pipelines/scoring_systems and compiled into one stat-to-weight matrix, so points for any number
+of scoring systems over every player-week come out of a single matrix multiply.
+
+A scoring system looks like:
+    {
+        "name": "te_premium",
+        "points": {"REC": 1, "REC_YDS": 0.1, ...},          # applied to every position
+        "positions": {"TE": {"REC": 1.5}},                   # optional per-position overrides
+        "bonuses": [{"stat": "RUSH_YDS", "min": 100, "points": 3}]   # optional milestone bonuses
+    }
+Author: Patrick Mejia
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from pipelines.weekly_store import STAT_COLUMNS, load_weekly_store
+
+SCORING_DIR = os.path.join(os.path.dirname(__file__), "scoring_systems")
+POINTS_CACHE_DIR = "data/fantasy_points"
+POSITIONS = ["QB", "RB", "WR", "TE", "K"]
+POINTS_CACHE_SIZE = 64
+
+# (scoring hash, store fingerprint) -> points, least recently used first
+_points_cache = OrderedDict()
+
+
+def _cached_points(key):
+    points = _points_cache.get(key)
+    if points is not None:
+        _points_cache.move_to_end(key)
+    return points
+
+
+def _cache_points(key, points):
+    _points_cache[key] = points
+    _points_cache.move_to_end(key)
+    while len(_points_cache) > POINTS_CACHE_SIZE:
+        _points_cache.popitem(last=False)
+
+
+def load_scoring_system(name_or_path):
+    """Load a scoring system by name (e.g. "half_ppr") or by file path."""
+    path = name_or_path
+    if not os.path.exists(path):
+        for extension in (".json", ".yaml", ".yml"):
+            candidate = os.path.join(SCORING_DIR, f"{name_or_path}{extension}")
+            if os.path.exists(candidate):
+                path = candidate
+                break
+        else:
+            raise FileNotFoundError(f"Scoring system '{name_or_path}' not found in {SCORING_DIR}")
+
+    with open(path) as file:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # Optional dependency, only needed for YAML scoring files
+            system = yaml.safe_load(file)
+        else:
+            system = json.load(file)
+    system.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    validate_scoring_system(system)
+    return system
+
+
+def available_scoring_systems():
+    """Names of the scoring systems shipped under pipelines/scoring_systems."""
+    return sorted(
+        os.path.splitext(filename)[0]
+        for filename in os.listdir(SCORING_DIR)
+        if filename.endswith((".json", ".yaml", ".yml"))
+    )
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_scoring_system(system):
+    """
+    Raise ValueError if a scoring system is malformed: unknown stats or positions, non-numeric
+    points, or bonuses missing a stat, a numeric min or numeric points.
+    """
+    name = system.get("name")
+    tables = [("points", system.get("points", {}))]
+    for position, overrides in system.get("positions", {}).items():
+        if position not in POSITIONS:
+            raise ValueError(f"Unknown position '{position}' in scoring system '{name}'")
+        tables.append((f"positions.{position}", overrides))
+
+    stats = set()
+    for label, table in tables:
+        if not isinstance(table, dict):
+            raise ValueError(f"'{label}' must map stats to points in scoring system '{name}'")
+        for stat, points in table.items():
+            if not _is_number(points):
+                raise ValueError(f"Points for {stat} in '{label}' must be a number in scoring system '{name}'")
+        stats |= set(table)
+
+    bonuses = system.get("bonuses", [])
+    if not isinstance(bonuses, list):
+        raise ValueError(f"'bonuses' must be a list in scoring system '{name}'")
+    for bonus in bonuses:
+        if not isinstance(bonus, dict) or not isinstance(bonus.get("stat"), str) \
+                or not _is_number(bonus.get("min")) or not _is_number(bonus.get("points")):
+            raise ValueError(f"Bonus {bonus} needs a stat, a numeric min and numeric points in scoring system '{name}'")
+        stats.add(bonus["stat"])
+    unknown = stats - set(STAT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown stats {sorted(unknown)} in scoring system '{name}'")
+
+
+def scoring_hash(system):
+    """Content hash of the rules (the name is ignored so renamed copies share a cache entry)."""
+    rules = {key: value for key, value in system.items() if key not in ("name", "description")}
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def position_weights(system):
+    """Expand a scoring system to {position: {stat: points}} (bonuses excluded)."""
+    weights = {}
+    for position in POSITIONS:
+        weights[position] = dict(system.get("points", {}))
+        weights[position].update(system.get("positions", {}).get(position, {}))
+    return weights
+
+
+class CompiledScoring:
+    """
+    K scoring systems compiled to one (positions x features) x K weight matrix.
+    Features are the unified stat columns plus one 0/1 column per distinct milestone bonus.
+    """
+
+    def __init__(self, systems):
+        self.systems = list(systems)
+        self.names = [system["name"] for system in self.systems]
+        self.hashes = [scoring_hash(system) for system in self.systems]
+        self.bonuses = sorted({
+            (bonus["stat"], float(bonus["min"])) for system in self.systems for bonus in system.get("bonuses", [])
+        })
+        self.features = STAT_COLUMNS + [f"{stat}>={minimum:g}" for stat, minimum in self.bonuses]
+
+        n_features = len(self.features)
+        self.matrix = np.zeros((len(POSITIONS) * n_features, len(self.systems)))
+        for k, system in enumerate(self.systems):
+            for p, position in enumerate(POSITIONS):
+                offset = p * n_features
+                for stat, points in position_weights(system)[position].items():
+                    self.matrix[offset + STAT_COLUMNS.index(stat), k] = points
+                for bonus in system.get("bonuses", []):
+                    column = len(STAT_COLUMNS) + self.bonuses.index((bonus["stat"], float(bonus["min"])))
+                    self.matrix[offset + column, k] += bonus["points"]
+
+    def design_matrix(self, store):
+        """Position-expanded features: each row's features sit in its own position's block."""
+        stats = store[STAT_COLUMNS].to_numpy(dtype=float)
+        if self.bonuses:
+            indicators = np.column_stack([
+                store[stat].to_numpy(dtype=float) >= minimum for stat, minimum in self.bonuses
+            ]).astype(float)
+            features = np.hstack([stats, indicators])
+        else:
+            features = stats
+
+        n_rows, n_features = features.shape
+        position_index = pd.Categorical(store["Position"], categories=POSITIONS).codes
+        scored = position_index >= 0
+        design = np.zeros((n_rows, len(POSITIONS) * n_features))
+        columns = position_index[scored, None] * n_features + np.arange(n_features)
+        design[np.nonzero(scored)[0][:, None], columns] = features[scored]
+        return design
+
+    def evaluate(self, store):
+        """Points for every row of the store under every compiled system, shape (rows, K)."""
+        return self.design_matrix(store) @ self.matrix
+
+
+def _store_fingerprint(store):
+    return hashlib.sha256(pd.util.hash_pandas_object(store, index=False).to_numpy().tobytes()).hexdigest()[:16]
+
+
+def score_player_weeks(systems, store=None, use_disk_cache=True):
+    """
+    Points for every player-week under each scoring system.
+    Results are cached per (scoring hash, weekly store contents) in memory (the
+    POINTS_CACHE_SIZE most recently used) and under data/fantasy_points, so only systems not
+    seen before are evaluated.
+    Args:
+        systems (list): Scoring system dicts or names.
+        store (DataFrame): Output of load_weekly_store(); loaded if omitted.
+        use_disk_cache (bool): Read/write cached points under data/fantasy_points.
+    Returns:
+        df (DataFrame): Player, Position, Week and one points column per scoring system name.
+    """
+    systems = [load_scoring_system(system) if isinstance(system, str) else system for system in systems]
+    for system in systems:
+        validate_scoring_system(system)
+    if store is None:
+        store = load_weekly_store()
+
+    store_key = _store_fingerprint(store)
+    result = store[["Player", "Position", "Week"]].copy()
+    missing = []
+    for system in systems:
+        key = (scoring_hash(system), store_key)
+        cached = _cached_points(key)
+        cache_path = os.path.join(POINTS_CACHE_DIR, f"points_{key[0]}_{store_key}.npy")
+        if cached is None and use_disk_cache and os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            _cache_points(key, cached)
+        if cached is None:
+            missing.append(system)
+        else:
+            result[system["name"]] = cached
+
+    if missing:
+        compiled = CompiledScoring(missing)
+        points = compiled.evaluate(store).round(2)
+        for k, system in enumerate(missing):
+            key = (compiled.hashes[k], store_key)
+            _cache_points(key, points[:, k])
+            result[system["name"]] = points[:, k]
+            if use_disk_cache:
+                os.makedirs(POINTS_CACHE_DIR, exist_ok=True)
+                np.save(os.path.join(POINTS_CACHE_DIR, f"points_{key[0]}_{store_key}.npy"), points[:, k])
+
+    return result
+
+
+if __name__ == "__main__":
+    weekly_points = score_player_weeks(available_scoring_systems())
+    print(weekly_points.groupby(["Player", "Position"]).sum(numeric_only=True)
+          .drop(columns="Week").sort_values("ppr", ascending=False).head(20))
@@ -0,0 +1,166 @@
+"""
+Strength of Schedule
+Dense team x week x position difficulty array built from nfl_metadata/schedule.csv and the
+defensive category ratings (see matchups.load_defense_ratings). A cell is the rating (0-100,
+higher is tougher) of the defense that team faces that week for that position; byes are NaN.
+
+The array, the team x week opponent index and the ratings it was built from are stored in one
+small .npz, so "rest of season" or "playoff weeks" queries are a slice and a nanmean. When the
+defensive ratings change, only the cells whose opponent's ratings moved are recomputed.
+Author: Patrick Mejia
+"""
+
+import hashlib
+import os
+import numpy as np
+
+from pipelines.matchups import SCHEDULE_CSV, TEAMS, load_defense_ratings, load_schedule
+
+SOS_FILE = "data/strength_of_schedule/sos.npz"
+WEEKS = 18
+PLAYOFF_WEEKS = (15, 16, 17)
+POSITIONS = ["QB", "RB", "WR", "TE", "K"]
+
+# Position -> (defense category, weight); QBs face both coverage and takeaways
+POSITION_CATEGORIES = {
+    "QB": {"pass_defense": 0.7, "takeaways": 0.3},
+    "RB": {"rush_defense": 1.0},
+    "WR": {"pass_defense": 1.0},
+    "TE": {"pass_defense": 1.0},
+    "K": {"overall_defense": 1.0},
+}
+
+TEAM_IDS = list(TEAMS["team_id"])
+_TEAM_INDEX = {team_id: i for i, team_id in enumerate(TEAM_IDS)}
+
+
+def _file_hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def opponent_index(schedule):
+    """Team x week array of opponent team indexes (-1 on a bye)."""
+    opponents = np.full((len(TEAM_IDS), WEEKS), -1, dtype=np.int8)
+    teams = schedule["team_id"].map(_TEAM_INDEX).to_numpy()
+    rivals = schedule["opponent_id"].map(_TEAM_INDEX).to_numpy()
+    weeks = schedule["Week"].to_numpy() - 1
+    opponents[teams, weeks] = rivals
+    return opponents
+
+
+def position_ratings(defense):
+    """Team x position defensive rating matrix, blending categories per POSITION_CATEGORIES."""
+    defense = defense.reindex(TEAM_IDS)
+    ratings = np.zeros((len(TEAM_IDS), len(POSITIONS)), dtype=np.float32)
+    for p, position in enumerate(POSITIONS):
+        for category, weight in POSITION_CATEGORIES[position].items():
+            ratings[:, p] += weight * defense[category].to_numpy(dtype=np.float32)
+    return ratings
+
+
+def difficulty_array(opponents, ratings, cells=None, difficulty=None):
+    """
+    Gather opponent ratings into the team x week x position array.
+    Args:
+        opponents (ndarray): Team x week opponent indexes from opponent_index().
+        ratings (ndarray): Team x position ratings from position_ratings().
+        cells (ndarray): Optional boolean team x week mask; only these cells are recomputed.
+        difficulty (ndarray): Existing array to update in place when cells is given.
+    Returns:
+        ndarray: float32 array of shape (teams, weeks, positions) with NaN for byes.
+    """
+    if difficulty is None or cells is None:
+        difficulty = np.full(opponents.shape + (len(POSITIONS),), np.nan, dtype=np.float32)
+        cells = np.ones(opponents.shape, dtype=bool)
+    cells = cells & (opponents >= 0)
+    difficulty[cells] = ratings[opponents[cells]]
+    return difficulty
+
+
+class StrengthOfSchedule:
+    """Query wrapper around the stored difficulty array."""
+
+    def __init__(self, difficulty, opponents, ratings, schedule_hash=""):
+        self.difficulty = difficulty
+        self.opponents = opponents
+        self.ratings = ratings
+        self.schedule_hash = schedule_hash
+
+    @classmethod
+    def load(cls, path=SOS_FILE):
+        with np.load(path) as stored:
+            return cls(stored["difficulty"], stored["opponents"], stored["ratings"], str(stored["schedule_hash"]))
+
+    def save(self, path=SOS_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path, difficulty=self.difficulty, opponents=self.opponents,
+            ratings=self.ratings, schedule_hash=np.array(self.schedule_hash),
+        )
+
+    def team_difficulty(self, team_id, position, weeks):
+        """Average difficulty of a team's games in `weeks` (byes are skipped)."""
+        columns = _week_columns(weeks)
+        return float(np.nanmean(self.difficulty[_TEAM_INDEX[team_id], columns, POSITIONS.index(position)]))
+
+    def rest_of_season(self, position, from_week):
+        """Team -> average difficulty from `from_week` through the last week."""
+        return self.by_team(position, range(from_week, WEEKS + 1))
+
+    def playoff_weeks(self, position, weeks=PLAYOFF_WEEKS):
+        """Team -> average difficulty over the fantasy playoff weeks."""
+        return self.by_team(position, weeks)
+
+    def by_team(self, position, weeks):
+        columns = _week_columns(weeks)
+        values = self.difficulty[:, columns, POSITIONS.index(position)]
+        counts = (~np.isnan(values)).sum(axis=1)
+        averages = np.where(counts > 0, np.nansum(values, axis=1) / np.maximum(counts, 1), np.nan)
+        return dict(zip(TEAM_IDS, averages.round(2).tolist()))
+
+
+def _week_columns(weeks):
+    """Array columns for 1-based weeks; anything outside 1..WEEKS raises instead of wrapping around."""
+    weeks = np.atleast_1d(np.asarray(list(weeks) if not np.isscalar(weeks) else weeks, dtype=int))
+    if weeks.size == 0:
+        raise ValueError("No weeks given")
+    if weeks.min() < 1 or weeks.max() > WEEKS:
+        raise ValueError(f"Weeks must be between 1 and {WEEKS}, got {weeks.min()}-{weeks.max()}")
+    return weeks - 1
+
+
+def refresh_strength_of_schedule(path=SOS_FILE, schedule_path=SCHEDULE_CSV, defense=None):
+    """
+    Build or incrementally refresh the stored array.
+    A changed schedule rebuilds everything; changed defensive ratings only recompute the
+    cells whose opponent's ratings moved.
+    Returns:
+        tuple: (StrengthOfSchedule, number of team-week cells recomputed).
+    """
+    schedule_hash = _file_hash(schedule_path)
+    ratings = position_ratings(load_defense_ratings() if defense is None else defense)
+
+    if os.path.exists(path):
+        sos = StrengthOfSchedule.load(path)
+        if sos.schedule_hash == schedule_hash and sos.ratings.shape == ratings.shape:
+            changed_teams = np.flatnonzero(np.any(~np.isclose(sos.ratings, ratings), axis=1))
+            cells = np.isin(sos.opponents, changed_teams)
+            if cells.any():
+                difficulty_array(sos.opponents, ratings, cells, sos.difficulty)
+                sos.ratings = ratings
+                sos.save(path)
+            return sos, int(cells.sum())
+
+    opponents = opponent_index(load_schedule(schedule_path))
+    sos = StrengthOfSchedule(difficulty_array(opponents, ratings), opponents, ratings, schedule_hash)
+    sos.save(path)
+    return sos, int((opponents >= 0).sum())
+
+
+if __name__ == "__main__":
+    strength, recomputed = refresh_strength_of_schedule()
+    print(f"Recomputed {recomputed} team-weeks -> {SOS_FILE}")
+    for pos in POSITIONS:
+        playoff = sorted(strength.playoff_weeks(pos).items(), key=lambda item: item[1])
+        print(f"Easiest {pos} playoff schedules: {playoff[:5]}")
@@ -0,0 +1,101 @@
+"""
+Weekly Stats Store
+Loads every per-player weekly game log under data/*_weekly_stats into one long table
+with a shared stat schema, so downstream stages read the weekly data in a single pass.
+Author: Patrick Mejia
+"""
+
+import os
+import pandas as pd
+
+DATA_DIR = "data"
+
+# Unified stat columns shared by every position (missing stats are 0)
+STAT_COLUMNS = [
+    "CMP", "PASS_ATT", "PASS_YDS", "PASS_TD", "INT",
+    "RUSH_ATT", "RUSH_YDS", "RUSH_TD",
+    "REC", "REC_YDS", "REC_TD",
+    "FUM", "FL",
+    "FGA", "FGM", "FG_MISS", "XPA", "XPM", "XP_MISS",
+]
+
+# Folder -> (position, raw game log column -> unified stat column).
+# Order matters: a player found in an earlier folder (e.g. a QB's rushing log under rb_weekly_stats)
+# is not loaded again from a later one.
+WEEKLY_SOURCES = {
+    "qb_weekly_stats": ("QB", {
+        "COMP": "CMP", "ATT": "PASS_ATT", "YDS": "PASS_YDS", "TD": "PASS_TD", "INT": "INT",
+        "ATT.1": "RUSH_ATT", "YDS.1": "RUSH_YDS", "TD.1": "RUSH_TD", "FUM": "FUM", "LOST": "FL",
+    }),
+    "rb_weekly_stats": ("RB", {
+        "ATT": "RUSH_ATT", "YDS": "RUSH_YDS", "TD": "RUSH_TD",
+        "REC": "REC", "YDS.1": "REC_YDS", "TD.1": "REC_TD", "FUM": "FUM", "LOST": "FL",
+    }),
+    "wr_weekly_stats": ("WR", {
+        "REC": "REC", "YDS": "REC_YDS", "TD": "REC_TD",
+        "ATT": "RUSH_ATT", "YDS.1": "RUSH_YDS", "TD.1": "RUSH_TD", "FUM": "FUM", "LOST": "FL",
+    }),
+    "kicker_weekly_stats": ("K", {
+        "FG Att": "FGA", "FGM": "FGM", "XP Att": "XPA", "XPM": "XPM",
+    }),
+}
+
+# Tight ends are stored alongside receivers; they are re-labelled from the official TE table
+TE_REFERENCE = "official_stats/official_te_stats.csv"
+
+
+def _player_from_filename(filename):
+    """"Kenneth_Walker_III_weekly_stats.csv" -> "Kenneth Walker III"."""
+    return filename.replace("_weekly_stats.csv", "").replace("_", " ")
+
+
+def _tight_ends(data_dir):
+    path = os.path.join(data_dir, TE_REFERENCE)
+    if not os.path.exists(path):
+        return set()
+    return set(pd.read_csv(path)["Player"])
+
+
+def load_weekly_store(data_dir=DATA_DIR):
+    """
+    Read all weekly game logs into one long DataFrame.
+    Args:
+        data_dir (str): Root data folder.
+    Returns:
+        df (DataFrame): One row per player-week with Player, Position, Week, Opponent, Home
+        and every column in STAT_COLUMNS as floats.
+    """
+    tight_ends = _tight_ends(data_dir)
+    frames = []
+    seen = set()
+
+    for folder, (position, column_map) in WEEKLY_SOURCES.items():
+        folder_path = os.path.join(data_dir, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in sorted(os.listdir(folder_path)):
+            if not filename.endswith("_weekly_stats.csv"):
+                continue
+            player = _player_from_filename(filename)
+            if player in seen:
+                continue
+            seen.add(player)
+
+            raw = pd.read_csv(os.path.join(folder_path, filename))
+            df = raw[[col for col in column_map if col in raw.columns]].rename(columns=column_map)
+            df.insert(0, "Player", player)
+            df.insert(1, "Position", "TE" if position == "WR" and player in tight_ends else position)
+            df.insert(2, "Week", raw["WK"].astype(int))
+            df.insert(3, "Opponent", raw["OPP"].str.lstrip("@"))
+            df.insert(4, "Home", ~raw["OPP"].str.startswith("@"))
+            frames.append(df)
+
+    store = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Player", "Position", "Week"])
+    store = store.reindex(columns=["Player", "Position", "Week", "Opponent", "Home"] + STAT_COLUMNS)
+    store[STAT_COLUMNS] = store[STAT_COLUMNS].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+
+    # Misses are not logged directly
+    store["FG_MISS"] = (store["FGA"] - store["FGM"]).clip(lower=0)
+    store["XP_MISS"] = (store["XPA"] - store["XPM"]).clip(lower=0)
+
+    return store.sort_values(["Position", "Player", "Week"], ignore_index=True)
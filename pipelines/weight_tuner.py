@@ -0,0 +1,300 @@
+"""
+Composite Score Weight Tuner
+Tests the hand-picked POSITION_CONFIG weights against history. Season-to-date versions of each
+ranking column are rebuilt from the weekly store for every player-week, thousands of candidate
+weight vectors are scored at once as one matrix product, and each candidate is graded by the
+Spearman rank correlation between its Score and the player's fantasy points in the next game,
+averaged over weeks.
+
+Candidates are picked on earlier weeks and graded on later, held-out weeks (rolling splits: each
+fold trains on every week before its test block). A position's weights are only written to
+pipelines/ranking_weights.json, which get_weekly_stats applies on top of POSITION_CONFIG (and so
+to the career backfill too), when the latest fold's pick beats the current weights on its held-out
+weeks and the picks beat them on average across folds, both by more than --min-improvement.
+A feature the pick switches off keeps its current weight unless dropping it also holds up on the
+held-out weeks.
+
+Only columns that can be rebuilt from the game logs are tuned (e.g. LG, 20+ and kicking distance
+buckets keep their hand-picked weights).
+
+Usage (from the repo root):
+    python -m pipelines.weight_tuner --candidates 5000 --seed 1
+Author: Patrick Mejia
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from pipelines.fantasy_points import score_weekly_points
+from pipelines.get_weekly_stats import POSITION_CONFIG, RANKING_WEIGHTS_FILE
+from pipelines.weekly_store import load_weekly_store
+
+MIN_GROUP_SIZE = 5
+N_FOLDS = 3
+MIN_TRAIN_WEEKS = 6
+
+# Ranking column -> how to rebuild it season-to-date from the weekly store:
+# ("sum", stat), ("ratio", numerator, denominator, multiplier), ("points",) or ("points_per_game",)
+FEATURES = {
+    "qb": {
+        "CMP": ("sum", "CMP"), "YDS": ("sum", "PASS_YDS"), "TD": ("sum", "PASS_TD"),
+        "Y/A": ("ratio", "PASS_YDS", "PASS_ATT", 1), "INT": ("sum", "INT"),
+        "R_YDS": ("sum", "RUSH_YDS"), "R_TD": ("sum", "RUSH_TD"), "R_ATT": ("sum", "RUSH_ATT"),
+        "FPTS": ("points",), "FPTS/G": ("points_per_game",),
+    },
+    "rb": {
+        "ATT": ("sum", "RUSH_ATT"), "YDS": ("sum", "RUSH_YDS"), "TD": ("sum", "RUSH_TD"),
+        "REC_YDS": ("sum", "REC_YDS"), "REC_TD": ("sum", "REC_TD"), "Y/A": ("ratio", "RUSH_YDS", "RUSH_ATT", 1),
+        "FL": ("sum", "FL"), "REC": ("sum", "REC"), "FPTS": ("points",), "FPTS/G": ("points_per_game",),
+    },
+    "wr": {
+        "REC": ("sum", "REC"), "YDS": ("sum", "REC_YDS"), "TD": ("sum", "REC_TD"),
+        "Y/R": ("ratio", "REC_YDS", "REC", 1), "FPTS": ("points",), "FPTS/G": ("points_per_game",),
+    },
+    "te": {
+        "REC": ("sum", "REC"), "YDS": ("sum", "REC_YDS"), "TD": ("sum", "REC_TD"),
+        "Y/R": ("ratio", "REC_YDS", "REC", 1), "FPTS": ("points",), "FPTS/G": ("points_per_game",),
+    },
+    "k": {
+        "FG": ("sum", "FGM"), "FGA": ("sum", "FGA"), "PCT": ("ratio", "FGM", "FGA", 100),
+        "FPTS": ("points",), "FPTS/G": ("points_per_game",),
+    },
+}
+
+
+def tunable_columns(position):
+    """Weighted ranking columns for a position that can be rebuilt from the game logs."""
+    return [col for col in POSITION_CONFIG[position]["weights"] if col in FEATURES[position]]
+
+
+def build_training_set(position, store=None, points=None):
+    """
+    Season-to-date feature matrix and next-game target for one position.
+    Args:
+        position (str): POSITION_CONFIG key ("qb", "rb", "wr", "te", "k").
+        store (DataFrame): Output of load_weekly_store(); loaded if omitted.
+        points (DataFrame): Output of score_weekly_points(store); computed if omitted.
+    Returns:
+        tuple: (X of shape (rows, features), next-game points y, week of each row, week of the
+        next game the target comes from, feature names).
+    """
+    if store is None:
+        store = load_weekly_store()
+    if points is None:
+        points = score_weekly_points(store)
+
+    rows = store.assign(Points=points["Points"].to_numpy())
+    rows = rows[rows["Position"] == position.upper()].sort_values(["Player", "Week"], ignore_index=True)
+    by_player = rows.groupby("Player", sort=False)
+
+    stats = sorted({stat for spec in FEATURES[position].values() for stat in spec[1:3] if isinstance(stat, str)})
+    totals = by_player[stats + ["Points"]].cumsum()
+    games = by_player.cumcount() + 1
+
+    columns = tunable_columns(position)
+    X = np.zeros((len(rows), len(columns)))
+    for j, col in enumerate(columns):
+        spec = FEATURES[position][col]
+        if spec[0] == "sum":
+            X[:, j] = totals[spec[1]]
+        elif spec[0] == "ratio":
+            X[:, j] = (totals[spec[1]] / totals[spec[2]].where(totals[spec[2]] > 0)).fillna(0) * spec[3]
+        elif spec[0] == "points":
+            X[:, j] = totals["Points"]
+        else:
+            X[:, j] = totals["Points"] / games
+
+    target = by_player["Points"].shift(-1)
+    target_weeks = by_player["Week"].shift(-1)
+    keep = target.notna().to_numpy()
+    weeks = rows["Week"].to_numpy()[keep]
+    return X[keep], target.to_numpy()[keep], weeks, target_weeks.to_numpy()[keep], columns
+
+
+def _ranks(values):
+    """Column-wise average ranks (ties share their mean rank)."""
+    return pd.DataFrame(values).rank(axis=0).to_numpy(copy=True)
+
+
+def spearman_by_group(scores, target, groups, min_group_size=MIN_GROUP_SIZE):
+    """
+    Mean within-group Spearman correlation of each score column with the target.
+    Args:
+        scores (ndarray): (rows, K) candidate scores.
+        target (ndarray): (rows,) outcome.
+        groups (ndarray): (rows,) group codes (e.g. week).
+    Returns:
+        ndarray: (K,) correlations weighted by group size.
+    """
+    total = np.zeros(scores.shape[1])
+    weight = 0
+    for group in np.unique(groups):
+        mask = groups == group
+        if mask.sum() < min_group_size:
+            continue
+        score_ranks = _ranks(scores[mask])
+        target_ranks = _ranks(target[mask])[:, 0]
+        score_ranks -= score_ranks.mean(axis=0)
+        target_ranks -= target_ranks.mean()
+        denominator = np.sqrt((score_ranks ** 2).sum(axis=0) * (target_ranks ** 2).sum())
+        correlation = np.divide(score_ranks.T @ target_ranks, denominator, out=np.zeros(scores.shape[1]), where=denominator > 0)
+        total += correlation * mask.sum()
+        weight += mask.sum()
+    return total / weight if weight else total
+
+
+def _evaluate_batch(X, target, groups, candidates):
+    return spearman_by_group(X @ candidates.T, target, groups)
+
+
+def candidate_weights(base, n_candidates, seed, spread=1.0):
+    """
+    Candidate weight vectors around the current weights: each weight is scaled by a log-normal
+    factor (keeping its sign), and a share of candidates also switch features off entirely.
+    Row 0 is always the current weights.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    base = np.asarray(base, dtype=float)
+    factors = rng.lognormal(0.0, spread, size=(n_candidates, len(base)))
+    dropout = rng.random((n_candidates, len(base))) < 0.15
+    candidates = base * factors * ~dropout
+    candidates[0] = base
+    return candidates
+
+
+def rolling_splits(weeks, target_weeks, n_folds=N_FOLDS, min_train_weeks=MIN_TRAIN_WEEKS):
+    """
+    Walk-forward folds over the weeks in the data: the weeks after the first min_train_weeks are
+    cut into n_folds consecutive test blocks, and each block trains on the rows whose next game
+    is played before the block starts (so no training target comes from a test week).
+    Returns:
+        list: (train mask, test mask) per fold, earliest first.
+    """
+    unique_weeks = np.unique(weeks)
+    blocks = [block for block in np.array_split(unique_weeks[min_train_weeks:], n_folds) if len(block)]
+    return [(target_weeks < block[0], np.isin(weeks, block)) for block in blocks]
+
+
+def _evaluate(X, target, groups, candidates, batch_size, executor):
+    batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+    if executor is None or len(batches) == 1:
+        results = [_evaluate_batch(X, target, groups, batch) for batch in batches]
+    else:
+        results = list(executor.map(
+            _evaluate_batch, [X] * len(batches), [target] * len(batches), [groups] * len(batches), batches
+        ))
+    return np.concatenate(results)
+
+
+def tune_position(position, n_candidates=5000, seed=0, workers=None, batch_size=500, store=None, points=None,
+                  n_folds=N_FOLDS, min_train_weeks=MIN_TRAIN_WEEKS):
+    """
+    Pick candidate weight vectors on earlier weeks and grade them on later, held-out weeks.
+    Each fold picks the candidate with the best training correlation and scores it and the current
+    weights on its test block. The latest fold's pick (trained on the most weeks) is the proposal;
+    features it switches off get their current weight back unless the held-out weeks agree.
+    Returns:
+        dict: position, columns, rows, held-out baseline and proposal correlation on the latest
+        fold, in-sample correlation of the proposal, held-out gain per fold and on average, and the
+        proposed weights (rescaled to the baseline's total absolute weight so Score stays on a
+        similar scale).
+    """
+    X, target, weeks, target_weeks, columns = build_training_set(position, store, points)
+    base = np.array([POSITION_CONFIG[position]["weights"][col] for col in columns])
+    candidates = candidate_weights(base, n_candidates, [seed, sum(map(ord, position))])
+    folds = rolling_splits(weeks, target_weeks, n_folds, min_train_weeks)
+    if not folds:
+        raise ValueError(f"Not enough weeks to hold out for {position}: need more than {min_train_weeks}")
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        gains = []
+        for train, test in folds:
+            train_scores = _evaluate(X[train], target[train], weeks[train], candidates, batch_size, executor)
+            pick = candidates[int(np.argmax(train_scores))]
+            held_out = spearman_by_group(X[test] @ np.stack([base, pick]).T, target[test], weeks[test])
+            gains.append(float(held_out[1] - held_out[0]))
+
+        # The proposal is the latest fold's pick; a feature it drops keeps its current weight unless
+        # dropping it scores at least as well on the held-out weeks
+        train, test = folds[-1]
+        proposal = pick.copy()
+        dropped = (proposal == 0) & (base != 0)
+        if dropped.any():
+            restored = np.where(dropped, base, proposal)
+            scores = spearman_by_group(X[test] @ np.stack([proposal, restored]).T, target[test], weeks[test])
+            if scores[1] >= scores[0]:
+                proposal = restored
+        held_out = spearman_by_group(X[test] @ np.stack([base, proposal]).T, target[test], weeks[test])
+        in_sample = spearman_by_group(X[train] @ proposal[:, None], target[train], weeks[train])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if np.abs(proposal).sum() > 0:
+        proposal = proposal * np.abs(base).sum() / np.abs(proposal).sum()
+    return {
+        "position": position,
+        "columns": columns,
+        "rows": len(target),
+        "baseline_spearman": round(float(held_out[0]), 4),
+        "best_spearman": round(float(held_out[1]), 4),
+        "in_sample_spearman": round(float(in_sample[0]), 4),
+        "fold_gains": [round(gain, 4) for gain in gains],
+        "mean_heldout_gain": round(float(np.mean(gains)), 4),
+        "weights": {col: round(float(weight), 4) for col, weight in zip(columns, proposal)},
+    }
+
+
+def write_ranking_weights(results, path=RANKING_WEIGHTS_FILE, min_improvement=0.0):
+    """
+    Write tuned weights for positions whose held-out gain over the current weights beats
+    min_improvement on the latest fold and on average across folds.
+    """
+    config = {}
+    if os.path.exists(path):
+        with open(path) as file:
+            config = json.load(file)
+    for result in results:
+        latest_gain = result["best_spearman"] - result["baseline_spearman"]
+        if latest_gain > min_improvement and result["mean_heldout_gain"] > min_improvement:
+            config[result["position"]] = result["weights"]
+    with open(path, "w") as file:
+        json.dump(config, file, indent=2, sort_keys=True)
+    return config
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Tune the composite Score weights against next-game fantasy points.")
+    arg_parser.add_argument("--positions", nargs="*", default=list(FEATURES), help="Positions to tune")
+    arg_parser.add_argument("--candidates", type=int, default=5000, help="Candidate weight vectors per position")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    arg_parser.add_argument("--min-improvement", type=float, default=0.01, help="Held-out Spearman gain required to replace the weights")
+    arg_parser.add_argument("--folds", type=int, default=N_FOLDS, help="Rolling held-out test blocks")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Report without writing ranking_weights.json")
+    args = arg_parser.parse_args()
+
+    weekly_store = load_weekly_store()
+    weekly_points = score_weekly_points(weekly_store)
+    tuned = []
+    for pos in args.positions:
+        start = time.perf_counter()
+        result = tune_position(pos, args.candidates, args.seed, args.workers, store=weekly_store, points=weekly_points,
+                               n_folds=args.folds)
+        tuned.append(result)
+        print(f"{pos.upper():<3} rows={result['rows']:<5} held-out baseline={result['baseline_spearman']:.4f} "
+              f"tuned={result['best_spearman']:.4f} (in-sample {result['in_sample_spearman']:.4f}) "
+              f"fold gains={result['fold_gains']} ({time.perf_counter() - start:.1f}s)")
+        print(f"    {result['weights']}")
+
+    if not args.dry_run:
+        written = write_ranking_weights(tuned, min_improvement=args.min_improvement)
+        kept = [result["position"] for result in tuned if result["position"] in written]
+        print(f"Saved tuned weights for {kept or 'no positions'} to {RANKING_WEIGHTS_FILE}")
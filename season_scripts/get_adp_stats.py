@@ -1,17 +1,59 @@
 # FantasyPros ADP Stats Parser
-# This script fetches the ADP stats from FantasyPros and saves them by position and year.
+# This script fetches the ADP stats from FantasyPros and stores them in a single ADP history table
+# keyed by (season, snapshot_date, player_id, source). Completed seasons are cached permanently and
+# never refetched; each fetch of the current season adds a dated snapshot, so ADP can be tracked
+# through the summer. Consensus ADP per snapshot and its deltas are precomputed into a trends table.
+# Reads are local-only: the draft tools and services never scrape; running this script (or passing
+# refresh=True / max_age_days) is what adds snapshots.
 # Author: Patrick Mejia
 
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 import logging
 import os
 import re
 import requests
 import pandas as pd
+import polars as pl
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+ADP_BASE_URL = "https://www.fantasypros.com/nfl/adp/"
+ADP_HISTORY_FILE = "data/adp_data/adp_history.parquet"
+ADP_TRENDS_FILE = "data/adp_data/adp_trends.parquet"
+ADP_POSITIONS = ["QB", "RB", "WR", "TE"]
+ADP_KEY = ["season", "snapshot_date", "player_id", "source"]
+WEEKLY_WINDOW = timedelta(days=7)
+
+# Non-source columns on the FantasyPros ADP tables; everything else is a per-source ADP value
+ADP_ID_COLUMNS = {"Rank", "Player Team (Bye)", "Player", "POS"}
+
+
+def current_adp_season(today=None):
+    """ADP for season N is collected through the summer of N, so a new season starts in March."""
+    today = today or date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def final_snapshot_date(season):
+    """Snapshot date recorded for a completed season's final ADP (the start of that season)."""
+    return date(season, 9, 1)
+
+
+def snapshot_date_for(season, today=None):
+    """Today for the live season; completed seasons only have their final snapshot."""
+    today = today or date.today()
+    return today if season >= current_adp_season(today) else final_snapshot_date(season)
+
+
+def player_id_from_name(name):
+    """Stable slug used to key players across seasons (e.g. "Ja'Marr Chase" -> "jamarr-chase")."""
+    name = re.sub(r"[^a-z0-9\s-]", "", name.lower())
+    return re.sub(r"[\s-]+", "-", name).strip("-")
+
+
 class DraftCalculator:
     def __init__(self, base_url):
         self.base_url = base_url
@@ -59,16 +101,47 @@ class DraftCalculator:
             return [], []
         return self.parse_data(html_content)
 
-    def parse_all_positions(self, year):
-        """Parse all positions (QB, RB, WR, TE) for a specific year and save each split by POS."""
-        positions = ["QB", "RB", "WR", "TE"]
-        for position in positions:
-            headers, data = self.parse_position(position, year)
+    def parse_all_positions(self, year, max_workers=len(ADP_POSITIONS), snapshot_date=None):
+        """Fetch all positions (QB, RB, WR, TE) for a year in parallel and return them as ADP history rows."""
+        snapshot_date = snapshot_date or snapshot_date_for(year)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda position: self.parse_position(position, year), ADP_POSITIONS))
+
+        frames = []
+        for position, (headers, data) in zip(ADP_POSITIONS, results):
             if headers and data:
-                filename = f"data/adp_data/{year}/{position}.csv"
-                self.save_to_csv(headers, data, filename, split_by_position=True)
+                frames.append(self.to_history_rows(headers, data, year, snapshot_date))
             else:
                 logging.warning(f"No data found for {position} in {year}")
+        return pl.concat(frames).unique(subset=ADP_KEY, keep="first") if frames else None
+
+    def to_history_rows(self, headers, data, season, snapshot_date=None):
+        """Melt one parsed ADP table into long (season, snapshot_date, player_id, source) rows."""
+        width = len(headers)
+        rows = [row for row in data if len(row) == width]
+        df = pd.DataFrame(rows, columns=headers)
+        player_col = "Player Team (Bye)" if "Player Team (Bye)" in df.columns else "Player"
+
+        players = df[player_col].str.replace(r"\s+[A-Z]{2,}.*", "", regex=True).str.strip()
+        teams = df[player_col].str.extract(r"\s([A-Z]{2,3})\s*(?:\(\d+\))?$", expand=False)
+        sources = [col for col in df.columns if col not in ADP_ID_COLUMNS]
+
+        frame = pl.DataFrame({
+            "season": [season] * len(df),
+            "snapshot_date": [snapshot_date or snapshot_date_for(season)] * len(df),
+            "player_id": [player_id_from_name(name) for name in players],
+            "player": players.tolist(),
+            "team": teams.tolist(),
+            "pos": df["POS"].tolist() if "POS" in df.columns else [None] * len(df),
+            **{source: df[source].str.replace(",", "").tolist() for source in sources},
+        })
+        return (
+            frame.unpivot(index=["season", "snapshot_date", "player_id", "player", "team", "pos"], on=sources,
+                          variable_name="source", value_name="adp")
+            .with_columns(pl.col("adp").cast(pl.Float64, strict=False), pl.col("season").cast(pl.Int32))
+            .drop_nulls("adp")
+            .unique(subset=ADP_KEY, keep="first")
+        )
 
     def save_to_csv(self, headers, data, filename, split_by_position=False):
         """Save data to CSV. Optionally split into multiple files based on POS (WR, RB, etc.)."""
@@ -97,13 +170,180 @@ class DraftCalculator:
             logging.warning(f"No data found for {position} in {year}")
 
 
+class ADPHistory:
+    """
+    Columnar ADP history keyed by (season, snapshot_date, player_id, source), stored as one parquet table.
+    Seasons before the current one are immutable: once stored they are never refetched.
+    Loads read the stored table only, unless asked to refresh: a refreshing load of the current
+    season stores a snapshot dated today (replacing only today's snapshot), with positions fetched
+    in parallel, and refreshes the precomputed trends table.
+    """
+
+    def __init__(self, calculator=None, path=ADP_HISTORY_FILE, trends_path=ADP_TRENDS_FILE):
+        self.calculator = calculator or DraftCalculator(ADP_BASE_URL)
+        self.path = path
+        self.trends_path = trends_path
+
+    def read(self):
+        """Return the stored history, or None if nothing has been stored yet."""
+        if not os.path.exists(self.path):
+            return None
+        stored = pl.read_parquet(self.path)
+        if "snapshot_date" not in stored.columns:
+            # Histories written before snapshots existed hold one final snapshot per season
+            stored = stored.with_columns(
+                pl.col("season").map_elements(final_snapshot_date, return_dtype=pl.Date).alias("snapshot_date")
+            ).select(ADP_KEY[:2] + [col for col in stored.columns if col not in ADP_KEY[:2]])
+        return stored
+
+    def load(self, years, current_season=None, today=None, refresh=False, max_age_days=None):
+        """
+        Return ADP history for the given seasons.
+        Args:
+            years (list): Seasons to return.
+            refresh (bool): Fetch missing seasons and a new snapshot of the current season.
+            max_age_days (int): Fetch missing seasons, and the current season only when its latest
+                stored snapshot is at least this many days old. Neither set: read the stored table only.
+        """
+        today = today or date.today()
+        current_season = current_season or current_adp_season(today)
+        stored = self.read()
+        if not refresh and max_age_days is None:
+            return stored.filter(pl.col("season").is_in(list(years))) if stored is not None else None
+
+        latest = {}
+        if stored is not None:
+            latest = dict(stored.group_by("season").agg(pl.col("snapshot_date").max()).iter_rows())
+
+        def stale(year):
+            if year not in latest:
+                return True
+            if year < current_season:
+                return False
+            return refresh or (today - latest[year]).days >= max_age_days
+
+        to_fetch = [year for year in years if stale(year)]
+        fetched = {}
+        for year in to_fetch:
+            logging.info(f"--- Fetching ADP data for {year} ---")
+            snapshot = today if year >= current_season else final_snapshot_date(year)
+            rows = self.calculator.parse_all_positions(year, snapshot_date=snapshot)
+            if rows is not None:
+                fetched[(year, snapshot)] = rows
+
+        if fetched:
+            kept = stored
+            if stored is not None:
+                replaced = pl.DataFrame(
+                    {"season": [year for year, _ in fetched], "snapshot_date": [snap for _, snap in fetched]},
+                    schema={"season": pl.Int32, "snapshot_date": pl.Date},
+                )
+                kept = stored.join(replaced, on=["season", "snapshot_date"], how="anti")
+            frames = ([kept] if kept is not None else []) + list(fetched.values())
+            stored = pl.concat(frames, how="diagonal_relaxed").sort(ADP_KEY)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            stored.write_parquet(self.path)
+            logging.info(f"Saved ADP history ({stored.height} rows) to {self.path}")
+            self.write_trends(stored)
+
+        if stored is None:
+            return None
+        return stored.filter(pl.col("season").is_in(list(years)))
+
+    def board(self, season, history=None, snapshot_date=None, refresh=False):
+        """
+        Wide, one-row-per-player ADP board for the draft tools (Player, POS, AVG, per-source columns),
+        sorted by consensus ADP. Uses the season's latest snapshot unless snapshot_date is given.
+        Reads the stored history only, unless refresh is set (see load).
+        """
+        history = history if history is not None else self.load([season], refresh=refresh)
+        season_rows = history.filter(pl.col("season") == season) if history is not None else None
+        if season_rows is None or season_rows.is_empty():
+            return pd.DataFrame(columns=["Rank", "player_id", "Player", "Team", "POS", "AVG"])
+        snapshot_date = snapshot_date or season_rows["snapshot_date"].max()
+        wide = (
+            season_rows.filter(pl.col("snapshot_date") == snapshot_date)
+            .pivot(on="source", index=["player_id", "player", "team", "pos"], values="adp",
+                   aggregate_function="first")
+            .rename({"player": "Player", "team": "Team", "pos": "POS"})
+            .sort("AVG", nulls_last=True)
+        )
+        board = pd.DataFrame(wide.to_dict(as_series=False))
+        board.insert(0, "Rank", range(1, len(board) + 1))
+        return board
+
+    def trends(self):
+        """Stored trends table (see build_adp_trends), rebuilt from the history if missing."""
+        if os.path.exists(self.trends_path):
+            return pl.read_parquet(self.trends_path)
+        stored = self.read()
+        return self.write_trends(stored) if stored is not None else None
+
+    def write_trends(self, history):
+        trends = build_adp_trends(history)
+        os.makedirs(os.path.dirname(self.trends_path), exist_ok=True)
+        trends.write_parquet(self.trends_path)
+        logging.info(f"Saved ADP trends ({trends.height} rows) to {self.trends_path}")
+        return trends
+
+
+def build_adp_trends(history):
+    """
+    Consensus ADP per (season, snapshot_date, player_id) with precomputed deltas.
+    Positive deltas mean the player is rising (being drafted earlier).
+    Returns:
+        DataFrame: season, snapshot_date, player_id, player, team, pos, adp, pos_rank,
+        delta_prev (vs the previous snapshot), delta_week (vs the latest snapshot at least 7 days
+        older), delta_season (vs the season's first snapshot) and delta_year (vs the previous
+        season's final snapshot).
+    """
+    id_columns = ["season", "snapshot_date", "player_id"]
+    consensus = (
+        history.group_by(id_columns)
+        .agg(
+            pl.col("player").first(), pl.col("team").first(), pl.col("pos").first(),
+            # FantasyPros' own AVG column when present, otherwise the mean across sources
+            pl.when(pl.col("source") == "AVG").then(pl.col("adp")).max().fill_null(pl.col("adp").mean()).alias("adp"),
+        )
+        .sort(id_columns)
+    )
+    main_pos = pl.col("pos").str.extract(r"^([A-Z]+)", 1)
+    consensus = consensus.with_columns(
+        pl.col("adp").rank("ordinal").over(["season", "snapshot_date", main_pos]).cast(pl.Int32).alias("pos_rank"),
+        (pl.col("adp").shift(1) - pl.col("adp")).over(["season", "player_id"]).alias("delta_prev"),
+        (pl.col("adp").first() - pl.col("adp")).over(["season", "player_id"]).alias("delta_season"),
+    )
+
+    # Weekly delta: latest snapshot of the same player at least WEEKLY_WINDOW older
+    week_ago = (
+        consensus.select("season", "player_id", "snapshot_date", pl.col("adp").alias("adp_week_ago"))
+        .with_columns((pl.col("snapshot_date") + WEEKLY_WINDOW).alias("snapshot_date"))
+        .sort("snapshot_date")
+    )
+    consensus = (
+        consensus.sort("snapshot_date")
+        .join_asof(week_ago, on="snapshot_date", by=["season", "player_id"], strategy="backward", check_sortedness=False)
+        .with_columns((pl.col("adp_week_ago") - pl.col("adp")).alias("delta_week"))
+        .drop("adp_week_ago")
+    )
+
+    # Year-over-year delta against the previous season's final snapshot
+    final = (
+        consensus.sort("snapshot_date").group_by(["season", "player_id"]).agg(pl.col("adp").last().alias("adp_last_year"))
+        .with_columns((pl.col("season") + 1).alias("season"))
+    )
+    return (
+        consensus.join(final, on=["season", "player_id"], how="left")
+        .with_columns((pl.col("adp_last_year") - pl.col("adp")).alias("delta_year"))
+        .drop("adp_last_year")
+        .with_columns(pl.col(["delta_prev", "delta_week", "delta_season", "delta_year"]).round(1))
+        .sort(id_columns)
+    )
+
+
 if __name__ == "__main__":
     # Main script entry point
-    base_url = "https://www.fantasypros.com/nfl/adp/"
-    parser = DraftCalculator(base_url)
-
-    years = list(range(2020, 2026))  # 2020 through 2025
-    for year in years:
-        logging.info(f"--- Parsing ADP data for year: {year} ---")
-        parser.parse_all_positions(year)
-        print(f"ADP data for year {year} parsed successfully.\n")
+    history = ADPHistory()
+    adp = history.load(list(range(2020, current_adp_season() + 1)), refresh=True)
+    if adp is not None:
+        print(adp.group_by("season").agg(pl.col("player_id").n_unique().alias("players")).sort("season"))
@@ -1,152 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import argparse
+import json
 import os
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
-import re
 import logging
 
-# Helper Functions
-def _handle_duplicate_headers(headers):
-    seen = {}
-    result = []
-    for h in headers:
-        if h not in seen:
-            seen[h] = 1
-            result.append(h)
-        else:
-            seen[h] += 1
-            result.append(f"{h}.{seen[h]}")
-    return result
-
-def _convert_numeric(df, cols):
-    for col in cols:
-        df[col] = pd.to_numeric(df.get(col, 0).replace(",", "", regex=True), errors="coerce").fillna(0)
-    return df
-
-def _rename_duplicate_stats(df, stat_map):
-    for base_col, new_col in stat_map.items():
-        matches = [col for col in df.columns if base_col in col]
-        if len(matches) > 1:
-            df.rename(columns={matches[1]: new_col}, inplace=True)
-    return df
-
-def _clean_name(name):
-    """Remove content in parentheses and extra whitespace from a player name."""
-    if not isinstance(name, str):
-        return name
-    name = re.sub(r"\s*\(.*?\)", "", name)  # Remove parentheses and their content
-    return name.strip()
-
-# Position Configurations
-POSITION_CONFIG = {
-    "qb": {
-        "numeric_cols": ["CMP", "YDS", "TD", "Y/A", "INT", "FPTS/G", "FPTS", "R_YDS", "R_TD", "R_ATT"],
-        "score_func": lambda df: (
-            df["YDS"] * 0.4 + df["R_YDS"] * 0.1 + df["TD"] * 0.3 +
-            df["Y/A"] * 0.2 - df["INT"] * 0.1 + df["FPTS/G"] * 0.4 +
-            df["FPTS"] * 0.3 + df["CMP"] * 0.1 + df["R_TD"] * 0.2
-        ),
-        "top_n": 32,
-        "handle_duplicates": True,
-        "stat_renames": {"YDS": "R_YDS", "TD": "R_TD", "ATT": "R_ATT"}
-    },
-    "rb": {
-        "numeric_cols": ["ATT", "YDS", "TD", "REC_YDS", "REC_TD", "Y/A", "FPTS/G", "FPTS", "FL", "REC"],
-        "score_func": lambda df: (
-            df["YDS"] * 0.45 + df["TD"] * 0.4 + df["Y/A"] * 0.15 +
-            df["FPTS/G"] * 0.3 + df["FPTS"] * 0.2 + df["ATT"] * 0.1 -
-            df["FL"] * 0.1 + df["REC"] * 0.1 + df.get("REC_YDS", 0) * 0.1 +
-            df.get("REC_TD", 0) * 0.1
-        ),
-        "top_n": 32,
-        "handle_duplicates": True,
-        "stat_renames": {"YDS": "REC_YDS", "TD": "REC_TD"}
-    },
-    "wr": {
-        "numeric_cols": ["REC", "YDS", "TD", "Y/R", "LG", "20+"],
-        "score_func": lambda df: (
-            df["REC"] * 0.35 + df["YDS"] * 0.25 + df["TD"] * 0.5 +
-            df["Y/R"] * 0.15 + df["LG"] * 0.1 + df["20+"] * 0.1
-        ),
-        "top_n": 50,
-        "handle_duplicates": False
-    },
-    "te": {
-        "numeric_cols": ["REC", "YDS", "TD", "Y/R", "LG", "20+", "FPTS/G", "FPTS"],
-        "score_func": lambda df: (
-            df["REC"] * 0.35 + df["YDS"] * 0.25 + df["TD"] * 0.5 +
-            df["Y/R"] * 0.15 + df["LG"] * 0.1 + df["20+"] * 0.1 +
-            df["FPTS/G"] * 0.4 + df["FPTS"] * 0.3
-        ),
-        "top_n": 50,
-        "handle_duplicates": False
-    },
-    "k": {
-        "numeric_cols": ["FG", "FGA", "PCT", "1-19", "20-29", "30-39", "40-49", "50+", "FPTS/G", "FPTS"],
-        "score_func": lambda df: (
-            df["FG"] * 0.4 + df["FGA"] * 0.2 + df["PCT"] * 0.2 + df["1-19"] * 0.1 +
-            df["20-29"] * 0.2 + df["30-39"] * 0.1 + df["40-49"] * 0.1 + df["50+"] * 0.1 +
-            df["FPTS/G"] * 0.4 + df["FPTS"] * 0.3
-        ),
-        "top_n": 32,
-        "handle_duplicates": False
-    },
-}
+from pipelines.get_weekly_stats import POSITION_CONFIG, score_table
 
-# Main Function
-def find_best_players(position, year=None, week=None):
-    if position not in POSITION_CONFIG:
-        print(f"Position '{position}' not supported.")
-        return None
-
-    c = POSITION_CONFIG[position]
-    folder = "career" if week is None else "weekly"
-    os.makedirs(f"data/official_rankings/{folder}", exist_ok=True)
 
+# Fetch and Parse
+def _stats_url(position, year=None):
     base_url = f"https://www.fantasypros.com/nfl/stats/{position}.php?scoring=PPR"
     if year:
         base_url += f"&year={year}"
     else:
         base_url += f"&range=full"
+    return base_url
+
+
+def fetch_stats_page(position, year=None):
+    """Fetch the raw FantasyPros stats page for a position and season."""
+    response = requests.get(_stats_url(position, year), timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def parse_and_score(position, html, year=None, week=None):
+    """
+    Parse a FantasyPros stats page and compute Score, Rank and the top-N table.
+    Pure CPU work with no I/O so it can run in a worker process.
+    Returns:
+        DataFrame or None: Top-N ranked players, or None if the page had no data.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"class": "table"})
+    if not table:
+        print(f"No table found for {position} year {year} week {week}.")
+        return None
 
-    try:
-        response = requests.get(base_url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        table = soup.find("table", {"class": "table"})
-        if not table:
-            print(f"No table found for {position} year {year} week {week}.")
-            return None
-
-        headers = [th.text.strip() for th in table.find("thead").find_all("th")]
-        if c.get("handle_duplicates"):
-            headers = _handle_duplicate_headers(headers)
-
-        rows = [[td.text.strip() for td in tr.find_all("td")] for tr in table.find("tbody").find_all("tr")]
-        if not rows:
-            print(f"No player data found for {position} year {year} week {week}.")
-            return None
+    headers = [th.text.strip() for th in table.find("thead").find_all("th")]
+    rows = [[td.text.strip() for td in tr.find_all("td")] for tr in table.find("tbody").find_all("tr")]
+    if not rows:
+        print(f"No player data found for {position} year {year} week {week}.")
+        return None
 
-        df = pd.DataFrame(rows, columns=headers)
-        
-        # Clean player names
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].apply(_clean_name)
-            
-        if "stat_renames" in c:
-            df = _rename_duplicate_stats(df, c["stat_renames"])
+    return score_table(position, headers, rows)
 
-        if df.columns.tolist().count("YDS") > 1:
-            df = df.loc[:, ~df.columns.duplicated()]
-        if "YDS" in df.columns:
-            df["YDS"] = df["YDS"].str.replace(",", "", regex=True)
 
-        df = _convert_numeric(df, c["numeric_cols"])
+# Main Function
+def find_best_players(position, year=None, week=None):
+    if position not in POSITION_CONFIG:
+        print(f"Position '{position}' not supported.")
+        return None
 
-        df["Score"] = c["score_func"](df)
-        df["Rank"] = df["Score"].rank(ascending=False, method="min").astype(int)
+    folder = "career" if week is None else "weekly"
+    os.makedirs(f"data/official_rankings/{folder}", exist_ok=True)
 
-        df = df.sort_values("Score", ascending=False).head(c["top_n"]).reset_index(drop=True)
+    try:
+        df = parse_and_score(position, fetch_stats_page(position, year), year, week)
+        if df is None:
+            return None
 
         suffix = f"{position}_{year}_week{week}.csv" if week else f"{position}_{year}.csv"
         filename = f"data/official_rankings/{folder}/official_{suffix}"
@@ -159,11 +73,106 @@ def find_best_players(position, year=None, week=None):
         print(f"Error processing {position} year {year} week {week}: {e}")
         return None
 
+
+# Backfill
+BACKFILL_DIR = "data/official_rankings/career_backfill"
+CHECKPOINT_FILE = "_checkpoint.json"
+
+
+def _load_checkpoint(output_dir):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path) as file:
+        return {(year, position) for year, position in json.load(file)["completed"]}
+
+
+def _save_checkpoint(output_dir, completed):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"completed": sorted(completed)}, file)
+    os.replace(tmp_path, path)  # Atomic so an interrupt never leaves a corrupt checkpoint
+
+
+def backfill_career_stats(years, positions, output_dir=BACKFILL_DIR, fetch_workers=8, parse_workers=None):
+    """
+    Backfill season rankings for every (year, position) pair.
+    Pages are fetched on a thread pool and parsed/scored on a process pool as they arrive.
+    Output is one dataset partitioned as `season=<year>/<position>.csv`; a checkpoint records
+    finished partitions so an interrupted backfill resumes where it stopped.
+    Args:
+        years (iterable): Seasons to backfill.
+        positions (iterable): Position keys from POSITION_CONFIG.
+        output_dir (str): Root of the partitioned output.
+        fetch_workers (int): Concurrent page fetches.
+        parse_workers (int): Parser processes (defaults to the CPU count).
+    Returns:
+        list: (year, position) pairs written during this run.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    completed = _load_checkpoint(output_dir)
+    todo = [
+        (year, position) for year in years for position in positions
+        if position in POSITION_CONFIG and (year, position) not in completed
+    ]
+    logging.info(f"Backfill: {len(completed)} partitions already done, {len(todo)} to go")
+
+    written = []
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetchers, \
+            ProcessPoolExecutor(max_workers=parse_workers) as parsers:
+        fetches = {fetchers.submit(fetch_stats_page, position, year): (year, position) for year, position in todo}
+        parses = {}
+        for future in as_completed(fetches):
+            year, position = fetches[future]
+            try:
+                html = future.result()
+            except requests.RequestException as e:
+                logging.error(f"Fetch failed for {position} {year}: {e}")
+                continue
+            parses[parsers.submit(parse_and_score, position, html, year)] = (year, position)
+
+        for future in as_completed(parses):
+            year, position = parses[future]
+            try:
+                df = future.result()
+            except Exception as e:
+                # One malformed page skips its partition; it stays out of the checkpoint for the next run
+                logging.error(f"Parse failed for {position} {year}: {e}")
+                continue
+            if df is None:
+                continue
+            df.insert(0, "Season", year)
+            partition = os.path.join(output_dir, f"season={year}")
+            os.makedirs(partition, exist_ok=True)
+            df.to_csv(os.path.join(partition, f"{position}.csv"), index=False)
+
+            completed.add((year, position))
+            _save_checkpoint(output_dir, completed)
+            written.append((year, position))
+            logging.info(f"Saved {position.upper()} {year} ({len(df)} players)")
+
+    return written
+
+
+def _parse_year_range(value):
+    """Parse "2015-2024" or "2024" into a range of seasons."""
+    start, _, end = value.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
 if __name__ == "__main__":
-    positions = ["qb", "rb", "wr", "te", "k"]
-    for year in range(2020, 2025):
-        for pos in positions:
-            find_best_players(pos, year)
-            best_players = find_best_players(pos, year)
-            print(f"Processed {pos.upper()} for year {year}")
-            print(best_players.head(5) if best_players is not None else "No data found.")
+    arg_parser = argparse.ArgumentParser(description="Backfill FantasyPros season rankings.")
+    arg_parser.add_argument("--years", type=_parse_year_range, default=range(2020, 2025),
+                            help="Season or inclusive range, e.g. 2015-2024")
+    arg_parser.add_argument("--positions", nargs="+", default=list(POSITION_CONFIG),
+                            choices=list(POSITION_CONFIG))
+    arg_parser.add_argument("--output-dir", default=BACKFILL_DIR)
+    arg_parser.add_argument("--fetch-workers", type=int, default=8)
+    arg_parser.add_argument("--parse-workers", type=int, default=None)
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    done = backfill_career_stats(args.years, args.positions, args.output_dir,
+                                 args.fetch_workers, args.parse_workers)
+    print(f"Backfilled {len(done)} season/position partitions into {args.output_dir}")
@@ -5,15 +5,23 @@
 # *Run first to update the team rosters for all teams
 #
 # This script runs through all NFL teams from NFL.com and creates a csv of their current skill
-# player roster
+# player roster. Teams are fetched concurrently and streamed into a temporary combined roster that
+# replaces the previous one only once every team is in it (a team that fails keeps its last saved
+# per-team roster); per-team files are only rewritten when the roster content changes.
 #
-# Saved to (e.g., "rosters/buffalo-bills.csv")
+# Saved to (e.g., "rosters/buffalo-bills.csv" and "rosters/fullNFLSkillRoster.csv")
 #
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from bs4 import BeautifulSoup
 import csv
+import hashlib
+import json
+import logging
 import os
+import threading
+import time
 
 
 # List of all NFL team names and their abbreviations
@@ -52,17 +60,44 @@ team_abbreviations = {
     "seattle-seahawks": "SEA",
 }
 
-# Create the 'rosters' folder if it doesn't exist
-os.makedirs("rosters", exist_ok=True)
+ROSTER_DIR = "rosters"
+COMBINED_CSV = f"{ROSTER_DIR}/fullNFLSkillRoster.csv"
+HASHES_FILE = f"{ROSTER_DIR}/.roster_hashes.json"
+ROSTER_HEADER = [
+    "Player",
+    "Number",
+    "Position",
+    "Status",
+    "Height",
+    "Weight",
+    "Experience",
+    "College",
+    "Team",
+]
 
 valid_positions = {"QB", "WR", "RB", "TE", "K"}
 valid_statuses = {"ACT", "RES", "PUP", "NFI", "TRC", "UDF"}
 
-for team, abbreviation in team_abbreviations.items():
-    url = f"https://www.nfl.com/teams/{team}/roster"
-    response = requests.get(url)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+
+class RateLimiter:
+    """Spaces out requests so no more than `rate` start per second across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+def parse_roster(html, abbreviation):
+    """Parse a team roster page into rows of skill players."""
+    soup = BeautifulSoup(html, "html.parser")
     players_table = soup.find("table", class_="d3-o-table")
 
     player_data = []
@@ -96,51 +131,118 @@ for team, abbreviation in team_abbreviations.items():
                         abbreviation,
                     ]
                 )
+    return player_data
+
+
+def _roster_hash(player_data):
+    return hashlib.sha256(json.dumps(player_data).encode("utf-8")).hexdigest()
+
+
+def _fetch_team(session, limiter, team, abbreviation):
+    """Fetch and parse one team. Returns (team, rows, seconds)."""
+    start = time.perf_counter()
+    limiter.wait()
+    response = session.get(f"https://www.nfl.com/teams/{team}/roster", timeout=10)
+    response.raise_for_status()
+    player_data = parse_roster(response.text, abbreviation)
+    return team, player_data, time.perf_counter() - start
+
+
+def _saved_roster(team):
+    """Rows of a team's last saved per-team CSV, or None if it has never been saved."""
+    csv_file = f"{ROSTER_DIR}/{team}.csv"
+    if not os.path.exists(csv_file):
+        return None
+    with open(csv_file, newline="") as file:
+        return list(csv.reader(file))[1:]
+
+
+def scrape_rosters(teams=None, max_workers=8, requests_per_second=4):
+    """
+    Fetch all team rosters concurrently and stream them into the combined roster.
+    Each team's rows are written to a temporary fullNFLSkillRoster.csv as soon as they are parsed.
+    A team whose fetch or parse fails contributes its last saved per-team CSV instead; if it has
+    none, the previous combined roster is left in place and a RuntimeError is raised.
+    The per-team CSV is only rewritten when the roster's content hash has changed.
+    Args:
+        teams (dict): Team slug -> abbreviation. Defaults to every NFL team.
+        max_workers (int): Number of concurrent fetches.
+        requests_per_second (float): Upper bound on request start rate.
+    Returns:
+        dict: Team slug -> {"players", "seconds", "changed", "stale"} timing report.
+    """
+    teams = teams or team_abbreviations
+    os.makedirs(ROSTER_DIR, exist_ok=True)
+
+    previous_hashes = {}
+    if os.path.exists(HASHES_FILE):
+        with open(HASHES_FILE) as file:
+            previous_hashes = json.load(file)
+
+    limiter = RateLimiter(requests_per_second)
+    report = {}
+    hashes = dict(previous_hashes)
+    missing = []
+    tmp_path = f"{COMBINED_CSV}.tmp"
+
+    with requests.Session() as session, \
+            open(tmp_path, mode="w", newline="") as combined_file, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        combined = csv.writer(combined_file)
+        combined.writerow(ROSTER_HEADER)
+
+        futures = {
+            executor.submit(_fetch_team, session, limiter, team, abbreviation): team
+            for team, abbreviation in teams.items()
+        }
+        for future in as_completed(futures):
+            try:
+                team, player_data, seconds = future.result()
+            except Exception as e:
+                team = futures[future]
+                saved = _saved_roster(team)
+                if saved is None:
+                    logging.error(f"Roster fetch failed for {team} and no saved roster to fall back on: {e}")
+                    missing.append(team)
+                else:
+                    logging.warning(f"Roster fetch failed for {team}, keeping its last saved roster: {e}")
+                    combined.writerows(saved)
+                    report[team] = {"players": len(saved), "seconds": None, "changed": False, "stale": True}
+                continue
+
+            combined.writerows(player_data)
+
+            digest = _roster_hash(player_data)
+            csv_file = f"{ROSTER_DIR}/{team}.csv"
+            changed = previous_hashes.get(team) != digest or not os.path.exists(csv_file)
+            if changed:
+                with open(csv_file, mode="w", newline="") as file:
+                    writer = csv.writer(file)
+                    writer.writerow(ROSTER_HEADER)
+                    writer.writerows(player_data)
+                hashes[team] = digest
+
+            report[team] = {"players": len(player_data), "seconds": round(seconds, 3), "changed": changed, "stale": False}
+            logging.info(
+                f"{team.replace('-', ' ').title()}: {len(player_data)} players in {seconds:.2f}s"
+                f"{'' if changed else ' (unchanged)'}"
+            )
+
+    with open(HASHES_FILE, mode="w") as file:
+        json.dump(hashes, file, indent=2)
+
+    if missing:
+        os.remove(tmp_path)
+        raise RuntimeError(f"No roster for {', '.join(sorted(missing))}; kept the previous {COMBINED_CSV}")
+    os.replace(tmp_path, COMBINED_CSV)
+    logging.info(f"Combined roster saved to {COMBINED_CSV}")
+    return report
+
 
-    csv_file = f"rosters/{team}.csv"
-    with open(csv_file, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(
-            [
-                "Player",
-                "Number",
-                "Position",
-                "Status",
-                "Height",
-                "Weight",
-                "Experience",
-                "College",
-                "Team",
-            ]
-        )
-        writer.writerows(player_data)
-
-    print(f"Data for {team.replace('-', ' ').title()} saved to {csv_file}")
-
-# Combine all team CSVs into one master CSV
-combined_csv = "rosters/fullNFLSkillRoster.csv"
-with open(combined_csv, mode="w", newline="") as file:
-    writer = csv.writer(file)
-    writer.writerow(
-        [
-            "Player",
-            "Number",
-            "Position",
-            "Status",
-            "Height",
-            "Weight",
-            "Experience",
-            "College",
-            "Team",
-        ]
-    )
-
-    for team in team_abbreviations.keys():
-        csv_file = f"rosters/{team}.csv"
-        if os.path.exists(csv_file):
-            with open(csv_file, mode="r", newline="") as team_file:
-                reader = csv.reader(team_file)
-                next(reader)  # Skip header
-                writer.writerows(reader)
-
-print(f"Combined roster saved to {combined_csv}")
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    timings = scrape_rosters()
+    slowest = sorted(timings.items(), key=lambda item: item[1]["seconds"] or 0.0, reverse=True)[:5]
+    print("Slowest teams:")
+    for team, stats in slowest:
+        print(f"  {team}: {stats['seconds']}s")